@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='usersession',
+            options={'ordering': ['-login_time']},
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['-login_time', '-id'], name='authenticat_login_t_d6a2db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', '-login_time', '-id'], name='authenticat_user_id_28d0bd_idx'),
+        ),
+    ]
@@ -30,6 +30,13 @@ class UserSession(models.Model):
     user_agent = models.TextField()
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        ordering = ['-login_time']
+        indexes = [
+            models.Index(fields=['-login_time', '-id']),
+            models.Index(fields=['user', '-login_time', '-id']),
+        ]
+    
     def __str__(self):
         return f"{self.user.username} - {self.login_time}"
     
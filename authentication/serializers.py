@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import User, UserSession
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for User model"""
     password = serializers.CharField(write_only=True, validators=[validate_password])
     
@@ -34,7 +35,7 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for user profile (without password)"""
     class Meta:
         model = User
@@ -73,7 +74,7 @@ class ChangePasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError('Old password is incorrect')
         return value
 
-class UserSessionSerializer(serializers.ModelSerializer):
+class UserSessionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for UserSession model"""
     user = UserProfileSerializer(read_only=True)
     
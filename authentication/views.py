@@ -6,13 +6,16 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import SparseFieldsetMixin
+from sheba_admin_backend.pagination import OptionalCursorPagination
 from .models import User, UserSession
 from .serializers import (
     UserSerializer, UserProfileSerializer, LoginSerializer, 
     ChangePasswordSerializer, UserSessionSerializer
 )
 
-class UserListCreateView(generics.ListCreateAPIView):
+class UserListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all users or create a new user"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -24,7 +27,7 @@ class UserListCreateView(generics.ListCreateAPIView):
             return [permissions.IsAuthenticated(), permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a user"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -37,7 +40,7 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         return self.request.user
 
 @method_decorator(csrf_exempt, name='dispatch')
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     """Get or update current user's profile"""
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -125,10 +128,12 @@ def change_password_view(request):
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class UserSessionListView(generics.ListAPIView):
+class UserSessionListView(ExportMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List user sessions"""
     serializer_class = UserSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-login_time', '-id')
     
     def get_queryset(self):
         if self.request.user.is_staff or self.request.user.role == 'admin':
@@ -3,4 +3,11 @@ from django.apps import AppConfig
 
 class CareersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'careers'
\ No newline at end of file
+    name = 'careers'
+
+    def ready(self):
+        from sheba_admin_backend.cache import connect_invalidation
+        from sheba_admin_backend.public_search import connect_public_search
+        # Public job responses don't expose the view/application counters
+        connect_invalidation('careers.JobPosting', ignore_fields=['views', 'applications_count'])
+        connect_public_search('careers.JobPosting')
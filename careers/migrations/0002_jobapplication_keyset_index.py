@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['-submitted_at', '-id'], name='careers_job_submitt_5a0cca_idx'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+from sheba_admin_backend.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0002_jobapplication_keyset_index'),
+    ]
+
+    operations = [
+        # GIN index on PostgreSQL, FTS5 table and triggers on SQLite
+        CreateSearchIndex(model_name='jobposting', fields=['title', 'description', 'location']),
+    ]
@@ -131,6 +131,9 @@ class JobApplication(models.Model):
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at', '-id']),
+        ]
         unique_together = ['job', 'email']  # Prevent duplicate applications
     
     def __str__(self):
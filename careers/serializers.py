@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import JobPosting, JobApplication
 from authentication.serializers import UserProfileSerializer
 
-class JobPostingSerializer(serializers.ModelSerializer):
+# Columns read by the JobPosting.salary_range property
+SALARY_RANGE_SOURCES = ['salary_min', 'salary_max', 'salary_currency', 'salary_display']
+
+class JobPostingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for JobPosting model"""
     posted_by = UserProfileSerializer(read_only=True)
     posted_by_id = serializers.IntegerField(write_only=True, required=False)
@@ -21,6 +25,7 @@ class JobPostingSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'published_at'
         ]
         read_only_fields = ['id', 'views', 'applications_count', 'created_at', 'updated_at']
+        field_sources = {'salary_range': SALARY_RANGE_SOURCES, 'is_published': ['status']}
     
     def create(self, validated_data):
         # Set posted_by to current user if not provided
@@ -50,7 +55,7 @@ class JobPostingSerializer(serializers.ModelSerializer):
         
         return super().update(instance, validated_data)
 
-class JobPostingSummarySerializer(serializers.ModelSerializer):
+class JobPostingSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for job posting summaries"""
     posted_by_name = serializers.CharField(source='posted_by.get_full_name', read_only=True)
     salary_range = serializers.ReadOnlyField()
@@ -62,8 +67,9 @@ class JobPostingSummarySerializer(serializers.ModelSerializer):
             'experience_level', 'salary_range', 'status', 'posted_by_name',
             'application_deadline', 'views', 'applications_count', 'published_at'
         ]
+        field_sources = {'salary_range': SALARY_RANGE_SOURCES}
 
-class PublicJobPostingSerializer(serializers.ModelSerializer):
+class PublicJobPostingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public job posting display"""
     salary_range = serializers.ReadOnlyField()
     
@@ -75,8 +81,9 @@ class PublicJobPostingSerializer(serializers.ModelSerializer):
             'benefits', 'salary_range', 'application_deadline', 'application_email',
             'application_url', 'published_at'
         ]
+        field_sources = {'salary_range': SALARY_RANGE_SOURCES}
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for JobApplication model"""
     job = JobPostingSummarySerializer(read_only=True)
     job_id = serializers.IntegerField(write_only=True)
@@ -91,8 +98,9 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             'current_company', 'status', 'admin_notes', 'submitted_at', 'updated_at'
         ]
         read_only_fields = ['id', 'submitted_at', 'updated_at']
+        field_sources = {'full_name': ['first_name', 'last_name']}
 
-class JobApplicationSummarySerializer(serializers.ModelSerializer):
+class JobApplicationSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for job application summaries"""
     job_title = serializers.CharField(source='job.title', read_only=True)
     full_name = serializers.ReadOnlyField()
@@ -102,4 +110,5 @@ class JobApplicationSummarySerializer(serializers.ModelSerializer):
         fields = [
             'id', 'job_title', 'full_name', 'email', 'phone',
             'years_of_experience', 'current_position', 'status', 'submitted_at'
-        ]
\ No newline at end of file
+        ]
+        field_sources = {'full_name': ['first_name', 'last_name']}
\ No newline at end of file
@@ -0,0 +1,202 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from sheba_admin_backend.view_counts import flush_view_counts, record_view
+from .models import JobPosting, JobApplication
+
+
+class CareersStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        job = JobPosting.objects.create(
+            title='Backend Engineer', slug='backend-engineer', department='engineering',
+            location='Addis Ababa', job_type='full_time', experience_level='mid',
+            description='x', status='published', posted_by=self.user,
+        )
+        JobApplication.objects.create(job=job, first_name='A', last_name='B',
+                                      email='a@example.com', phone='1', cover_letter='x')
+
+    def test_stats_query_count(self):
+        for i, department in enumerate(['design', 'marketing', 'sales']):
+            JobPosting.objects.create(
+                title=f'Role {i}', slug=f'role-{i}', department=department, location='Remote',
+                job_type='contract', experience_level='junior', description='x', posted_by=self.user,
+            )
+        # One grouped query per model, independent of the number of departments
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('careers:careers-stats'))
+        self.assertEqual(response.data['total_jobs'], 4)
+        self.assertEqual(response.data['published_jobs'], 1)
+        self.assertEqual(response.data['pending_applications'], 1)
+        self.assertEqual(response.data['department_stats']['engineering'],
+                         {'jobs': 1, 'published_jobs': 1, 'applications': 1})
+        self.assertEqual(response.data['job_type_stats']['contract']['jobs'], 3)
+        self.assertEqual(response.data['experience_level_stats']['mid']['applications'], 1)
+        self.assertEqual(response.data['application_status_stats'], {'submitted': 1})
+
+    def test_stats_date_window(self):
+        JobApplication.objects.update(submitted_at=timezone.now() - timedelta(days=30))
+        response = self.client.get(reverse('careers:careers-stats'), {'days': 7})
+        self.assertEqual(response.data['total_jobs'], 1)
+        self.assertEqual(response.data['total_applications'], 0)
+        response = self.client.get(reverse('careers:careers-stats'),
+                                   {'date_to': (timezone.localdate() - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.data['total_jobs'], 0)
+        self.assertEqual(response.data['total_applications'], 1)
+
+    def test_stats_invalid_window(self):
+        response = self.client.get(reverse('careers:careers-stats'),
+                                   {'date_from': '2024-02-01', 'date_to': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('careers:careers-stats'), {'days': 1000000000})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('days', response.data)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='admin', password='pass')
+        JobPosting.objects.create(
+            title='Designer', slug='designer', department='design', location='Remote',
+            job_type='contract', experience_level='junior', description='long description',
+            status='published', posted_by=user, salary_min=1000, salary_max=2000,
+        )
+
+    def test_property_sources_stay_loaded(self):
+        # Validators, COUNT and the page; deferred columns would otherwise be
+        # loaded with one query per row
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('careers:public-job-list'),
+                                       {'fields': 'title,salary_range'})
+        self.assertEqual(response.data['results'][0], {
+            'title': 'Designer', 'salary_range': '1,000 - 2,000 ETB'
+        })
+
+
+class PublicJobCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='admin', password='pass')
+        self.job = JobPosting.objects.create(
+            title='Designer', slug='designer', department='design', location='Remote',
+            job_type='contract', experience_level='junior', description='x',
+            status='published', posted_by=user,
+        )
+        self.url = reverse('careers:public-job-list')
+
+    def test_counter_updates_keep_cache(self):
+        self.client.get(self.url)
+        self.job.views = 10
+        self.job.save(update_fields=['views'])
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_closing_a_job_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.status = 'closed'
+            self.job.save()
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+
+@mock.patch('sheba_admin_backend.view_counts.cache_is_shared', return_value=True)
+class ViewCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='admin', password='pass')
+        self.job = JobPosting.objects.create(
+            title='Designer', slug='designer', department='design', location='Remote',
+            job_type='contract', experience_level='junior', description='x',
+            status='published', posted_by=user,
+        )
+
+    def test_detail_view_does_not_write(self, shared):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('careers:public-job-detail', args=[self.job.slug]))
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE')])
+
+    def test_concurrent_views_are_exact(self, shared):
+        def hit():
+            for _ in range(50):
+                record_view(self.job)
+
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=100):
+            threads = [threading.Thread(target=hit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            record_view(self.job, 'applications_count')
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=101):
+            record_view(self.job)
+
+        # Slot 101 may still receive in-flight increments
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=102):
+            self.assertEqual(flush_view_counts(), 2)
+            self.assertEqual(flush_view_counts(), 0)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views, 400)
+        self.assertEqual(self.job.applications_count, 1)
+
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=103):
+            flush_view_counts()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views, 401)
+
+    def test_interrupted_flush_does_not_double_count(self, shared):
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=100):
+            record_view(self.job)
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=102):
+            with mock.patch('sheba_admin_backend.view_counts._write_counts', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    flush_view_counts()
+            # The slot was claimed before the failed write; a retry skips it
+            self.assertEqual(flush_view_counts(), 0)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views, 0)
+
+    def test_unshared_cache_writes_immediately(self, shared):
+        shared.return_value = False
+        self.client.get(reverse('careers:public-job-detail', args=[self.job.slug]))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views, 1)
+
+
+class ApplicationCursorTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        job = JobPosting.objects.create(
+            title='Designer', slug='designer', department='design', location='Remote',
+            job_type='contract', experience_level='junior', description='x',
+            status='published', posted_by=user,
+        )
+        for i in range(3):
+            JobApplication.objects.create(job=job, first_name='A', last_name=str(i), email=f'a{i}@example.com',
+                                          phone='1', cover_letter='x')
+        self.url = reverse('careers:application-list-create')
+
+    def test_cursor_pages_skip_validators(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'pagination': 'cursor'})
+        self.assertEqual(len(response.data['results']), 3)
+        # No validator aggregate and no COUNT over the whole table
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([query for query in sql if 'COUNT(' in query or 'MAX(' in query])
+        self.assertNotIn('ETag', response)
+
+    def test_page_numbers_keep_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
@@ -3,18 +3,27 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import F
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import ConditionalGetMixin, SparseFieldsetMixin, PublicCacheMixin
+from sheba_admin_backend.pagination import OptionalCursorPagination
+from sheba_admin_backend.public_search import IndexedSearchFilter, IndexedSearchMixin
+from sheba_admin_backend.search import FullTextSearchFilter, RankedOrderingFilter
+from sheba_admin_backend.view_counts import record_view
+from dashboard.serializers import StatsWindowSerializer
+from dashboard.stats import date_window, grouped_counts
 from .models import JobPosting, JobApplication
 from .serializers import (
     JobPostingSerializer, JobPostingSummarySerializer, PublicJobPostingSerializer,
     JobApplicationSerializer, JobApplicationSummarySerializer
 )
 
-class JobPostingListCreateView(generics.ListCreateAPIView):
+class JobPostingListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all job postings or create a new posting"""
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['status', 'department', 'job_type', 'experience_level']
     search_fields = ['title', 'description', 'location']
     ordering_fields = ['created_at', 'published_at', 'views', 'applications_count']
@@ -24,13 +33,13 @@ class JobPostingListCreateView(generics.ListCreateAPIView):
         # Automatically set the posted_by to the current user
         serializer.save(posted_by=self.request.user)
 
-class JobPostingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobPostingDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a job posting"""
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class JobPostingSummaryListView(generics.ListAPIView):
+class JobPostingSummaryListView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List job postings with summary data"""
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSummarySerializer
@@ -40,59 +49,89 @@ class JobPostingSummaryListView(generics.ListAPIView):
     search_fields = ['title', 'location']
     ordering = ['-created_at']
 
-class JobApplicationListCreateView(generics.ListCreateAPIView):
+class JobApplicationListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all job applications or create a new application"""
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-submitted_at', '-id')
+    validator_fields = ['updated_at', 'job__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'job', 'job__department']
     search_fields = ['first_name', 'last_name', 'email', 'job__title']
     ordering_fields = ['submitted_at', 'years_of_experience']
     ordering = ['-submitted_at']
 
-class JobApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobApplicationDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a job application"""
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'job__updated_at']
+
+BREAKDOWN_FIELDS = {
+    'department_stats': 'department',
+    'job_type_stats': 'job_type',
+    'experience_level_stats': 'experience_level',
+}
+
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def careers_stats(request):
-    """Get careers statistics"""
-    total_jobs = JobPosting.objects.count()
-    published_jobs = JobPosting.objects.filter(status='published').count()
-    total_applications = JobApplication.objects.count()
-    pending_applications = JobApplication.objects.filter(status='submitted').count()
-    
-    # Department breakdown
-    departments = JobPosting.objects.values('department').distinct()
-    department_stats = {}
-    for dept in departments:
-        dept_name = dept['department']
-        department_stats[dept_name] = {
-            'jobs': JobPosting.objects.filter(department=dept_name).count(),
-            'published_jobs': JobPosting.objects.filter(department=dept_name, status='published').count(),
-            'applications': JobApplication.objects.filter(job__department=dept_name).count()
-        }
-    
+    """Get careers statistics, optionally limited to a date window"""
+    window = StatsWindowSerializer(data=request.query_params)
+    if not window.is_valid():
+        return Response(window.errors, status=status.HTTP_400_BAD_REQUEST)
+    date_from = window.validated_data.get('date_from')
+    date_to = window.validated_data.get('date_to')
+
+    # One GROUP BY query per model, whatever the number of departments
+    jobs = grouped_counts(
+        JobPosting.objects.filter(date_window('created_at', date_from, date_to)),
+        'status', *BREAKDOWN_FIELDS.values()
+    )
+    applications = grouped_counts(
+        JobApplication.objects.filter(date_window('submitted_at', date_from, date_to)),
+        'status', *(f'job__{field}' for field in BREAKDOWN_FIELDS.values())
+    )
+
+    breakdowns = {name: {} for name in BREAKDOWN_FIELDS}
+    job_statuses = {}
+    application_statuses = {}
+    for row in jobs:
+        job_statuses[row['status']] = job_statuses.get(row['status'], 0) + row['count']
+        for name, field in BREAKDOWN_FIELDS.items():
+            stats = breakdowns[name].setdefault(row[field], {'jobs': 0, 'published_jobs': 0, 'applications': 0})
+            stats['jobs'] += row['count']
+            if row['status'] == 'published':
+                stats['published_jobs'] += row['count']
+    for row in applications:
+        application_statuses[row['status']] = application_statuses.get(row['status'], 0) + row['count']
+        for name, field in BREAKDOWN_FIELDS.items():
+            stats = breakdowns[name].setdefault(row[f'job__{field}'], {'jobs': 0, 'published_jobs': 0, 'applications': 0})
+            stats['applications'] += row['count']
+
     return Response({
-        'total_jobs': total_jobs,
-        'published_jobs': published_jobs,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'department_stats': department_stats
+        'total_jobs': sum(job_statuses.values()),
+        'published_jobs': job_statuses.get('published', 0),
+        'total_applications': sum(application_statuses.values()),
+        'pending_applications': application_statuses.get('submitted', 0),
+        **breakdowns,
+        'application_status_stats': application_statuses,
     })
 
 # Public API Views for Website (No Authentication Required)
 
-class PublicJobPostingListView(generics.ListAPIView):
+class PublicJobPostingListView(PublicCacheMixin, ConditionalGetMixin, IndexedSearchMixin, SparseFieldsetMixin,
+                               generics.ListAPIView):
     """Public list of published job postings for website"""
     queryset = JobPosting.objects.filter(status='published')
     serializer_class = PublicJobPostingSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    cache_models = ['careers.JobPosting']
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, RankedOrderingFilter]
     filterset_fields = ['department', 'job_type', 'experience_level', 'location']
     search_fields = ['title', 'description', 'location']
     ordering = ['-published_at', '-created_at']
@@ -104,20 +143,18 @@ class PublicJobPostingListView(generics.ListAPIView):
         # to avoid incrementing on every API call
         return queryset
 
-class PublicJobPostingDetailView(generics.RetrieveAPIView):
+class PublicJobPostingDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
     """Public job posting detail view"""
     queryset = JobPosting.objects.filter(status='published')
     serializer_class = PublicJobPostingSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
     
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Increment view count
-        instance.views += 1
-        instance.save(update_fields=['views'])
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+    def get_object(self):
+        instance = super().get_object()
+        # Buffered; revalidated (304) requests are counted too
+        record_view(instance)
+        return instance
 
 class PublicJobApplicationCreateView(generics.CreateAPIView):
     """Public job application submission"""
@@ -127,7 +164,7 @@ class PublicJobApplicationCreateView(generics.CreateAPIView):
     
     def perform_create(self, serializer):
         application = serializer.save()
-        # Increment applications count for the job
-        job = application.job
-        job.applications_count += 1
-        job.save(update_fields=['applications_count'])
\ No newline at end of file
+        # Increment applications count for the job atomically
+        JobPosting.objects.filter(pk=application.job_id).update(
+            applications_count=F('applications_count') + 1
+        )
\ No newline at end of file
@@ -22,6 +22,9 @@ class ClientAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_project_counts()
 
 @admin.register(ClientContact)
 class ClientContactAdmin(admin.ModelAdmin):
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ClientsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clients'
+
+    def ready(self):
+        from sheba_admin_backend.cache import connect_invalidation
+        connect_invalidation('clients.Client')
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['is_active', '-created_at'], name='clients_cli_is_acti_4834a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='client_active_name_idx'),
+        ),
+    ]
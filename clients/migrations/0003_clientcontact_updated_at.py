@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientcontact',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,8 +1,24 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+ACTIVE_PROJECT_STATUSES = ['planning', 'in_progress', 'testing']
+
+class ClientQuerySet(models.QuerySet):
+    def with_project_counts(self):
+        """Annotate total and active project counts in the list query"""
+        from django.db.models import OuterRef
+        from projects.models import Project, count_subquery
+        projects = Project.objects.filter(client=OuterRef('pk'))
+        return self.annotate(
+            project_count=count_subquery(projects, 'client'),
+            active_project_count=count_subquery(
+                projects.filter(status__in=ACTIVE_PROJECT_STATUSES), 'client'
+            ),
+        )
+
 class Client(models.Model):
     """Client management model"""
     TYPE_CHOICES = [
@@ -27,19 +43,29 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ClientQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', '-created_at']),
+            models.Index(fields=['name'], condition=Q(is_active=True), name='client_active_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.company})" if self.company else self.name
     
     @property
     def total_projects(self):
+        if hasattr(self, 'project_count'):
+            return self.project_count
         return self.projects.count()
     
     @property
     def active_projects(self):
-        return self.projects.filter(status__in=['planning', 'in_progress', 'testing']).count()
+        if hasattr(self, 'active_project_count'):
+            return self.active_project_count
+        return self.projects.filter(status__in=ACTIVE_PROJECT_STATUSES).count()
 
 class ClientContact(models.Model):
     """Additional contact persons for clients"""
@@ -50,6 +76,7 @@ class ClientContact(models.Model):
     position = models.CharField(max_length=100, blank=True)
     is_primary = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.name} - {self.client.name}"
@@ -1,14 +1,15 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import Client, ClientContact
 
-class ClientContactSerializer(serializers.ModelSerializer):
+class ClientContactSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for ClientContact model"""
     class Meta:
         model = ClientContact
-        fields = ['id', 'name', 'email', 'phone', 'position', 'is_primary', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'name', 'email', 'phone', 'position', 'is_primary', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Client model"""
     contacts = ClientContactSerializer(many=True, read_only=True)
     total_projects = serializers.ReadOnlyField()
@@ -20,8 +21,9 @@ class ClientSerializer(serializers.ModelSerializer):
                  'client_type', 'contact_person', 'notes', 'is_active', 'contacts',
                  'total_projects', 'active_projects', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_sources = {'total_projects': [], 'active_projects': []}
 
-class ClientSummarySerializer(serializers.ModelSerializer):
+class ClientSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for client summaries"""
     total_projects = serializers.ReadOnlyField()
     active_projects = serializers.ReadOnlyField()
@@ -30,3 +32,4 @@ class ClientSummarySerializer(serializers.ModelSerializer):
         model = Client
         fields = ['id', 'name', 'company', 'email', 'client_type', 'is_active',
                  'total_projects', 'active_projects']
+        field_sources = {'total_projects': [], 'active_projects': []}
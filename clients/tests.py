@@ -1,3 +1,128 @@
+import csv
+import json
+from datetime import date
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.models import User
+from projects.models import Project
+from .models import Client, ClientContact
 
-# Create your tests here.
+
+class ClientStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Client.objects.create(name='A', email='a@example.com', phone='1')
+        Client.objects.create(name='B', email='b@example.com', phone='2',
+                              client_type='enterprise', is_active=False)
+
+    def test_stats_use_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('clients:client-stats'))
+        self.assertEqual(response.data['total_clients'], 2)
+        self.assertEqual(response.data['active_clients'], 1)
+        self.assertEqual(response.data['individual_clients'], 1)
+
+
+class ClientListQueryCountTests(TestCase):
+    """Client lists must cost a constant number of queries as clients grow"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(5):
+            client = Client.objects.create(name=f'C{i}', email=f'c{i}@example.com', phone='1')
+            ClientContact.objects.create(client=client, name='Contact', email=f'k{i}@example.com')
+            for status in ['in_progress', 'completed']:
+                Project.objects.create(name=status, description='', client=client,
+                                       status=status, start_date=date.today())
+
+    def test_list(self):
+        # Validators, COUNT for pagination, the annotated page, the contacts prefetch
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('clients:client-list-create'))
+        row = response.data['results'][0]
+        self.assertEqual(row['total_projects'], 2)
+        self.assertEqual(row['active_projects'], 1)
+        self.assertEqual(len(row['contacts']), 1)
+
+    def test_contact_edit_refreshes_etag(self):
+        url = reverse('clients:client-list-create')
+        etag = self.client.get(url)['ETag']
+        contact = ClientContact.objects.first()
+        contact.phone = '555'
+        contact.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_public_list(self):
+        self.client.force_authenticate(None)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('clients:public-client-list'))
+        self.assertEqual(response.data['results'][0]['total_projects'], 2)
+
+    def test_properties_without_annotation(self):
+        client = Client.objects.first()
+        self.assertEqual(client.total_projects, 2)
+        self.assertEqual(client.active_projects, 1)
+
+
+class ClientExportTests(TestCase):
+    """``?format=csv|jsonl`` streams every filtered row of the list"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            client = Client.objects.create(name=f'Client {i}', email=f'c{i}@example.com', phone='1',
+                                           company='Acme' if i else 'Other', is_active=i != 1)
+            Project.objects.create(name='P', description='', client=client, status='in_progress',
+                                   start_date=date.today())
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_honours_filters_search_and_ordering(self):
+        response = self.client.get(reverse('clients:client-list-create'),
+                                   {'format': 'csv', 'is_active': 'true', 'search': 'Acme', 'ordering': 'name'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="clients-', response['Content-Disposition'])
+        lines = self.content(response).splitlines()
+        header = lines[0].split(',')
+        self.assertIn('name', header)
+        self.assertNotIn('contacts', header)
+        self.assertNotIn('total_projects', header)
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Client 2', lines[1])
+
+    def test_csv_neutralizes_formulas(self):
+        Client.objects.filter(name='Client 0').update(name='=HYPERLINK("http://x")', company='-2+3')
+        response = self.client.get(reverse('clients:client-list-create'),
+                                   {'format': 'csv', 'fields': 'name,company', 'ordering': 'name'})
+        rows = list(csv.reader(self.content(response).splitlines()))
+        self.assertEqual(rows[1], ['\'=HYPERLINK("http://x")', "'-2+3"])
+        self.assertEqual(rows[2], ['Client 1', 'Acme'])
+        # JSON Lines are not evaluated; values stay as they are
+        response = self.client.get(reverse('clients:client-list-create'),
+                                   {'format': 'jsonl', 'fields': 'name', 'ordering': 'name'})
+        self.assertEqual(json.loads(self.content(response).splitlines()[0])['name'], '=HYPERLINK("http://x")')
+
+    def test_jsonl_fields_and_no_pagination(self):
+        response = self.client.get(reverse('clients:client-list-create'),
+                                   {'format': 'jsonl', 'fields': 'id,name', 'ordering': 'name', 'page_size': 1})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Client 0', 'Client 1', 'Client 2'])
+        self.assertEqual(set(rows[0]), {'id', 'name'})
+
+    def test_accept_header(self):
+        response = self.client.get(reverse('clients:client-list-create'), HTTP_ACCEPT='text/csv')
+        self.assertEqual(len(self.content(response).splitlines()), 4)
+        self.assertEqual(self.client.get(reverse('clients:client-list-create'))['Content-Type'],
+                         'application/json')
@@ -23,6 +23,11 @@ urlpatterns = [
         views.ClientContactListCreateView.as_view(),
         name="client-contact-list-create",
     ),
+    path(
+        "<int:client_id>/contacts/bulk/",
+        views.ClientContactBulkView.as_view(),
+        name="client-contact-bulk",
+    ),
     path(
         "contacts/<int:pk>/",
         views.ClientContactDetailView.as_view(),
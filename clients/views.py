@@ -3,17 +3,22 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from sheba_admin_backend.bulk import BulkView
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import ConditionalGetMixin, SparseFieldsetMixin, PublicCacheMixin
+from dashboard.stats import client_counts
 from .models import Client, ClientContact
 from .serializers import ClientSerializer, ClientContactSerializer, ClientSummarySerializer
 
 import logging
 logger = logging.getLogger(__name__)
 
-class ClientListCreateView(generics.ListCreateAPIView):
+class ClientListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all clients or create a new client"""
-    queryset = Client.objects.all()
+    queryset = Client.objects.with_project_counts().prefetch_related('contacts')
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'projects__updated_at', 'contacts__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['client_type', 'is_active']
     search_fields = ['name', 'company', 'email']
@@ -30,23 +35,25 @@ class ClientListCreateView(generics.ListCreateAPIView):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-class ClientDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ClientDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a client"""
-    queryset = Client.objects.all()
+    queryset = Client.objects.with_project_counts().prefetch_related('contacts')
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'projects__updated_at', 'contacts__updated_at']
 
-class ClientSummaryListView(generics.ListAPIView):
+class ClientSummaryListView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List clients with summary data"""
-    queryset = Client.objects.all()
+    queryset = Client.objects.with_project_counts()
     serializer_class = ClientSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'projects__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['client_type', 'is_active']
     search_fields = ['name', 'company']
     ordering = ['-created_at']
 
-class ClientContactListCreateView(generics.ListCreateAPIView):
+class ClientContactListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List contacts for a client or create a new contact"""
     serializer_class = ClientContactSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -64,7 +71,20 @@ class ClientContactListCreateView(generics.ListCreateAPIView):
         else:
             serializer.save()
 
-class ClientContactDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ClientContactBulkView(BulkView):
+    """Create, update or delete many contacts of one client at once"""
+    serializer_class = ClientContactSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['is_primary']
+    
+    def get_queryset(self):
+        return ClientContact.objects.filter(client_id=self.kwargs['client_id'])
+    
+    def get_create_defaults(self):
+        return {'client': generics.get_object_or_404(Client, pk=self.kwargs['client_id'])}
+
+class ClientContactDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a client contact"""
     queryset = ClientContact.objects.all()
     serializer_class = ClientContactSerializer
@@ -74,25 +94,24 @@ class ClientContactDetailView(generics.RetrieveUpdateDestroyAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def client_stats(request):
     """Get client statistics"""
-    total_clients = Client.objects.count()
-    active_clients = Client.objects.filter(is_active=True).count()
-    individual_clients = Client.objects.filter(client_type='individual').count()
-    business_clients = Client.objects.filter(client_type='business').count()
+    counts = client_counts()
     
     return Response({
-        'total_clients': total_clients,
-        'active_clients': active_clients,
-        'individual_clients': individual_clients,
-        'business_clients': business_clients
+        'total_clients': counts['total'],
+        'active_clients': counts['active'],
+        'individual_clients': counts['individual'],
+        'business_clients': counts['business']
     })
 
 # Public API Views for Website (No Authentication Required)
 
-class PublicClientListView(generics.ListAPIView):
+class PublicClientListView(PublicCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Public list of active clients for website testimonials"""
-    queryset = Client.objects.filter(is_active=True)
+    queryset = Client.objects.filter(is_active=True).with_project_counts()
     serializer_class = ClientSummarySerializer
     permission_classes = [permissions.AllowAny]
+    validator_fields = ['updated_at', 'projects__updated_at']
+    cache_models = ['clients.Client', 'projects.Project']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['client_type', 'is_active']
     search_fields = ['name', 'company']
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['status', '-created_at'], name='communicati_status_e70505_idx'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+from sheba_admin_backend.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0003_list_indexes'),
+    ]
+
+    operations = [
+        # GIN index on PostgreSQL, FTS5 table and triggers on SQLite
+        CreateSearchIndex(model_name='contactsubmission', fields=['name', 'email', 'subject', 'message']),
+    ]
@@ -27,6 +27,10 @@ class ContactSubmission(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -110,6 +114,10 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['recipient', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import ContactSubmission, EmailTemplate, Newsletter, NewsletterSubscriber, Notification
 from authentication.serializers import UserProfileSerializer
 
-class ContactSubmissionSerializer(serializers.ModelSerializer):
+class ContactSubmissionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for ContactSubmission model"""
     assigned_to = UserProfileSerializer(read_only=True)
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
@@ -14,7 +15,7 @@ class ContactSubmissionSerializer(serializers.ModelSerializer):
                  'created_at', 'updated_at']
         read_only_fields = ['id', 'ip_address', 'user_agent', 'created_at', 'updated_at']
 
-class EmailTemplateSerializer(serializers.ModelSerializer):
+class EmailTemplateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for EmailTemplate model"""
     class Meta:
         model = EmailTemplate
@@ -22,7 +23,7 @@ class EmailTemplateSerializer(serializers.ModelSerializer):
                  'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class NewsletterSerializer(serializers.ModelSerializer):
+class NewsletterSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Newsletter model"""
     created_by = UserProfileSerializer(read_only=True)
     created_by_id = serializers.IntegerField(write_only=True)
@@ -35,14 +36,14 @@ class NewsletterSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'sent_at', 'recipients_count', 'opened_count', 
                            'clicked_count', 'created_at', 'updated_at']
 
-class NewsletterSubscriberSerializer(serializers.ModelSerializer):
+class NewsletterSubscriberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for NewsletterSubscriber model"""
     class Meta:
         model = NewsletterSubscriber
         fields = ['id', 'email', 'name', 'is_active', 'subscribed_at', 'unsubscribed_at']
         read_only_fields = ['id', 'subscribed_at', 'unsubscribed_at']
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Notification model"""
     recipient = UserProfileSerializer(read_only=True)
     recipient_id = serializers.IntegerField(write_only=True)
@@ -1,3 +1,118 @@
+from unittest import mock
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.models import User
+from dashboard.counters import diff_counters
+from dashboard.models import ActivityLog
+from .models import ContactSubmission, NewsletterSubscriber, Notification
 
-# Create your tests here.
+
+class CommunicationStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        ContactSubmission.objects.create(name='A', email='a@example.com', subject='Hi', message='x')
+        ContactSubmission.objects.create(name='B', email='b@example.com', subject='Hi', message='x',
+                                         status='resolved')
+        NewsletterSubscriber.objects.create(email='c@example.com')
+
+    def test_stats_use_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('communication:communication-stats'))
+        self.assertEqual(response.data, {
+            'contact_submissions': 2,
+            'pending_submissions': 1,
+            'newsletter_subscribers': 1,
+            'sent_newsletters': 0,
+        })
+
+
+@mock.patch('dashboard.audit.audit_writer.enqueue', lambda entry: entry.save())
+class BulkEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_import_subscribers_in_constant_queries(self):
+        items = [{'email': f's{i}@example.com', 'name': f'S{i}'} for i in range(150)]
+        with self.captureOnCommitCallbacks(execute=True):
+            # Unique check, one insert, the counter moved (and created, as it is the first row), savepoints
+            with self.assertNumQueries(9):
+                response = self.client.post(reverse('communication:subscriber-bulk'), items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 150)
+        self.assertEqual(NewsletterSubscriber.objects.count(), 150)
+        stats = self.client.get(reverse('communication:communication-stats')).data
+        self.assertEqual(stats['newsletter_subscribers'], 150)
+        log = ActivityLog.objects.get()
+        self.assertEqual(log.description, 'Created 150 newsletter subscribers in bulk')
+
+    def test_errors_per_item_and_nothing_saved(self):
+        NewsletterSubscriber.objects.create(email='taken@example.com')
+        items = [
+            {'email': 'new@example.com'},
+            {'email': 'taken@example.com'},
+            {'email': 'not-an-email'},
+            {'email': 'new@example.com'},
+        ]
+        response = self.client.post(reverse('communication:subscriber-bulk'), items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('email', response.data[1])
+        self.assertIn('email', response.data[2])
+        self.assertIn('email', response.data[3])
+        self.assertEqual(NewsletterSubscriber.objects.count(), 1)
+
+    def test_update_items_and_unknown_ids(self):
+        first = ContactSubmission.objects.create(name='A', email='a@example.com', subject='Hi', message='x')
+        second = ContactSubmission.objects.create(name='B', email='b@example.com', subject='Hi', message='x')
+        url = reverse('communication:contact-bulk')
+        response = self.client.patch(url, [
+            {'id': first.pk, 'status': 'closed', 'assigned_to_id': self.user.pk},
+            {'id': second.pk, 'status': 'resolved'},
+        ], format='json')
+        self.assertEqual(response.data, {'updated': 2})
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.assigned_to_id), ('closed', self.user.pk))
+        self.assertEqual(self.client.get(reverse('communication:communication-stats')).data['pending_submissions'], 0)
+
+        response = self.client.patch(url, [{'id': 999, 'status': 'closed'},
+                                           {'id': first.pk, 'assigned_to_id': 999}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {'id': ['Not found.']})
+        self.assertEqual(list(response.data[1]), ['assigned_to_id'])
+
+    def test_counters_move_by_the_written_rows(self):
+        ids = [ContactSubmission.objects.create(name='A', email=f'a{i}@example.com', subject='Hi', message='x').pk
+               for i in range(4)]
+        url = reverse('communication:contact-bulk')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(url, {'ids': ids[:2], 'set': {'status': 'closed'}}, format='json')
+            self.client.patch(url, [{'id': ids[2], 'status': 'resolved'}, {'id': ids[2], 'name': 'B'}],
+                              format='json')
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('DELETE')])
+        self.assertEqual(diff_counters('communication.ContactSubmission'), [])
+        self.assertEqual(self.client.get(reverse('communication:communication-stats')).data['pending_submissions'], 1)
+
+    def test_mark_all_notifications_read(self):
+        other = User.objects.create_user(username='other', password='pass')
+        for recipient in [self.user, self.user, other]:
+            Notification.objects.create(title='N', message='m', recipient=recipient)
+        self.client.force_authenticate(other)
+        response = self.client.patch(reverse('communication:notification-bulk') + '?is_read=false',
+                                     {'all': True, 'set': {'is_read': True}}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 2)
+
+    def test_delete_ids(self):
+        ids = [NewsletterSubscriber.objects.create(email=f'd{i}@example.com').pk for i in range(3)]
+        response = self.client.delete(reverse('communication:subscriber-bulk'), {'ids': ids[:2]}, format='json')
+        self.assertEqual(response.data, {'deleted': 2})
+        self.assertEqual(list(NewsletterSubscriber.objects.values_list('pk', flat=True)), ids[2:])
+        response = self.client.delete(reverse('communication:subscriber-bulk'), {'ids': 'all'}, format='json')
+        self.assertEqual(response.status_code, 400)
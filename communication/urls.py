@@ -6,6 +6,7 @@ app_name = 'communication'
 urlpatterns = [
     # Contact Submissions
     path('contacts/', views.ContactSubmissionListCreateView.as_view(), name='contact-list-create'),
+    path('contacts/bulk/', views.ContactSubmissionBulkView.as_view(), name='contact-bulk'),
     path('contacts/<int:pk>/', views.ContactSubmissionDetailView.as_view(), name='contact-detail'),
     
     # Email Templates
@@ -18,10 +19,12 @@ urlpatterns = [
     
     # Newsletter Subscribers
     path('subscribers/', views.NewsletterSubscriberListCreateView.as_view(), name='subscriber-list-create'),
+    path('subscribers/bulk/', views.NewsletterSubscriberBulkView.as_view(), name='subscriber-bulk'),
     path('subscribers/<int:pk>/', views.NewsletterSubscriberDetailView.as_view(), name='subscriber-detail'),
     
     # Notifications
     path('notifications/', views.NotificationListCreateView.as_view(), name='notification-list-create'),
+    path('notifications/bulk/', views.NotificationBulkView.as_view(), name='notification-bulk'),
     path('notifications/<int:pk>/', views.NotificationDetailView.as_view(), name='notification-detail'),
     path('notifications/<int:pk>/mark-read/', views.mark_notification_read, name='notification-mark-read'),
     
@@ -3,30 +3,46 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from sheba_admin_backend.bulk import BulkView
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import SparseFieldsetMixin
+from sheba_admin_backend.pagination import OptionalCursorPagination
+from sheba_admin_backend.search import FullTextSearchFilter, RankedOrderingFilter
+from dashboard.stats import communication_counts
 from .models import ContactSubmission, EmailTemplate, Newsletter, NewsletterSubscriber, Notification
 from .serializers import (
     ContactSubmissionSerializer, EmailTemplateSerializer, NewsletterSerializer,
     NewsletterSubscriberSerializer, NotificationSerializer
 )
 
-class ContactSubmissionListCreateView(generics.ListCreateAPIView):
+class ContactSubmissionListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all contact submissions or create a new submission"""
     queryset = ContactSubmission.objects.all()
     serializer_class = ContactSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['status', 'assigned_to']
     search_fields = ['name', 'email', 'subject', 'message']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
 
-class ContactSubmissionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ContactSubmissionDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a contact submission"""
     queryset = ContactSubmission.objects.all()
     serializer_class = ContactSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class EmailTemplateListCreateView(generics.ListCreateAPIView):
+class ContactSubmissionBulkView(BulkView):
+    """Create, update (e.g. close) or delete many contact submissions at once"""
+    queryset = ContactSubmission.objects.all()
+    serializer_class = ContactSubmissionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'assigned_to']
+
+class EmailTemplateListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all email templates or create a new template"""
     queryset = EmailTemplate.objects.all()
     serializer_class = EmailTemplateSerializer
@@ -36,13 +52,13 @@ class EmailTemplateListCreateView(generics.ListCreateAPIView):
     search_fields = ['name', 'subject', 'content']
     ordering = ['-created_at']
 
-class EmailTemplateDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmailTemplateDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete an email template"""
     queryset = EmailTemplate.objects.all()
     serializer_class = EmailTemplateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class NewsletterListCreateView(generics.ListCreateAPIView):
+class NewsletterListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all newsletters or create a new newsletter"""
     queryset = Newsletter.objects.all()
     serializer_class = NewsletterSerializer
@@ -53,13 +69,13 @@ class NewsletterListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['created_at', 'scheduled_at', 'sent_at']
     ordering = ['-created_at']
 
-class NewsletterDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NewsletterDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a newsletter"""
     queryset = Newsletter.objects.all()
     serializer_class = NewsletterSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class NewsletterSubscriberListCreateView(generics.ListCreateAPIView):
+class NewsletterSubscriberListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all newsletter subscribers or create a new subscriber"""
     queryset = NewsletterSubscriber.objects.all()
     serializer_class = NewsletterSubscriberSerializer
@@ -69,17 +85,27 @@ class NewsletterSubscriberListCreateView(generics.ListCreateAPIView):
     search_fields = ['email', 'name']
     ordering = ['-subscribed_at']
 
-class NewsletterSubscriberDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NewsletterSubscriberDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a newsletter subscriber"""
     queryset = NewsletterSubscriber.objects.all()
     serializer_class = NewsletterSubscriberSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class NotificationListCreateView(generics.ListCreateAPIView):
+class NewsletterSubscriberBulkView(BulkView):
+    """Import, update or delete many newsletter subscribers at once"""
+    queryset = NewsletterSubscriber.objects.all()
+    serializer_class = NewsletterSubscriberSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['is_active']
+
+class NotificationListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all notifications or create a new notification"""
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-created_at', '-id')
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['notification_type', 'recipient', 'is_read']
     search_fields = ['title', 'message']
@@ -91,7 +117,7 @@ class NotificationListCreateView(generics.ListCreateAPIView):
             return Notification.objects.all()
         return Notification.objects.filter(recipient=self.request.user)
 
-class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NotificationDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a notification"""
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
@@ -103,6 +129,19 @@ class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
             return Notification.objects.all()
         return Notification.objects.filter(recipient=self.request.user)
 
+class NotificationBulkView(BulkView):
+    """Create, update (e.g. mark read) or delete many notifications at once"""
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['notification_type', 'is_read']
+    
+    def get_queryset(self):
+        # Users can only change their own notifications unless they're admin
+        if self.request.user.is_staff or self.request.user.role == 'admin':
+            return Notification.objects.all()
+        return Notification.objects.filter(recipient=self.request.user)
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_notification_read(request, pk):
@@ -123,14 +162,4 @@ def mark_notification_read(request, pk):
 @permission_classes([permissions.IsAuthenticated])
 def communication_stats(request):
     """Get communication statistics"""
-    contact_submissions = ContactSubmission.objects.count()
-    pending_submissions = ContactSubmission.objects.filter(status='new').count()
-    newsletter_subscribers = NewsletterSubscriber.objects.filter(is_active=True).count()
-    sent_newsletters = Newsletter.objects.filter(status='sent').count()
-    
-    return Response({
-        'contact_submissions': contact_submissions,
-        'pending_submissions': pending_submissions,
-        'newsletter_subscribers': newsletter_subscribers,
-        'sent_newsletters': sent_newsletters
-    })
+    return Response(communication_counts())
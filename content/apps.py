@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'content'
+
+    def ready(self):
+        from sheba_admin_backend.cache import connect_invalidation
+        from sheba_admin_backend.public_search import connect_public_search
+        connect_invalidation('content.BlogPost', ignore_fields=['views'])
+        connect_invalidation('content.PortfolioProject')
+        connect_invalidation('content.Service')
+        connect_invalidation('content.TeamMember')
+        connect_public_search('content.BlogPost')
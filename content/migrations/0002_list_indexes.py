@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['status', '-created_at'], name='content_blo_status_74c13e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-published_at', '-created_at'], name='blogpost_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['category', '-published_at', '-created_at'], name='blogpost_published_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolioproject',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['order', '-created_at'], name='portfolio_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['order', 'title'], name='service_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['order', 'name'], name='teammember_active_order_idx'),
+        ),
+    ]
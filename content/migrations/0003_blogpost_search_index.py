@@ -0,0 +1,14 @@
+from django.db import migrations
+from sheba_admin_backend.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_list_indexes'),
+    ]
+
+    operations = [
+        # GIN index on PostgreSQL, FTS5 table and triggers on SQLite
+        CreateSearchIndex(model_name='blogpost', fields=['title', 'content', 'excerpt']),
+    ]
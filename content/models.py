@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -49,6 +50,11 @@ class BlogPost(models.Model):
     
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['-published_at', '-created_at'], condition=Q(status='published'), name='blogpost_published_idx'),
+            models.Index(fields=['category', '-published_at', '-created_at'], condition=Q(status='published'), name='blogpost_published_cat_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -75,6 +81,9 @@ class PortfolioProject(models.Model):
     
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], condition=Q(status='active'), name='portfolio_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -98,6 +107,9 @@ class Service(models.Model):
     
     class Meta:
         ordering = ['order', 'title']
+        indexes = [
+            models.Index(fields=['order', 'title'], condition=Q(status='active'), name='service_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -124,6 +136,9 @@ class TeamMember(models.Model):
     
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], condition=Q(status='active'), name='teammember_active_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.role}"
@@ -1,15 +1,16 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import WebsiteContent, BlogPost, PortfolioProject, Service, TeamMember
 from authentication.serializers import UserProfileSerializer
 
-class WebsiteContentSerializer(serializers.ModelSerializer):
+class WebsiteContentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for WebsiteContent model"""
     class Meta:
         model = WebsiteContent
         fields = ['id', 'section', 'title', 'content', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class BlogPostSerializer(serializers.ModelSerializer):
+class BlogPostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for BlogPost model"""
     author = UserProfileSerializer(read_only=True)
     author_id = serializers.IntegerField(write_only=True, required=False)
@@ -49,7 +50,7 @@ class BlogPostSerializer(serializers.ModelSerializer):
         
         return super().update(instance, validated_data)
 
-class BlogPostSummarySerializer(serializers.ModelSerializer):
+class BlogPostSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for blog post summaries"""
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     
@@ -58,7 +59,16 @@ class BlogPostSummarySerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'slug', 'excerpt', 'author_name', 'category', 
                  'status', 'views', 'published_at', 'created_at']
 
-class PortfolioProjectSerializer(serializers.ModelSerializer):
+class PublicBlogPostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Serializer for public blog post display; the author is only named"""
+    author_name = serializers.CharField(source='author.get_full_name', read_only=True)
+
+    class Meta:
+        model = BlogPost
+        fields = ['id', 'title', 'slug', 'content', 'excerpt', 'author_name', 'category',
+                  'featured_image', 'views', 'published_at', 'created_at', 'updated_at']
+
+class PortfolioProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for PortfolioProject model"""
     class Meta:
         model = PortfolioProject
@@ -66,7 +76,7 @@ class PortfolioProjectSerializer(serializers.ModelSerializer):
                  'project_url', 'github_url', 'status', 'order', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Service model"""
     class Meta:
         model = Service
@@ -74,7 +84,7 @@ class ServiceSerializer(serializers.ModelSerializer):
                  'status', 'order', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for TeamMember model"""
     class Meta:
         model = TeamMember
@@ -1,3 +1,330 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.models import User
+from sheba_admin_backend.cache import bump_version
+from sheba_admin_backend.public_search import PUBLIC_INDEXES, PublicSearchIndex
+from sheba_admin_backend.view_counts import flush_view_counts
+from .models import BlogPost, Service
 
-# Create your tests here.
+
+class ContentStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        BlogPost.objects.create(title='One', slug='one', content='x', author=self.user,
+                                category='technology', status='published')
+        BlogPost.objects.create(title='Two', slug='two', content='x', author=self.user,
+                                category='technology')
+        Service.objects.create(title='Web', description='x')
+
+    def test_stats_use_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('content:content-stats'))
+        self.assertEqual(response.data['blog_posts'], 2)
+        self.assertEqual(response.data['published_posts'], 1)
+        self.assertEqual(response.data['active_services'], 1)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        BlogPost.objects.create(title='One', slug='one', content='long body', author=self.user,
+                                category='technology', status='published')
+
+    def test_fields_trims_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('content:blog-list-create'), {'fields': 'id,title,status'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'status'})
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn('"title"', page_query)
+        self.assertNotIn('"content"', page_query)
+
+    def test_without_fields_returns_everything(self):
+        response = self.client.get(reverse('content:blog-list-create'))
+        self.assertIn('content', response.data['results'][0])
+        self.assertIn('author', response.data['results'][0])
+
+    def test_fields_ignored_on_write(self):
+        response = self.client.post(
+            reverse('content:blog-list-create') + '?fields=id',
+            {'title': 'Two', 'slug': 'two', 'content': 'x', 'category': 'design'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['title'], 'Two')
+
+
+class PublicCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.post = BlogPost.objects.create(title='One', slug='one', content='x', author=self.user,
+                                            category='technology', status='published')
+        self.url = reverse('content:public-blog-list')
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.client.get(self.url, {'category': 'technology', 'ordering': 'title'})
+        # Same parameters in a different order hit the same entry
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url + '?ordering=title&category=technology&search=')
+        self.assertEqual(response.data['count'], 1)
+
+    def test_save_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Renamed'
+            self.post.save()
+            # Not before the change is committed
+            self.assertEqual(self.client.get(self.url).data['results'][0]['title'], 'One')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+
+    def test_delete_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.delete()
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+    def test_unrelated_model_does_not_invalidate(self):
+        self.client.get(self.url)
+        Service.objects.create(title='Web', description='x')
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = BlogPost.objects.create(title='One', slug='one', content='x', author=self.user,
+                                            category='technology', status='published')
+
+    def test_list_not_modified(self):
+        url = reverse('content:blog-list-create')
+        etag = self.client.get(url)['ETag']
+        # Only the validator aggregate runs
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        url = reverse('content:blog-list-create')
+        first = self.client.get(url)['ETag']
+        self.post.title = 'Renamed'
+        self.post.save()
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(second.status_code, 200)
+        self.post.delete()
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+
+    def test_etag_depends_on_query(self):
+        url = reverse('content:blog-list-create')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'status': 'draft'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_not_modified(self):
+        url = reverse('content:blog-detail', args=[self.post.pk])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_public_cache_hit_not_modified(self):
+        url = reverse('content:public-blog-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+
+
+class PublicBlogPostDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='admin', password='pass')
+        self.post = BlogPost.objects.create(title='One', slug='one', content='x', author=user,
+                                            category='technology', status='published')
+
+    @mock.patch('sheba_admin_backend.view_counts.cache_is_shared', return_value=True)
+    def test_views_are_buffered(self, shared):
+        url = reverse('content:public-blog-detail', args=['one'])
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=10):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.client.get(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+        with mock.patch('sheba_admin_backend.view_counts.current_slot', return_value=12):
+            flush_view_counts()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
+
+    def test_author_is_only_named(self):
+        self.post.author.first_name, self.post.author.last_name = 'Abebe', 'Kebede'
+        self.post.author.phone = '0911000000'
+        self.post.author.save()
+        # The post joined with its author, then the view count (written directly with the local cache)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('content:public-blog-detail', args=['one']))
+        self.assertEqual(response.data['author_name'], 'Abebe Kebede')
+        self.assertEqual(response.data['content'], 'x')
+        self.assertNotIn('author', response.data)
+        body = response.content.decode()
+        self.assertNotIn('email', body)
+        self.assertNotIn('phone', body)
+        self.assertNotIn('0911000000', body)
+
+    def test_drafts_are_hidden(self):
+        self.post.status = 'draft'
+        self.post.save()
+        response = self.client.get(reverse('content:public-blog-detail', args=['one']))
+        self.assertEqual(response.status_code, 404)
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.body_match = BlogPost.objects.create(
+            title='Weekly notes', slug='notes', content='A few words on Django deployment', author=self.user,
+            category='technology')
+        self.title_match = BlogPost.objects.create(
+            title='Deploying Django', slug='deploying', content='Step by step', author=self.user,
+            category='technology')
+        BlogPost.objects.create(title='Design systems', slug='design', content='Colours', author=self.user,
+                                category='design')
+        self.url = reverse('content:blog-list-create')
+
+    def search(self, term, **params):
+        response = self.client.get(self.url, {'search': term, **params})
+        return [row['slug'] for row in response.data['results']]
+
+    def test_ranked_prefix_matches(self):
+        with CaptureQueriesContext(connection) as queries:
+            slugs = self.search('djan deploy')
+        self.assertEqual(slugs, ['deploying', 'notes'])
+        matching = [query['sql'] for query in queries.captured_queries if 'MATCH' in query['sql']]
+        self.assertTrue(matching)
+        # The FTS table is joined once, not matched again per row for the rank
+        self.assertTrue(all(sql.count('"content_blogpost_fts" MATCH') == 1 for sql in matching))
+
+    def test_explicit_ordering_wins(self):
+        self.assertEqual(self.search('django', ordering='created_at'), ['notes', 'deploying'])
+
+    def test_index_follows_writes(self):
+        self.title_match.title = 'Shipping Flask'
+        self.title_match.content = 'Step by step'
+        self.title_match.save()
+        self.assertEqual(self.search('django'), ['notes'])
+        self.assertEqual(self.search('flask'), ['deploying'])
+        self.body_match.delete()
+        self.assertEqual(self.search('django'), [])
+        BlogPost.objects.bulk_create([
+            BlogPost(title='Bulk Django', slug='bulk', content='x', author=self.user, category='design')
+        ])
+        self.assertEqual(self.search('django'), ['bulk'])
+
+    def test_other_search_fields_fall_back(self):
+        response = self.client.get(reverse('content:blog-summary'), {'search': 'esign'})
+        self.assertEqual([row['slug'] for row in response.data['results']], ['design'])
+
+
+class PublicIndexedSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        PUBLIC_INDEXES['content.BlogPost'].reset()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.deploying = BlogPost.objects.create(
+            title='Deploying Django', slug='deploying', content='Step by step', author=self.user,
+            category='technology', status='published')
+        self.notes = BlogPost.objects.create(
+            title='Weekly notes', slug='notes', content='On Django deployments', author=self.user,
+            category='design', status='published')
+        BlogPost.objects.create(title='Django draft', slug='draft', content='x', author=self.user,
+                                category='technology')
+        self.url = reverse('content:public-blog-list')
+
+    def search(self, term, **params):
+        # Uncached responses, keeping the model versions the index checks
+        with override_settings(PUBLIC_API_CACHE_TIMEOUT=0):
+            response = self.client.get(self.url, {'search': term, **params})
+        return [row['slug'] for row in response.data['results']]
+
+    def test_ranked_and_stemmed(self):
+        self.assertEqual(self.search('deployed django'), ['deploying', 'notes'])
+        self.assertEqual(self.search('django', category='design'), ['notes'])
+        self.assertEqual(self.search('kubernetes'), [])
+
+    def test_page_hydrated_in_bulk(self):
+        self.search('django')
+        # Validators plus one in_bulk, no text scans
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search('django'), ['deploying', 'notes'])
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any('LIKE' in query['sql'] or 'MATCH' in query['sql'] for query in queries))
+
+    def test_index_follows_commits(self):
+        self.search('django')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deploying.title = 'Deploying Flask'
+            self.deploying.save()
+        self.assertEqual(self.search('flask'), ['deploying'])
+        self.assertEqual(self.search('django'), ['notes'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deploying.status = 'archived'
+            self.deploying.save()
+        self.assertEqual(self.search('flask'), [])
+
+    def test_count_covers_every_match(self):
+        BlogPost.objects.bulk_create([
+            BlogPost(title=f'Django {i}', slug=f'django-{i}', content='x', author=self.user,
+                     category='technology', status='published') for i in range(1100)
+        ])
+        bump_version('content.BlogPost')
+        response = self.client.get(self.url, {'search': 'django', 'page': 56})
+        self.assertEqual(response.data['count'], 1102)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_own_changes_applied_without_rebuild(self):
+        search_index = PUBLIC_INDEXES['content.BlogPost']
+        search_index.current()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deploying.title = 'Deploying Flask'
+            self.deploying.save()
+            BlogPost.objects.create(title='Flask draft', slug='flask-draft', content='x', author=self.user,
+                                    category='technology')
+        with self.assertNumQueries(0):
+            self.assertEqual(search_index.current().search('flask'), [self.deploying.pk])
+
+    def test_workers_rebuild_on_version_change(self):
+        worker = PublicSearchIndex('content.BlogPost')
+        self.assertEqual(worker.current().search('django'), [self.deploying.pk, self.notes.pk])
+        # Changed by another worker, whose signals this one never sees
+        BlogPost.objects.filter(pk=self.deploying.pk).update(status='archived')
+        bump_version('content.BlogPost')
+        self.assertEqual(worker.current().search('django'), [self.notes.pk])
+        with self.assertNumQueries(0):
+            worker.current()
+
+    def test_workers_share_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(PUBLIC_SEARCH_SNAPSHOT_DIR=directory):
+            worker = PublicSearchIndex('content.BlogPost')
+            other = PublicSearchIndex('content.BlogPost')
+            self.assertEqual(worker.current().search('django'), [self.deploying.pk, self.notes.pk])
+            with self.assertNumQueries(0):
+                self.assertEqual(len(other.current()), 2)
+            worker.update(self.deploying.pk, None)
+            self.assertEqual(other.current().search('django'), [self.notes.pk])
@@ -30,6 +30,7 @@ urlpatterns = [
     
     # Public API endpoints for website (no authentication required)
     path('public/blog/', views.PublicBlogPostListView.as_view(), name='public-blog-list'),
+    path('public/blog/<slug:slug>/', views.PublicBlogPostDetailView.as_view(), name='public-blog-detail'),
     path('public/portfolio/', views.PublicPortfolioProjectListView.as_view(), name='public-portfolio-list'),
     path('public/services/', views.PublicServiceListView.as_view(), name='public-service-list'),
     path('public/team/', views.PublicTeamMemberListView.as_view(), name='public-team-list'),
@@ -3,13 +3,19 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import ConditionalGetMixin, SparseFieldsetMixin, PublicCacheMixin
+from sheba_admin_backend.public_search import IndexedSearchFilter, IndexedSearchMixin
+from sheba_admin_backend.search import FullTextSearchFilter, RankedOrderingFilter
+from sheba_admin_backend.view_counts import record_view
+from dashboard.stats import content_counts
 from .models import WebsiteContent, BlogPost, PortfolioProject, Service, TeamMember
 from .serializers import (
-    WebsiteContentSerializer, BlogPostSerializer, BlogPostSummarySerializer,
+    WebsiteContentSerializer, BlogPostSerializer, BlogPostSummarySerializer, PublicBlogPostSerializer,
     PortfolioProjectSerializer, ServiceSerializer, TeamMemberSerializer
 )
 
-class WebsiteContentListCreateView(generics.ListCreateAPIView):
+class WebsiteContentListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all website content or create new content"""
     queryset = WebsiteContent.objects.all()
     serializer_class = WebsiteContentSerializer
@@ -19,18 +25,18 @@ class WebsiteContentListCreateView(generics.ListCreateAPIView):
     search_fields = ['title', 'content']
     ordering = ['section', '-updated_at']
 
-class WebsiteContentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class WebsiteContentDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete website content"""
     queryset = WebsiteContent.objects.all()
     serializer_class = WebsiteContentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class BlogPostListCreateView(generics.ListCreateAPIView):
+class BlogPostListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all blog posts or create a new post"""
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['status', 'category', 'author']
     search_fields = ['title', 'content', 'excerpt']
     ordering_fields = ['created_at', 'published_at', 'views']
@@ -40,13 +46,13 @@ class BlogPostListCreateView(generics.ListCreateAPIView):
         # Automatically set the author to the current user
         serializer.save(author=self.request.user)
 
-class BlogPostDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BlogPostDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a blog post"""
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class BlogPostSummaryListView(generics.ListAPIView):
+class BlogPostSummaryListView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List blog posts with summary data"""
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSummarySerializer
@@ -56,7 +62,7 @@ class BlogPostSummaryListView(generics.ListAPIView):
     search_fields = ['title']
     ordering = ['-created_at']
 
-class PortfolioProjectListCreateView(generics.ListCreateAPIView):
+class PortfolioProjectListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all portfolio projects or create a new project"""
     queryset = PortfolioProject.objects.all()
     serializer_class = PortfolioProjectSerializer
@@ -67,13 +73,13 @@ class PortfolioProjectListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['order', 'created_at']
     ordering = ['order', '-created_at']
 
-class PortfolioProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PortfolioProjectDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a portfolio project"""
     queryset = PortfolioProject.objects.all()
     serializer_class = PortfolioProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class ServiceListCreateView(generics.ListCreateAPIView):
+class ServiceListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all services or create a new service"""
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
@@ -84,13 +90,13 @@ class ServiceListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['order', 'created_at']
     ordering = ['order', '-created_at']
 
-class ServiceDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ServiceDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a service"""
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class TeamMemberListCreateView(generics.ListCreateAPIView):
+class TeamMemberListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all team members or create a new member"""
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
@@ -101,7 +107,7 @@ class TeamMemberListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['order', 'created_at']
     ordering = ['order', '-created_at']
 
-class TeamMemberDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TeamMemberDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a team member"""
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
@@ -111,57 +117,63 @@ class TeamMemberDetailView(generics.RetrieveUpdateDestroyAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def content_stats(request):
     """Get content statistics"""
-    blog_posts = BlogPost.objects.count()
-    published_posts = BlogPost.objects.filter(status='published').count()
-    portfolio_projects = PortfolioProject.objects.count()
-    active_services = Service.objects.filter(status='active').count()
-    team_members = TeamMember.objects.filter(status='active').count()
-    
-    return Response({
-        'blog_posts': blog_posts,
-        'published_posts': published_posts,
-        'portfolio_projects': portfolio_projects,
-        'active_services': active_services,
-        'team_members': team_members
-    })
+    return Response(content_counts())
 
 # Public API Views for Website (No Authentication Required)
 
-class PublicBlogPostListView(generics.ListAPIView):
+class PublicBlogPostListView(PublicCacheMixin, ConditionalGetMixin, IndexedSearchMixin, SparseFieldsetMixin,
+                             generics.ListAPIView):
     """Public list of published blog posts for website"""
-    queryset = BlogPost.objects.filter(status='published')
+    queryset = BlogPost.objects.filter(status='published').select_related('author')
     serializer_class = BlogPostSummarySerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    cache_models = ['content.BlogPost']
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, RankedOrderingFilter]
     filterset_fields = ['category', 'status']
     search_fields = ['title', 'content', 'excerpt']
     ordering = ['-published_at', '-created_at']
 
-class PublicPortfolioProjectListView(generics.ListAPIView):
+class PublicBlogPostDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
+    """Public blog post detail view"""
+    queryset = BlogPost.objects.filter(status='published').select_related('author')
+    serializer_class = PublicBlogPostSerializer
+    permission_classes = [permissions.AllowAny]
+    lookup_field = 'slug'
+
+    def get_object(self):
+        instance = super().get_object()
+        # Buffered; revalidated (304) requests are counted too
+        record_view(instance)
+        return instance
+
+class PublicPortfolioProjectListView(PublicCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Public list of active portfolio projects for website"""
     queryset = PortfolioProject.objects.filter(status='active')
     serializer_class = PortfolioProjectSerializer
     permission_classes = [permissions.AllowAny]
+    cache_models = ['content.PortfolioProject']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['category', 'status']
     search_fields = ['title', 'description']
     ordering = ['order', '-created_at']
 
-class PublicServiceListView(generics.ListAPIView):
+class PublicServiceListView(PublicCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Public list of active services for website"""
     queryset = Service.objects.filter(status='active')
     serializer_class = ServiceSerializer
     permission_classes = [permissions.AllowAny]
+    cache_models = ['content.Service']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['title', 'description']
     ordering = ['order', 'title']
 
-class PublicTeamMemberListView(generics.ListAPIView):
+class PublicTeamMemberListView(PublicCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Public list of active team members for website"""
     queryset = TeamMember.objects.filter(status='active')
     serializer_class = TeamMemberSerializer
     permission_classes = [permissions.AllowAny]
+    cache_models = ['content.TeamMember']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['name', 'position', 'bio']
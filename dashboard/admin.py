@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DashboardMetric, ActivityLog
+from .models import DashboardMetric, MetricRollup, ActivityLog, StatusCounter
 
 @admin.register(DashboardMetric)
 class DashboardMetricAdmin(admin.ModelAdmin):
@@ -8,9 +8,21 @@ class DashboardMetricAdmin(admin.ModelAdmin):
     search_fields = ['metric_type']
     readonly_fields = ['created_at']
 
+@admin.register(MetricRollup)
+class MetricRollupAdmin(admin.ModelAdmin):
+    list_display = ['metric_type', 'period', 'period_start', 'count', 'total', 'average', 'updated_at']
+    list_filter = ['metric_type', 'period']
+    readonly_fields = ['updated_at']
+
 @admin.register(ActivityLog)
 class ActivityLogAdmin(admin.ModelAdmin):
     list_display = ['user', 'action', 'model_name', 'object_id', 'created_at']
     list_filter = ['action', 'model_name', 'created_at']
     search_fields = ['user__username', 'description', 'model_name']
     readonly_fields = ['created_at']
+
+@admin.register(StatusCounter)
+class StatusCounterAdmin(admin.ModelAdmin):
+    list_display = ['app_label', 'model_name', 'field', 'value', 'count', 'updated_at']
+    list_filter = ['app_label', 'model_name']
+    readonly_fields = ['updated_at']
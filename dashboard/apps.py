@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        from .audit import connect_audit_signals
+        from .signals import connect_counter_signals, connect_rollup_signals
+        connect_counter_signals()
+        connect_rollup_signals()
+        connect_audit_signals()
@@ -0,0 +1,218 @@
+"""
+Automatic ``ActivityLog`` capture.
+
+``AuditContextMiddleware`` makes the current request available to the
+``post_save`` / ``post_delete`` and login / logout signal handlers below,
+which describe each change made by an authenticated user as an
+``ActivityLog`` entry. Entries are handed to ``audit_writer`` once the
+change commits (rolled back changes are never logged).
+
+``AuditLogWriter`` never writes on the request thread: it puts entries on a
+bounded in-process queue and a background thread saves them with one
+``bulk_create`` per ``AUDIT_LOG_BATCH_SIZE`` entries or every
+``AUDIT_LOG_FLUSH_INTERVAL_MS``. When the queue is full new entries are
+dropped and counted rather than slowing requests down; ``stats()`` reports
+the queue depth and the written / dropped / failed counts. The queue is
+flushed when the worker process exits.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save, post_delete
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+AUDITED_APPS = {
+    'authentication', 'projects', 'clients', 'content', 'communication', 'careers', 'settings_app', 'dashboard',
+}
+# Logs, sessions and derived tables
+NOT_AUDITED = {
+    'dashboard.ActivityLog', 'dashboard.StatusCounter', 'dashboard.MetricRollup',
+    'authentication.UserSession', 'settings_app.SystemLog',
+}
+# Loaded fields that name an instance in the description
+NAME_FIELDS = ['name', 'title', 'username', 'subject', 'key']
+
+current_request = ContextVar('audit_request', default=None)
+
+
+class AuditContextMiddleware:
+    """Expose the request to the audit signal handlers while it is processed"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+
+class AuditLogWriter:
+    """Bounded queue of ActivityLog entries saved in batches by a background thread"""
+
+    def __init__(self, batch_size=None, interval=None, queue_size=None):
+        self.batch_size = batch_size or getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 100)
+        self.interval = interval or getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL_MS', 500) / 1000
+        self.queue = queue.Queue(queue_size or getattr(settings, 'AUDIT_LOG_QUEUE_SIZE', 10000))
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+        self.counts = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def enqueue(self, entry):
+        """Queue an unsaved ActivityLog without blocking; returns False when it was dropped"""
+        self.start()
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def start(self):
+        """Start the writer thread, again in a forked worker"""
+        if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.write(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    def write(self, batch):
+        close_old_connections()
+        try:
+            ActivityLog.objects.bulk_create(batch)
+        except Exception:
+            logger.exception('Could not write %d activity log entries', len(batch))
+            self._count('failed', len(batch))
+        else:
+            self._count('written', len(batch))
+            self._count('batches')
+
+    def flush(self, timeout=5.0):
+        """Write everything queued so far; from the calling thread if the writer is not running"""
+        if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+            deadline = time.monotonic() + timeout
+            while self.queue.unfinished_tasks and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            self.queue.task_done()
+        for start in range(0, len(batch), self.batch_size):
+            self.write(batch[start:start + self.batch_size])
+
+    def stats(self):
+        with self.lock:
+            return {**self.counts, 'queued': self.queue.qsize(), 'queue_size': self.queue.maxsize}
+
+
+audit_writer = AuditLogWriter()
+atexit.register(audit_writer.flush)
+
+
+def _client(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    ip_address = forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR')
+    return ip_address or None, request.META.get('HTTP_USER_AGENT', '')
+
+
+def record_activity(request, user, action, instance=None, description=''):
+    """Queue an ActivityLog entry once the current transaction commits"""
+    ip_address, user_agent = _client(request)
+    entry = ActivityLog(
+        user_id=user.pk, action=action, description=description, ip_address=ip_address,
+        user_agent=user_agent,
+        model_name=type(instance).__name__ if instance is not None else '',
+        object_id=instance.pk if instance is not None and isinstance(instance.pk, int) else None,
+    )
+    transaction.on_commit(lambda: audit_writer.enqueue(entry))
+
+
+def describe(action, instance):
+    name = next((instance.__dict__[field] for field in NAME_FIELDS if instance.__dict__.get(field)), None)
+    verb = {'create': 'Created', 'update': 'Updated', 'delete': 'Deleted'}[action]
+    description = f'{verb} {instance._meta.verbose_name}'
+    return f'{description}: {name}' if name else f'{description} #{instance.pk}'
+
+
+def _audited_user():
+    request = current_request.get()
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None, None
+    return request, user
+
+
+def audit_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    request, user = _audited_user()
+    # login() stamps last_login on the user; audit_login already records that
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    if request is not None and not raw:
+        action = 'create' if created else 'update'
+        record_activity(request, user, action, instance, describe(action, instance))
+
+
+def audit_delete(sender, instance, **kwargs):
+    request, user = _audited_user()
+    if request is not None:
+        record_activity(request, user, 'delete', instance, describe('delete', instance))
+
+
+def audit_login(sender, request, user, **kwargs):
+    record_activity(request, user, 'login', description=f'{user.username} logged in')
+
+
+def audit_logout(sender, request, user, **kwargs):
+    if user is not None:
+        record_activity(request, user, 'logout', description=f'{user.username} logged out')
+
+
+def connect_audit_signals():
+    # Per model, so unaudited tables keep Django's fast (signal-free) deletes
+    for model in apps.get_models():
+        if model._meta.app_label in AUDITED_APPS and model._meta.label not in NOT_AUDITED:
+            uid = f'activity-log-audit:{model._meta.label}'
+            post_save.connect(audit_save, sender=model, dispatch_uid=uid)
+            post_delete.connect(audit_delete, sender=model, dispatch_uid=uid)
+    user_logged_in.connect(audit_login, dispatch_uid='activity-log-audit')
+    user_logged_out.connect(audit_logout, dispatch_uid='activity-log-audit')
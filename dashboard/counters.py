@@ -0,0 +1,106 @@
+"""
+Denormalized per-value row counts for the stats endpoints.
+
+``StatusCounter`` rows hold the number of rows of a tracked model for each
+value of a tracked field. Signals in ``dashboard.signals`` keep them current
+on save/delete; bulk operations that bypass signals are corrected by the
+``reconcile_counters`` management command.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from .models import StatusCounter
+
+# Tracked model label -> fields whose values are counted
+TRACKED_FIELDS = {
+    'projects.Project': ['status'],
+    'clients.Client': ['is_active', 'client_type'],
+    'content.BlogPost': ['status'],
+    'content.PortfolioProject': ['status'],
+    'content.Service': ['status'],
+    'content.TeamMember': ['status'],
+    'communication.ContactSubmission': ['status'],
+    'communication.Newsletter': ['status'],
+    'communication.NewsletterSubscriber': ['is_active'],
+    'careers.JobPosting': ['status'],
+    'careers.JobApplication': ['status'],
+}
+
+
+def counter_value(value):
+    """Counters store every field value as a string"""
+    return '' if value is None else str(value)
+
+
+def adjust(label, field, value, delta):
+    """Add ``delta`` to the counter for ``label.field == value``"""
+    app_label, model_name = label.split('.')
+    lookup = {
+        'app_label': app_label,
+        'model_name': model_name,
+        'field': field,
+        'value': counter_value(value),
+    }
+    updated = StatusCounter.objects.filter(**lookup).update(
+        count=F('count') + delta, updated_at=timezone.now()
+    )
+    if not updated:
+        counter, created = StatusCounter.objects.get_or_create(defaults={'count': delta}, **lookup)
+        if not created:
+            StatusCounter.objects.filter(pk=counter.pk).update(count=F('count') + delta)
+
+
+def read_counters(*labels):
+    """
+    Load the counters for the given model labels in one query.
+
+    Returns ``{(label, field): {value: count}}``.
+    """
+    counters = {}
+    queryset = StatusCounter.objects.all()
+    if labels:
+        pairs = [label.split('.') for label in labels]
+        queryset = queryset.filter(app_label__in={a for a, _ in pairs}, model_name__in={m for _, m in pairs})
+    for counter in queryset.values_list('app_label', 'model_name', 'field', 'value', 'count'):
+        app_label, model_name, field, value, count = counter
+        counters.setdefault((f'{app_label}.{model_name}', field), {})[value] = count
+    return counters
+
+
+def live_counts(label):
+    """Count rows per tracked field value straight from the model table"""
+    model = apps.get_model(label)
+    counts = {}
+    for field in TRACKED_FIELDS[label]:
+        rows = model.objects.order_by().values(field).annotate(n=Count('pk'))
+        counts[(label, field)] = {counter_value(row[field]): row['n'] for row in rows}
+    return counts
+
+
+def diff_counters(label):
+    """Return ``(field, value, stored, live)`` for every counter out of sync"""
+    stored = read_counters(label)
+    live = live_counts(label)
+    drift = []
+    for field in TRACKED_FIELDS[label]:
+        stored_values = stored.get((label, field), {})
+        live_values = live[(label, field)]
+        for value in sorted(set(stored_values) | set(live_values)):
+            stored_count = stored_values.get(value, 0)
+            live_count = live_values.get(value, 0)
+            if stored_count != live_count:
+                drift.append((field, value, stored_count, live_count))
+    return drift
+
+
+@transaction.atomic
+def reconcile(label):
+    """Replace the stored counters for ``label`` with live counts"""
+    app_label, model_name = label.split('.')
+    StatusCounter.objects.filter(app_label=app_label, model_name=model_name).delete()
+    StatusCounter.objects.bulk_create([
+        StatusCounter(app_label=app_label, model_name=model_name, field=field, value=value, count=count)
+        for (_, field), values in live_counts(label).items()
+        for value, count in values.items()
+    ])
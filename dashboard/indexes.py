@@ -0,0 +1,158 @@
+"""
+Index proposals derived from the API list views.
+
+Every list view with a class-level ``queryset`` is read for the constant
+filters of that queryset (``status='published'``), its ``filterset_fields``
+and its ``ordering``. The default page wants an index on the ordering; each
+filter wants one on the filter field followed by the ordering. Constant
+filters become the condition of a partial index, so the index only holds the
+rows the public endpoint can return.
+"""
+from dataclasses import dataclass, field
+from django.db.models import Q
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.mixins import ListModelMixin
+
+
+@dataclass
+class IndexProposal:
+    model: type
+    fields: tuple
+    conditions: tuple = ()
+    # Leading fields compared with ``=``; the rest are the ordering
+    filters: int = 0
+    views: list = field(default_factory=list)
+
+    @property
+    def label(self):
+        return self.model._meta.label
+
+    @property
+    def name(self):
+        parts = [self.model._meta.model_name]
+        for name, value in self.conditions:
+            if isinstance(value, bool):
+                parts.append(name if value else f'not_{name}')
+            else:
+                parts.append(str(value).lower())
+        parts.append(self.fields[0].lstrip('-'))
+        return '_'.join(parts)[:26].rstrip('_') + '_idx'
+
+    def as_code(self):
+        code = f'models.Index(fields={list(self.fields)!r}'
+        if self.conditions:
+            condition = ', '.join(f'{name}={value!r}' for name, value in self.conditions)
+            code += f', condition=Q({condition}), name={self.name!r}'
+        return code + ')'
+
+
+def list_views(patterns=None):
+    """Every DRF list view class routed in the URLconf"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from list_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view = getattr(pattern.callback, 'cls', None)
+            if view is not None and issubclass(view, ListModelMixin):
+                yield view
+
+
+def constant_filters(queryset):
+    """``(field, value)`` pairs the queryset always filters on with ``=``"""
+    where = queryset.query.where
+    if where.connector != 'AND' or where.negated:
+        return ()
+    constants = []
+    for child in where.children:
+        if (isinstance(child, Exact) and isinstance(child.lhs, Col)
+                and child.lhs.alias == queryset.model._meta.db_table
+                and not hasattr(child.rhs, 'resolve_expression')):
+            constants.append((child.lhs.target.name, child.rhs))
+    return tuple(sorted(constants))
+
+
+def _is_plain_column(model, name):
+    try:
+        model_field = model._meta.get_field(name.lstrip('-'))
+    except Exception:
+        return False
+    return model_field.concrete and not model_field.is_relation and not model_field.unique
+
+
+def existing_indexes(model):
+    """``(fields, condition)`` of every index the model already has"""
+    opts = model._meta
+    indexes = [(tuple(index.fields), index.condition) for index in opts.indexes]
+    indexes += [(tuple(fields), None) for fields in opts.unique_together]
+    indexes += [(tuple(fields), None) for fields in getattr(opts, 'index_together', ())]
+    for model_field in opts.concrete_fields:
+        if model_field.db_index or model_field.unique:
+            indexes.append(((model_field.name,), None))
+    return indexes
+
+
+def _flipped(fields):
+    return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in fields)
+
+
+def _common_prefix(first, second):
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+def is_covered(proposal):
+    """
+    True when an existing index serves the proposal's filters and at least
+    its first ordering column, in either scan direction.
+    """
+    needed = min(len(proposal.fields), proposal.filters + 1)
+    condition = Q(*proposal.conditions) if proposal.conditions else None
+    constant_names = {name for name, _ in proposal.conditions}
+    for fields, index_condition in existing_indexes(proposal.model):
+        if index_condition is not None and index_condition != condition:
+            continue
+        names = [name.lstrip('-') for name in fields]
+        if index_condition is None and constant_names:
+            # A full index leading with the constant columns works too
+            if set(names[:len(constant_names)]) != constant_names:
+                continue
+            fields = fields[len(constant_names):]
+        filters, ordering = proposal.fields[:proposal.filters], proposal.fields[proposal.filters:]
+        for order in (ordering, _flipped(ordering)):
+            if _common_prefix(tuple(fields), filters + order) >= needed:
+                return True
+    return False
+
+
+def propose_indexes(views=None):
+    """Index proposals for the routed list views, one per distinct index"""
+    proposals = {}
+    for view in (list_views() if views is None else views):
+        queryset = getattr(view, 'queryset', None)
+        if queryset is None:
+            continue
+        model = queryset.model
+        constants = constant_filters(queryset)
+        constant_names = {name for name, _ in constants}
+        ordering = list(getattr(view, 'ordering', None) or model._meta.ordering)
+        if not ordering or not all(_is_plain_column(model, name) for name in ordering):
+            continue
+
+        ordered = {name.lstrip('-') for name in ordering}
+        candidates = [(tuple(ordering), 0)]
+        for name in getattr(view, 'filterset_fields', None) or []:
+            if name not in constant_names | ordered and _is_plain_column(model, name):
+                candidates.append(((name, *ordering), 1))
+        for fields, filters in candidates:
+            key = (model._meta.label, fields, constants)
+            proposal = proposals.setdefault(key, IndexProposal(model, fields, constants, filters))
+            proposal.views.append(view.__name__)
+    return sorted(proposals.values(), key=lambda proposal: (proposal.label, proposal.conditions, proposal.fields))
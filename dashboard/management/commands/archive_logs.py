@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from sheba_admin_backend.archive import ARCHIVED_MODELS, archive_dir, archive_rows, retention_days
+
+
+class Command(BaseCommand):
+    help = 'Move log rows older than their retention window into gzip JSON Lines archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels to archive, e.g. dashboard.ActivityLog (default: all log models)'
+        )
+        parser.add_argument('--days', type=int, help='Retention window in days (default: from settings)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per batch')
+
+    def handle(self, *args, **options):
+        unknown = [label for label in options['models'] if label not in ARCHIVED_MODELS]
+        if unknown:
+            raise CommandError(f"Not archived: {', '.join(unknown)}")
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        for label in options['models'] or ARCHIVED_MODELS:
+            days = retention_days(label) if options['days'] is None else options['days']
+            count = archive_rows(label, days, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Archived {count} {label} row(s) older than {days} days to {archive_dir(label)}'
+            ))
@@ -0,0 +1,255 @@
+import json
+import platform
+import re
+import statistics
+import time
+from contextlib import ExitStack
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test import Client as TestClient
+from django.test import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from authentication.models import User
+from clients.models import Client
+from projects.models import Project
+from sheba_admin_backend.dataset import DatasetGenerator, scaled_counts
+from sheba_admin_backend.profiling import RequestProfile
+
+# Path parameters that name a parent row rather than the view's own model
+PARAMETER_MODELS = {'project_id': Project, 'client_id': Client, 'user_id': User}
+SKIPPED_PREFIXES = ('admin/', 'media/', 'static/')
+# Slower-than-baseline percentages below this many milliseconds are noise
+MIN_REGRESSION_MS = 2
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of ``values``"""
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def url_patterns(patterns=None, prefix=''):
+    """``(route, pattern)`` for every URL of the root URLconf"""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + str(pattern.pattern)
+        if route.startswith(SKIPPED_PREFIXES) or route.startswith('^'):
+            continue
+        if isinstance(pattern, URLResolver):
+            yield from url_patterns(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern
+
+
+def view_class(pattern):
+    callback = pattern.callback
+    return getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+
+
+def view_queryset(view):
+    queryset = getattr(view, 'queryset', None)
+    if queryset is not None:
+        return queryset
+    serializer_class = getattr(view, 'serializer_class', None)
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    return model._default_manager.all() if model is not None else None
+
+
+class Command(BaseCommand):
+    help = ('Request every GET URL of the API in-process (full middleware stack) on a generated '
+            'dataset and report latency percentiles, SQL queries and response bytes per URL; '
+            'everything is rolled back afterwards')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=10,
+                            help='Size of the generated dataset, as for generate_dataset (10: 10k clients, '
+                                 '100k tasks, 1M activity logs)')
+        parser.add_argument('--clients', type=int, help='Generated clients, instead of the scaled number')
+        parser.add_argument('--tasks', type=int, help='Generated project tasks, instead of the scaled number')
+        parser.add_argument('--activity-logs', type=int,
+                            help='Generated activity log entries, instead of the scaled number')
+        parser.add_argument('--seed', type=int, default=1, help='Seed of the dataset generator')
+        parser.add_argument('--existing', action='store_true',
+                            help='Benchmark the rows already in the database instead of generating any')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per URL')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per URL first')
+        parser.add_argument('--match', help='Only benchmark routes matching this regular expression')
+        parser.add_argument('--with-cache', action='store_true',
+                            help='Use the configured cache; repeated public requests are then served from it')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='JSON file of an earlier run; fail on regressions against it')
+        parser.add_argument('--threshold', type=float, default=20,
+                            help='Percent increase of p95 latency counted as a regression')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+        baseline = self.load(options['compare']) if options['compare'] else None
+        self.options = options
+        overrides = {'ALLOWED_HOSTS': ['*'], 'DEBUG': False}
+        if not options['with_cache']:
+            # An empty private cache; public responses are not stored, so every request builds them
+            overrides['CACHES'] = {'default': {
+                'BACKEND': 'sheba_admin_backend.cache_backends.LocMemCache', 'LOCATION': 'benchmark-api',
+            }}
+            overrides['PUBLIC_API_CACHE_TIMEOUT'] = 0
+        try:
+            with transaction.atomic(), override_settings(**overrides):
+                dataset = {} if options['existing'] else self.generate()
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+                report = self.run(dataset)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        if baseline is not None:
+            regressions = self.compare(baseline, report)
+            if regressions:
+                raise CommandError(f'{regressions} route(s) regressed against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["compare"]}'))
+
+    def load(self, path):
+        try:
+            with open(path) as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+
+    def generate(self):
+        options = self.options
+        self.stdout.write('Generating the dataset...')
+        generator = DatasetGenerator(seed=options['seed'], log=lambda message: self.stdout.write(f'  {message}'))
+        counts = scaled_counts(options['scale'])
+        for kind in ('clients', 'tasks', 'activity_logs'):
+            if options[kind] is not None:
+                counts[kind] = options[kind]
+        return generator.generate(**counts)
+
+    def run(self, dataset):
+        user = User.objects.create_user(username='benchmark-admin', password='x', role='admin',
+                                        is_staff=True, is_superuser=True)
+        token = Token.objects.create(user=user)
+        client = TestClient(HTTP_AUTHORIZATION=f'Token {token.key}')
+        match = re.compile(self.options['match']) if self.options['match'] else None
+
+        results, skipped = {}, {}
+        for route, pattern in url_patterns():
+            if match and not match.search(route):
+                continue
+            view = view_class(pattern)
+            if view is not None and not hasattr(view, 'get'):
+                continue
+            try:
+                path = self.build_path(route, pattern, view)
+            except LookupError as exc:
+                skipped[route] = str(exc)
+                continue
+            self.stdout.write(f'  GET {path}')
+            results[route] = self.measure(client, path)
+        return {
+            'started_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'requests_per_url': self.options['requests'],
+            'cache': self.options['with_cache'],
+            'dataset': dataset,
+            'results': results,
+            'skipped': skipped,
+        }
+
+    def build_path(self, route, pattern, view):
+        """The route with its parameters replaced by values of existing rows"""
+        kwargs = {}
+        for name in pattern.pattern.converters:
+            if name in PARAMETER_MODELS:
+                queryset = PARAMETER_MODELS[name]._default_manager.all()
+                field = 'pk'
+            else:
+                queryset = view_queryset(view)
+                field = 'pk' if name in ('pk', 'id') else name
+            if queryset is None:
+                raise LookupError(f'No model for the "{name}" parameter')
+            # The newest row: generated rows come after any existing ones
+            value = queryset.order_by('-pk').values_list(field, flat=True).first()
+            if value is None:
+                raise LookupError(f'No {queryset.model._meta.verbose_name} rows')
+            kwargs[name] = value
+        path = '/' + route
+        for name, value in kwargs.items():
+            path = re.sub(rf'<(?:\w+:)?{name}>', str(value), path)
+        return path
+
+    def measure(self, client, path):
+        timings, queries, sql_ms = [], [], []
+        warmup = self.options['warmup']
+        for index in range(warmup + self.options['requests']):
+            profile = RequestProfile()
+            with ExitStack() as stack:
+                for db in connections.all():
+                    stack.enter_context(db.execute_wrapper(profile))
+                start = time.perf_counter()
+                response = client.get(path)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                duration = (time.perf_counter() - start) * 1000
+            if index >= warmup:
+                timings.append(duration)
+                queries.append(profile.queries)
+                sql_ms.append(profile.sql_time * 1000)
+        return {
+            'path': path,
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 0.5), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'p99_ms': round(percentile(timings, 0.99), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'queries': max(queries),
+            'sql_ms': round(statistics.fmean(sql_ms), 2),
+            'bytes': len(body),
+        }
+
+    def print_report(self, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'route':<48}{'status':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'bytes':>10}"
+        ))
+        for route, result in report['results'].items():
+            self.stdout.write(
+                f"{route:<48}{result['status']:>7}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{result['p99_ms']:>9.1f}{result['queries']:>9}{result['bytes']:>10}"
+            )
+        for route, reason in report['skipped'].items():
+            self.stdout.write(self.style.WARNING(f'{route:<48} skipped: {reason}'))
+
+    def compare(self, baseline, report):
+        """Print the routes whose p95 latency or query count grew; returns how many did"""
+        regressions = 0
+        threshold = self.options['threshold']
+        for route, result in report['results'].items():
+            before = baseline.get('results', {}).get(route)
+            if before is None:
+                continue
+            problems = []
+            slower = result['p95_ms'] - before['p95_ms']
+            if slower > MIN_REGRESSION_MS and slower > before['p95_ms'] * threshold / 100:
+                problems.append(f"p95 {before['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+            if result['queries'] > before['queries']:
+                problems.append(f"queries {before['queries']} -> {result['queries']}")
+            if result['status'] != before['status']:
+                problems.append(f"status {before['status']} -> {result['status']}")
+            if problems:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"{route}: {', '.join(problems)}"))
+        return regressions
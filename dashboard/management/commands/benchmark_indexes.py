@@ -0,0 +1,135 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User
+from clients.models import Client
+from clients.views import PublicClientListView
+from communication.models import ContactSubmission
+from communication.views import ContactSubmissionListCreateView
+from content.models import BlogPost
+from content.views import BlogPostListCreateView, PublicBlogPostListView
+from projects.models import Project
+from projects.views import PublicProjectListView, ProjectSummaryListView
+
+BATCH_SIZE = 2000
+
+# (description, view, query parameters)
+CASES = [
+    ('public blog list', PublicBlogPostListView, {}),
+    ('public blog list ?category=design', PublicBlogPostListView, {'category': 'design'}),
+    ('blog list ?status=published', BlogPostListCreateView, {'status': 'published'}),
+    ('contacts ?status=new', ContactSubmissionListCreateView, {'status': 'new'}),
+    ('public project list', PublicProjectListView, {}),
+    ('project summary ?status=in_progress', ProjectSummaryListView, {'status': 'in_progress'}),
+    ('public client list', PublicClientListView, {}),
+]
+
+MODELS = [BlogPost, ContactSubmission, Project, Client]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Time list endpoints with and without the composite/partial list indexes '
+            'on generated rows (everything is rolled back afterwards)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Rows per benchmarked model')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per case')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        try:
+            with transaction.atomic():
+                self.generate(options['rows'])
+                # Public responses would otherwise come from the cache
+                with override_settings(ALLOWED_HOSTS=['*'], CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+                }}):
+                    self.run_cases()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def generate(self, rows):
+        self.stdout.write(f'Generating {rows:,} rows per model...')
+        now = timezone.now()
+        self.user = User.objects.create_user(username='benchmark-user', password='x', is_staff=True)
+        categories = [value for value, _ in BlogPost.CATEGORY_CHOICES]
+        BlogPost.objects.bulk_create((
+            BlogPost(title=f'Post {i}', slug=f'benchmark-post-{i}', content='x', author=self.user,
+                     category=random.choice(categories),
+                     status=random.choice(['draft', 'published', 'archived']),
+                     published_at=now - timedelta(minutes=random.randint(0, rows)))
+            for i in range(rows)
+        ), batch_size=BATCH_SIZE)
+        statuses = [value for value, _ in ContactSubmission.STATUS_CHOICES]
+        ContactSubmission.objects.bulk_create((
+            ContactSubmission(name=f'Visitor {i}', email=f'visitor{i}@example.com', subject='x',
+                              message='x', status=random.choice(statuses))
+            for i in range(rows)
+        ), batch_size=BATCH_SIZE)
+        Client.objects.bulk_create((
+            Client(name=f'Client {i}', email=f'client{i}@example.com', phone='0',
+                   is_active=random.random() < 0.2)
+            for i in range(rows)
+        ), batch_size=BATCH_SIZE)
+        client_ids = list(Client.objects.values_list('pk', flat=True)[:1000])
+        statuses = [value for value, _ in Project.STATUS_CHOICES]
+        Project.objects.bulk_create((
+            Project(name=f'Project {i}', description='x', client_id=random.choice(client_ids),
+                    status=random.choice(statuses), start_date=date.today(),
+                    end_date=date.today() - timedelta(days=random.randint(0, 3650)))
+            for i in range(rows)
+        ), batch_size=BATCH_SIZE)
+        self.analyze()
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def run_cases(self):
+        after = self.time_cases()
+        # Plain DROP INDEX statements: the SQLite schema editor refuses to run
+        # inside a transaction
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(str(index.remove_sql(model, editor)))
+        self.analyze()
+        before = self.time_cases()
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'case':<40}{'no indexes':>12}{'indexes':>12}{'speedup':>10}"
+        ))
+        for description, _, _ in CASES:
+            self.stdout.write(
+                f'{description:<40}{before[description]:>10.1f}ms{after[description]:>10.1f}ms'
+                f'{before[description] / after[description]:>9.1f}x'
+            )
+
+    def time_cases(self):
+        factory = APIRequestFactory()
+        results = {}
+        for description, view_class, params in CASES:
+            view = view_class.as_view()
+            timings = []
+            for _ in range(self.repeat + 1):
+                request = factory.get('/', params)
+                force_authenticate(request, user=self.user)
+                start = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - start) * 1000)
+            # The first request warms up the connection and page cache
+            results[description] = statistics.median(timings[1:])
+        return results
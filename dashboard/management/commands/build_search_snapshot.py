@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sheba_admin_backend.public_search import PUBLIC_INDEXES
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the public search index from the database and write its snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels to rebuild, e.g. content.BlogPost (default: all public documents)'
+        )
+
+    def handle(self, *args, **options):
+        unknown = [label for label in options['models'] if label not in PUBLIC_INDEXES]
+        if unknown:
+            raise CommandError(f"No public search index: {', '.join(unknown)}")
+        if not getattr(settings, 'PUBLIC_SEARCH_SNAPSHOT_DIR', None):
+            raise CommandError('PUBLIC_SEARCH_SNAPSHOT_DIR is not set')
+        for label in options['models'] or PUBLIC_INDEXES:
+            count = PUBLIC_INDEXES[label].rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {label} document(s)'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from sheba_admin_backend.view_counts import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Write buffered public view counts to the database (run every minute or so)'
+
+    def handle(self, *args, **options):
+        updated = flush_view_counts()
+        self.stdout.write(self.style.SUCCESS(f'Flushed view counts for {updated} row(s)'))
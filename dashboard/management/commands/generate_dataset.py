@@ -0,0 +1,61 @@
+import random
+import time
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from sheba_admin_backend.dataset import SCALE, DatasetGenerator, scaled_counts
+
+User = get_user_model()
+
+# Run first for the hand-written rows (settings, services, team, templates, ...), in dependency order
+SAMPLE_COMMANDS = [
+    'populate_clients', 'populate_projects', 'populate_content', 'populate_communication',
+    'populate_dashboard', 'populate_settings',
+]
+
+
+class Command(BaseCommand):
+    help = ('Generate a realistic, referentially consistent dataset: the populate_* sample rows, '
+            'then --scale times {} in one transaction'.format(
+                ', '.join(f"{count:,} {kind.replace('_', ' ')}" for kind, count in SCALE.items())))
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help='Multiplier of the generated row counts')
+        parser.add_argument('--seed', type=int, help='Seed of the random generator (printed when not given)')
+        parser.add_argument('--days', type=int, default=365, help='Spread creation dates over this many days')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT batch')
+        parser.add_argument('--no-samples', action='store_true', help='Skip the populate_* sample rows')
+        parser.add_argument('--admin-password', default='admin123',
+                            help='Password of the "admin" user, created when it does not exist')
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('--scale must be positive')
+        seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        counts = scaled_counts(options['scale'])
+        generator = DatasetGenerator(
+            seed=seed, batch_size=options['batch_size'], days=options['days'],
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+        start = time.perf_counter()
+        with transaction.atomic():
+            if not options['no_samples']:
+                self.populate_samples(options)
+            self.stdout.write(f'Generating scale {options["scale"]:g} with seed {seed}...')
+            created = generator.generate(**counts)
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {sum(created.values()):,} rows in {time.perf_counter() - start:.0f}s '
+            f'(reproduce with --scale {options["scale"]:g} --seed {seed})'
+        ))
+
+    def populate_samples(self, options):
+        """The populate_* commands need an "admin" user"""
+        if not User.objects.filter(username='admin').exists():
+            User.objects.create_superuser('admin', 'admin@example.com', options['admin_password'], role='admin')
+            self.stdout.write('Created the "admin" user')
+        self.stdout.write('Creating the sample rows...')
+        output = self.stdout if options['verbosity'] > 1 else StringIO()
+        for name in SAMPLE_COMMANDS:
+            call_command(name, stdout=output)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from dashboard.indexes import is_covered, propose_indexes
+
+
+class Command(BaseCommand):
+    help = 'Propose composite and partial indexes from the list views\' filter and ordering fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels to report, e.g. content.BlogPost (default: every model with a list view)'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Also list proposals an existing index already covers'
+        )
+
+    def handle(self, *args, **options):
+        current = None
+        missing = 0
+        for proposal in propose_indexes():
+            if options['models'] and proposal.label not in options['models']:
+                continue
+            covered = is_covered(proposal)
+            if covered and not options['all']:
+                continue
+            if proposal.label != current:
+                current = proposal.label
+                self.stdout.write(self.style.MIGRATE_HEADING(current))
+            views = ', '.join(proposal.views)
+            if covered:
+                self.stdout.write(f'  = {proposal.as_code()}  # covered; {views}')
+            else:
+                missing += 1
+                self.stdout.write(f'  + {proposal.as_code()}  # {views}')
+        self.stdout.write(self.style.SUCCESS(f'{missing} index(es) proposed'))
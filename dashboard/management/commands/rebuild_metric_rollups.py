@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from dashboard.models import DashboardMetric
+from dashboard.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the weekly/monthly/yearly DashboardMetric rollups from the daily rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('metric_types', nargs='*', help='Metric types to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        known = {value for value, _ in DashboardMetric.METRIC_TYPES}
+        unknown = [metric_type for metric_type in options['metric_types'] if metric_type not in known]
+        if unknown:
+            raise CommandError(f"Unknown metric type(s): {', '.join(unknown)}")
+        count = rebuild_rollups(options['metric_types'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} rollup(s)'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from sheba_admin_backend.search import SEARCH_DOCUMENTS, rebuild_search_indexes
+
+
+class Command(BaseCommand):
+    help = 'Recreate the full-text search indexes (e.g. after a migration rebuilt a SQLite table)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels to rebuild, e.g. content.BlogPost (default: all searchable models)'
+        )
+
+    def handle(self, *args, **options):
+        unknown = [label for label in options['models'] if label not in SEARCH_DOCUMENTS]
+        if unknown:
+            raise CommandError(f"Not searchable: {', '.join(unknown)}")
+        with connection.schema_editor() as schema_editor:
+            labels = rebuild_search_indexes(schema_editor, options['models'])
+        if not labels:
+            raise CommandError(f'No full-text search backend for {connection.vendor}')
+        for label in labels:
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {label}'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from dashboard.counters import TRACKED_FIELDS, diff_counters, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Rebuild StatusCounter rows from live COUNTs (run periodically to absorb bulk operations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help='Model labels to reconcile, e.g. projects.Project (default: all tracked models)'
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only report counters that differ from live COUNTs, without writing'
+        )
+
+    def handle(self, *args, **options):
+        labels = options['models'] or list(TRACKED_FIELDS)
+        unknown = [label for label in labels if label not in TRACKED_FIELDS]
+        if unknown:
+            raise CommandError(f"Untracked model(s): {', '.join(unknown)}")
+
+        drifted = 0
+        for label in labels:
+            drift = diff_counters(label)
+            drifted += len(drift)
+            for field, value, stored, live in drift:
+                self.stdout.write(
+                    self.style.WARNING(f'{label}.{field}={value!r}: counter {stored}, live {live}')
+                )
+            if not options['verify'] and drift:
+                reconcile(label)
+                self.stdout.write(self.style.SUCCESS(f'Reconciled {label}'))
+
+        if options['verify']:
+            if drifted:
+                raise CommandError(f'{drifted} counter(s) out of sync')
+            self.stdout.write(self.style.SUCCESS('All counters match live counts'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Corrected {drifted} counter(s)'))
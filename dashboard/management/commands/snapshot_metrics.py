@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from dashboard.snapshots import backfill_metrics, snapshot_metrics
+
+
+class Command(BaseCommand):
+    help = "Store today's dashboard metrics from the live tables (run daily or hourly from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', type=int, metavar='DAYS',
+            help='Also reconstruct the history metrics of the previous DAYS days'
+        )
+        parser.add_argument(
+            '--since', type=date.fromisoformat, metavar='YYYY-MM-DD',
+            help='Reconstruct the history metrics from this date'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        since = options['since']
+        if options['backfill']:
+            since = today - timedelta(days=options['backfill'])
+        if since is not None:
+            if since >= today:
+                raise CommandError('The backfill must start before today')
+            count = backfill_metrics(since)
+            self.stdout.write(self.style.SUCCESS(f'Backfilled {count} metric(s) from {since}'))
+        count = snapshot_metrics(today)
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} metric(s) for {today}'))
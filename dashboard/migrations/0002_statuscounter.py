@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+TRACKED_FIELDS = {
+    'projects.Project': ['status'],
+    'clients.Client': ['is_active', 'client_type'],
+    'content.BlogPost': ['status'],
+    'content.PortfolioProject': ['status'],
+    'content.Service': ['status'],
+    'content.TeamMember': ['status'],
+    'communication.ContactSubmission': ['status'],
+    'communication.Newsletter': ['status'],
+    'communication.NewsletterSubscriber': ['is_active'],
+    'careers.JobPosting': ['status'],
+    'careers.JobApplication': ['status'],
+}
+
+
+def seed_counters(apps, schema_editor):
+    StatusCounter = apps.get_model('dashboard', 'StatusCounter')
+    counters = []
+    for label, fields in TRACKED_FIELDS.items():
+        app_label, model_name = label.split('.')
+        model = apps.get_model(app_label, model_name)
+        for field in fields:
+            for row in model.objects.order_by().values(field).annotate(n=Count('pk')):
+                counters.append(StatusCounter(
+                    app_label=app_label, model_name=model_name, field=field,
+                    value='' if row[field] is None else str(row[field]), count=row['n'],
+                ))
+    StatusCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('projects', '0001_initial'),
+        ('clients', '0001_initial'),
+        ('content', '0001_initial'),
+        ('communication', '0001_initial'),
+        ('careers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('app_label', models.CharField(max_length=50)),
+                ('model_name', models.CharField(max_length=50)),
+                ('field', models.CharField(max_length=50)),
+                ('value', models.CharField(blank=True, max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['app_label', 'model_name', 'field', 'value'],
+                'unique_together': {('app_label', 'model_name', 'field', 'value')},
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_activitylog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['action', '-created_at'], name='dashboard_a_action_1bfc12_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['model_name', '-created_at'], name='dashboard_a_model_n_251061_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:39
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncMonth, TruncWeek, TruncYear
+
+TRUNCATE = {'week': TruncWeek, 'month': TruncMonth, 'year': TruncYear}
+
+
+def seed_rollups(apps, schema_editor):
+    DashboardMetric = apps.get_model('dashboard', 'DashboardMetric')
+    MetricRollup = apps.get_model('dashboard', 'MetricRollup')
+    rollups = []
+    for period, truncate in TRUNCATE.items():
+        rows = DashboardMetric.objects.order_by().annotate(start=truncate('date')).values(
+            'metric_type', 'start'
+        ).annotate(count=Count('pk'), total=Sum('value'), minimum=Min('value'), maximum=Max('value'))
+        for row in rows:
+            rollups.append(MetricRollup(
+                metric_type=row['metric_type'], period=period, period_start=row['start'],
+                count=row['count'], total=row['total'],
+                average=(row['total'] / row['count']).quantize(Decimal('0.01')),
+                minimum=row['minimum'], maximum=row['maximum'],
+            ))
+    MetricRollup.objects.bulk_create(rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_activitylog_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric_type', models.CharField(choices=[('projects_total', 'Total Projects'), ('projects_active', 'Active Projects'), ('clients_total', 'Total Clients'), ('revenue_monthly', 'Monthly Revenue'), ('revenue_yearly', 'Yearly Revenue'), ('tasks_completed', 'Completed Tasks'), ('blog_views', 'Blog Views'), ('website_visitors', 'Website Visitors')], max_length=30)),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month'), ('year', 'Year')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('count', models.PositiveIntegerField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('average', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('minimum', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('maximum', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['metric_type', 'period', 'period_start'],
+                'unique_together': {('metric_type', 'period', 'period_start')},
+            },
+        ),
+        migrations.RunPython(seed_rollups, migrations.RunPython.noop),
+    ]
@@ -28,6 +28,31 @@ class DashboardMetric(models.Model):
     def __str__(self):
         return f"{self.get_metric_type_display()}: {self.value} ({self.date})"
 
+class MetricRollup(models.Model):
+    """Weekly, monthly and yearly aggregates of the daily DashboardMetric values"""
+    PERIODS = [
+        ('week', 'Week'),
+        ('month', 'Month'),
+        ('year', 'Year'),
+    ]
+    
+    metric_type = models.CharField(max_length=30, choices=DashboardMetric.METRIC_TYPES)
+    period = models.CharField(max_length=10, choices=PERIODS)
+    period_start = models.DateField()
+    count = models.PositiveIntegerField()
+    total = models.DecimalField(max_digits=20, decimal_places=2)
+    average = models.DecimalField(max_digits=15, decimal_places=2)
+    minimum = models.DecimalField(max_digits=15, decimal_places=2)
+    maximum = models.DecimalField(max_digits=15, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['metric_type', 'period', 'period_start']
+        ordering = ['metric_type', 'period', 'period_start']
+    
+    def __str__(self):
+        return f"{self.get_metric_type_display()} {self.period} of {self.period_start}: {self.total}"
+
 class ActivityLog(models.Model):
     """Track user activities in admin dashboard"""
     ACTION_TYPES = [
@@ -50,6 +75,28 @@ class ActivityLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination (see sheba_admin_backend.pagination)
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['action', '-created_at']),
+            models.Index(fields=['model_name', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.action} - {self.description}"
+
+class StatusCounter(models.Model):
+    """Denormalized row counts per model field value, kept current by signals"""
+    app_label = models.CharField(max_length=50)
+    model_name = models.CharField(max_length=50)
+    field = models.CharField(max_length=50)
+    value = models.CharField(max_length=50, blank=True)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['app_label', 'model_name', 'field', 'value']
+        ordering = ['app_label', 'model_name', 'field', 'value']
+    
+    def __str__(self):
+        return f"{self.app_label}.{self.model_name}.{self.field}={self.value}: {self.count}"
@@ -0,0 +1,133 @@
+"""
+Weekly, monthly and yearly rollups of the daily ``DashboardMetric`` values.
+
+``MetricRollup`` rows hold the count, sum, average, minimum and maximum of
+the daily values in each bucket, so a chart over years reads a few hundred
+rows through the ``(metric_type, period, period_start)`` unique index.
+Saving or deleting a daily metric recomputes the three buckets containing
+its date (see ``dashboard.signals``): one aggregate query over at most a
+year of daily rows plus one upsert. Bulk writes that bypass signals are
+followed by ``refresh_rollups`` or the ``rebuild_metric_rollups`` command.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek, TruncYear
+from .models import DashboardMetric, MetricRollup
+
+PERIODS = [period for period, _ in MetricRollup.PERIODS]
+TRUNCATE = {'week': TruncWeek, 'month': TruncMonth, 'year': TruncYear}
+# Series value -> rollup column
+VALUE_COLUMNS = {'sum': 'total', 'avg': 'average', 'min': 'minimum', 'max': 'maximum'}
+CENT = Decimal('0.01')
+
+
+def period_start(day, period):
+    """First day of the week (Monday), month or year containing ``day``"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def period_end(start, period):
+    """First day of the next bucket"""
+    if period == 'week':
+        return start + timedelta(days=7)
+    if period == 'month':
+        return (start + timedelta(days=32)).replace(day=1)
+    return start.replace(year=start.year + 1)
+
+
+def _rollup(metric_type, period, start, count, total, minimum, maximum):
+    return MetricRollup(
+        metric_type=metric_type, period=period, period_start=start, count=count, total=total,
+        average=(total / count).quantize(CENT), minimum=minimum, maximum=maximum,
+    )
+
+
+def save_rollups(rollups):
+    """Insert or overwrite rollups in one query"""
+    MetricRollup.objects.bulk_create(
+        rollups, update_conflicts=True,
+        unique_fields=['metric_type', 'period', 'period_start'],
+        update_fields=['count', 'total', 'average', 'minimum', 'maximum', 'updated_at'],
+    )
+
+
+def refresh_rollups(metric_type, day):
+    """Recompute the week, month and year of ``metric_type`` containing ``day``"""
+    day = DashboardMetric._meta.get_field('date').to_python(day)
+    buckets = {period: period_start(day, period) for period in PERIODS}
+    aggregates = {}
+    for period, start in buckets.items():
+        window = Q(date__gte=start, date__lt=period_end(start, period))
+        aggregates[f'{period}_count'] = Count('pk', filter=window)
+        aggregates[f'{period}_total'] = Sum('value', filter=window)
+        aggregates[f'{period}_minimum'] = Min('value', filter=window)
+        aggregates[f'{period}_maximum'] = Max('value', filter=window)
+    # A week can start in the previous year
+    first = min(buckets.values())
+    last = max(period_end(start, period) for period, start in buckets.items())
+    row = DashboardMetric.objects.filter(
+        metric_type=metric_type, date__gte=first, date__lt=last
+    ).aggregate(**aggregates)
+
+    rollups, emptied = [], Q()
+    for period, start in buckets.items():
+        if row[f'{period}_count']:
+            rollups.append(_rollup(metric_type, period, start, *(
+                row[f'{period}_{name}'] for name in ('count', 'total', 'minimum', 'maximum')
+            )))
+        else:
+            emptied |= Q(period=period, period_start=start)
+    with transaction.atomic():
+        if rollups:
+            save_rollups(rollups)
+        if emptied:
+            MetricRollup.objects.filter(emptied, metric_type=metric_type).delete()
+
+
+@transaction.atomic
+def rebuild_rollups(metric_types=None):
+    """Replace the rollups of ``metric_types`` (default: all) with one grouped query per period"""
+    metrics = DashboardMetric.objects.order_by()
+    rollups = MetricRollup.objects.all()
+    if metric_types:
+        metrics = metrics.filter(metric_type__in=metric_types)
+        rollups = rollups.filter(metric_type__in=metric_types)
+    rollups.delete()
+    created = []
+    for period in PERIODS:
+        rows = metrics.annotate(start=TRUNCATE[period]('date')).values('metric_type', 'start').annotate(
+            count=Count('pk'), total=Sum('value'), minimum=Min('value'), maximum=Max('value')
+        )
+        created += [
+            _rollup(row['metric_type'], period, row['start'], row['count'], row['total'],
+                    row['minimum'], row['maximum'])
+            for row in rows
+        ]
+    MetricRollup.objects.bulk_create(created, batch_size=1000)
+    return len(created)
+
+
+def metric_series(metric_type, bucket, date_from, value='avg'):
+    """
+    Chart series from ``date_from`` as parallel ``dates`` / ``values`` lists,
+    from the daily rows for ``bucket='day'`` and from the rollups otherwise.
+    """
+    if bucket == 'day':
+        rows = DashboardMetric.objects.filter(
+            metric_type=metric_type, date__gte=date_from
+        ).order_by('date').values_list('date', 'value')
+    else:
+        rows = MetricRollup.objects.filter(
+            metric_type=metric_type, period=bucket, period_start__gte=period_start(date_from, bucket)
+        ).order_by('period_start').values_list('period_start', VALUE_COLUMNS[value])
+    dates, values = [], []
+    for day, amount in rows:
+        dates.append(day.isoformat())
+        values.append(float(amount))
+    return {'metric_type': metric_type, 'bucket': bucket, 'value': value, 'dates': dates, 'values': values}
@@ -1,8 +1,11 @@
+from datetime import timedelta
+from django.utils import timezone
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import DashboardMetric, ActivityLog
 from authentication.serializers import UserProfileSerializer
 
-class DashboardMetricSerializer(serializers.ModelSerializer):
+class DashboardMetricSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for DashboardMetric model"""
     metric_type_display = serializers.CharField(source='get_metric_type_display', read_only=True)
     
@@ -11,7 +14,7 @@ class DashboardMetricSerializer(serializers.ModelSerializer):
         fields = ['id', 'metric_type', 'metric_type_display', 'value', 'date', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class ActivityLogSerializer(serializers.ModelSerializer):
+class ActivityLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for ActivityLog model"""
     user = UserProfileSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True)
@@ -22,3 +25,35 @@ class ActivityLogSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'user_id', 'action', 'action_display', 'model_name',
                  'object_id', 'description', 'ip_address', 'user_agent', 'created_at']
         read_only_fields = ['id', 'created_at']
+
+class StatsWindowSerializer(serializers.Serializer):
+    """Optional date window for stats endpoints: ``days`` back from today or ``date_from`` / ``date_to``"""
+    # Far enough back for any stored data; larger values overflow the date arithmetic
+    MAX_DAYS = 366 * 10
+
+    days = serializers.IntegerField(required=False, min_value=1, max_value=MAX_DAYS)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        days = attrs.pop('days', None)
+        if days and 'date_from' not in attrs:
+            attrs['date_from'] = timezone.localdate() - timedelta(days=days)
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from must be on or before date_to')
+        return attrs
+
+class MetricsChartSerializer(serializers.Serializer):
+    """Query parameters of the metrics chart; ``days`` defaults to a window that suits the bucket"""
+    DEFAULT_DAYS = {None: 30, 'day': 30, 'week': 7 * 26, 'month': 365, 'year': 365 * 5}
+    MAX_DAYS = StatsWindowSerializer.MAX_DAYS
+
+    type = serializers.ChoiceField(choices=DashboardMetric.METRIC_TYPES, default='projects_total')
+    bucket = serializers.ChoiceField(choices=['day', 'week', 'month', 'year'], required=False)
+    value = serializers.ChoiceField(choices=['sum', 'avg', 'min', 'max'], default='avg')
+    days = serializers.IntegerField(required=False, min_value=1, max_value=MAX_DAYS)
+
+    def validate(self, attrs):
+        days = attrs.pop('days', None) or self.DEFAULT_DAYS[attrs.get('bucket')]
+        attrs['date_from'] = timezone.localdate() - timedelta(days=days)
+        return attrs
@@ -0,0 +1,86 @@
+from django.apps import apps
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from .counters import TRACKED_FIELDS, adjust
+from .rollups import refresh_rollups
+
+
+def _tracked_values(sender, instance):
+    # Read from __dict__ so deferred fields are never loaded just for counting
+    return {
+        field: instance.__dict__[sender._meta.get_field(field).attname]
+        for field in TRACKED_FIELDS[sender._meta.label]
+        if sender._meta.get_field(field).attname in instance.__dict__
+    }
+
+
+def remember_counter_values(sender, instance, **kwargs):
+    """Snapshot tracked values when an instance is loaded or constructed"""
+    instance._counter_values = _tracked_values(sender, instance)
+
+
+def load_missing_counter_values(sender, instance, **kwargs):
+    """Fetch the stored values of tracked fields that were deferred on load (before save or delete)"""
+    if instance._state.adding or instance.pk is None:
+        return
+    fields = TRACKED_FIELDS[sender._meta.label]
+    previous = getattr(instance, '_counter_values', {})
+    missing = [field for field in fields if field not in previous]
+    if missing:
+        stored = sender._default_manager.filter(pk=instance.pk).values(*missing).first() or {}
+        instance._counter_values = {**previous, **stored}
+
+
+def update_counters_on_save(sender, instance, created, **kwargs):
+    """Count new rows and move updated rows between field values"""
+    label = sender._meta.label
+    current = _tracked_values(sender, instance)
+    previous = getattr(instance, '_counter_values', {})
+    for field in TRACKED_FIELDS[label]:
+        if created:
+            adjust(label, field, current.get(field), 1)
+        elif field in previous and previous[field] != current.get(field):
+            adjust(label, field, previous[field], -1)
+            adjust(label, field, current.get(field), 1)
+    instance._counter_values = current
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    label = sender._meta.label
+    current = {**getattr(instance, '_counter_values', {}), **_tracked_values(sender, instance)}
+    for field in TRACKED_FIELDS[label]:
+        adjust(label, field, current.get(field), -1)
+
+
+def connect_counter_signals():
+    for label in TRACKED_FIELDS:
+        model = apps.get_model(label)
+        post_init.connect(remember_counter_values, sender=model)
+        pre_save.connect(load_missing_counter_values, sender=model)
+        post_save.connect(update_counters_on_save, sender=model)
+        pre_delete.connect(load_missing_counter_values, sender=model)
+        post_delete.connect(update_counters_on_delete, sender=model)
+
+
+def remember_metric_bucket(sender, instance, **kwargs):
+    instance._rollup_key = (instance.__dict__.get('metric_type'), instance.__dict__.get('date'))
+
+
+def refresh_rollups_on_save(sender, instance, **kwargs):
+    """Recompute the buckets of the new date, and of the old one if it moved"""
+    previous = getattr(instance, '_rollup_key', (None, None))
+    current = (instance.metric_type, instance.date)
+    refresh_rollups(*current)
+    if None not in previous and previous != current:
+        refresh_rollups(*previous)
+    instance._rollup_key = current
+
+
+def refresh_rollups_on_delete(sender, instance, **kwargs):
+    refresh_rollups(instance.metric_type, instance.date)
+
+
+def connect_rollup_signals():
+    model = apps.get_model('dashboard.DashboardMetric')
+    post_init.connect(remember_metric_bucket, sender=model)
+    post_save.connect(refresh_rollups_on_save, sender=model)
+    post_delete.connect(refresh_rollups_on_delete, sender=model)
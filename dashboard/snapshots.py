@@ -0,0 +1,125 @@
+"""
+Daily ``DashboardMetric`` snapshots computed from the live tables.
+
+``snapshot_metrics`` computes every metric type that has a source table in
+a few aggregate queries and upserts one row per type on the
+``(metric_type, date)`` unique constraint, so running it again the same day
+(e.g. hourly from cron) just refreshes that day's values. ``backfill_metrics``
+reconstructs past days from ``created_at`` / ``updated_at`` / ``end_date``
+history with one grouped query per source table.
+
+``website_visitors`` has no source table and is never snapshotted.
+``projects_active`` and ``blog_views`` only exist as current values, so they
+are not backfilled. Completed tasks are dated by their last update.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from clients.models import Client
+from content.models import BlogPost
+from projects.models import Project, ProjectTask
+from .counters import read_counters
+from .models import DashboardMetric
+from .rollups import rebuild_rollups, refresh_rollups
+from .stats import client_counts, project_counts
+
+BACKFILL_TYPES = ['projects_total', 'clients_total', 'revenue_monthly', 'revenue_yearly', 'tasks_completed']
+
+
+def save_metrics(metrics):
+    """Upsert ``{(metric_type, date): value}`` in one query per 1000 rows"""
+    DashboardMetric.objects.bulk_create(
+        [DashboardMetric(metric_type=metric_type, date=day, value=value)
+         for (metric_type, day), value in metrics.items()],
+        update_conflicts=True, unique_fields=['metric_type', 'date'], update_fields=['value'],
+        batch_size=1000,
+    )
+
+
+def live_metrics(day):
+    """Current value of every snapshotted metric type, revenue counted up to ``day``"""
+    counters = read_counters('projects.Project', 'clients.Client')
+    projects = project_counts(counters)
+    revenue = Project.objects.filter(status='completed', end_date__lte=day).aggregate(
+        monthly=Sum('budget', filter=Q(end_date__gte=day.replace(day=1))),
+        yearly=Sum('budget', filter=Q(end_date__gte=day.replace(month=1, day=1))),
+    )
+    return {
+        'projects_total': projects['total'],
+        'projects_active': projects['active'],
+        'clients_total': client_counts(counters)['total'],
+        'revenue_monthly': revenue['monthly'] or 0,
+        'revenue_yearly': revenue['yearly'] or 0,
+        'tasks_completed': ProjectTask.objects.filter(status='completed').count(),
+        'blog_views': BlogPost.objects.aggregate(views=Sum('views'))['views'] or 0,
+    }
+
+
+def snapshot_metrics(day=None):
+    """Store today's (or ``day``'s) metrics and refresh their rollups; returns the number of rows"""
+    day = day or timezone.localdate()
+    values = live_metrics(day)
+    with transaction.atomic():
+        save_metrics({(metric_type, day): value for metric_type, value in values.items()})
+        # bulk_create skips the signals that keep the rollups current
+        for metric_type in values:
+            refresh_rollups(metric_type, day)
+    return len(values)
+
+
+def _daily_counts(queryset, field):
+    """``{date: rows}`` per day of the ``field`` datetime"""
+    rows = queryset.order_by().annotate(day=TruncDate(field)).values('day').annotate(count=Count('pk'))
+    return {row['day']: row['count'] for row in rows}
+
+
+def _days(date_from, date_to):
+    day = date_from
+    while day <= date_to:
+        yield day
+        day += timedelta(days=1)
+
+
+def _running_totals(daily, date_from, date_to):
+    """Cumulative ``daily`` values at the end of each day from ``date_from`` to ``date_to``"""
+    total = sum(value for day, value in daily.items() if day < date_from)
+    totals = {}
+    for day in _days(date_from, date_to):
+        total += daily.get(day, 0)
+        totals[day] = total
+    return totals
+
+
+def backfill_metrics(date_from, date_to=None):
+    """Reconstruct the history metrics from ``date_from`` to ``date_to`` (default yesterday)"""
+    date_to = date_to or timezone.localdate() - timedelta(days=1)
+    metrics = {}
+    for metric_type, queryset, field in [
+        ('projects_total', Project.objects.all(), 'created_at'),
+        ('clients_total', Client.objects.all(), 'created_at'),
+        ('tasks_completed', ProjectTask.objects.filter(status='completed'), 'updated_at'),
+    ]:
+        daily = _daily_counts(queryset.filter(**{f'{field}__date__lte': date_to}), field)
+        for day, value in _running_totals(daily, date_from, date_to).items():
+            metrics[metric_type, day] = value
+
+    revenue = dict(
+        Project.objects.filter(status='completed', budget__isnull=False,
+                               end_date__gte=date_from.replace(month=1, day=1), end_date__lte=date_to)
+        .order_by().values('end_date').annotate(total=Sum('budget')).values_list('end_date', 'total')
+    )
+    monthly, yearly = defaultdict(int), defaultdict(int)
+    for day in _days(date_from.replace(month=1, day=1), date_to):
+        monthly[day.year, day.month] += revenue.get(day, 0)
+        yearly[day.year] += revenue.get(day, 0)
+        if day >= date_from:
+            metrics['revenue_monthly', day] = monthly[day.year, day.month]
+            metrics['revenue_yearly', day] = yearly[day.year]
+
+    with transaction.atomic():
+        save_metrics(metrics)
+        rebuild_rollups(BACKFILL_TYPES)
+    return len(metrics)
@@ -0,0 +1,152 @@
+"""
+Shared aggregation helpers for the stats endpoints.
+
+Per-status counts come from the denormalized ``StatusCounter`` table (see
+``dashboard.counters``), so every helper costs one small query regardless of
+table size. Time-windowed counts that cannot be kept as counters use a single
+conditional aggregation query (``Count(..., filter=Q(...))``).
+"""
+from datetime import datetime, time, timedelta
+from django.db.models import Count, Q
+from django.utils import timezone
+from .counters import read_counters
+from .models import ActivityLog
+
+
+def count_by(queryset, **conditions):
+    """Return the row count plus one count per named Q condition in one query"""
+    aggregates = {'total': Count('pk')}
+    for name, condition in conditions.items():
+        aggregates[name] = Count('pk', filter=condition)
+    return queryset.aggregate(**aggregates)
+
+
+def grouped_counts(queryset, *fields):
+    """Row count per combination of ``fields`` in one GROUP BY query"""
+    return list(queryset.order_by().values(*fields).annotate(count=Count('pk')))
+
+
+def date_window(field, date_from=None, date_to=None):
+    """Q limiting a datetime ``field`` to the days from ``date_from`` to ``date_to`` inclusive"""
+    condition = Q()
+    if date_from:
+        condition &= Q(**{f'{field}__gte': timezone.make_aware(datetime.combine(date_from, time.min))})
+    if date_to:
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        condition &= Q(**{f'{field}__lt': end})
+    return condition
+
+
+def percentage(part, whole):
+    """Percentage rounded to two decimals, 0 when the whole is empty"""
+    return round((part / whole * 100) if whole > 0 else 0, 2)
+
+
+def _breakdown(counters, label, field='status'):
+    values = counters.get((label, field), {})
+    return values, sum(values.values())
+
+
+def project_counts(counters=None):
+    counters = read_counters('projects.Project') if counters is None else counters
+    statuses, total = _breakdown(counters, 'projects.Project')
+    return {
+        'total': total,
+        'active': statuses.get('in_progress', 0),
+        'completed': statuses.get('completed', 0),
+        'on_hold': statuses.get('on_hold', 0),
+    }
+
+
+def client_counts(counters=None):
+    counters = read_counters('clients.Client') if counters is None else counters
+    active, total = _breakdown(counters, 'clients.Client', 'is_active')
+    types, _ = _breakdown(counters, 'clients.Client', 'client_type')
+    return {
+        'total': total,
+        'active': active.get('True', 0),
+        'individual': types.get('individual', 0),
+        'business': types.get('business', 0),
+    }
+
+
+def blog_post_counts(counters=None):
+    counters = read_counters('content.BlogPost') if counters is None else counters
+    statuses, total = _breakdown(counters, 'content.BlogPost')
+    return {'total': total, 'published': statuses.get('published', 0)}
+
+
+def contact_counts(counters=None):
+    counters = read_counters('communication.ContactSubmission') if counters is None else counters
+    statuses, total = _breakdown(counters, 'communication.ContactSubmission')
+    return {'total': total, 'pending': statuses.get('new', 0)}
+
+
+def activity_counts(days=7):
+    since = timezone.now() - timedelta(days=days)
+    return count_by(ActivityLog.objects.all(), recent=Q(created_at__gte=since))
+
+
+def content_counts():
+    """Blog, portfolio, service and team counts"""
+    counters = read_counters('content.BlogPost', 'content.PortfolioProject',
+                             'content.Service', 'content.TeamMember')
+    posts = blog_post_counts(counters)
+    _, portfolio_projects = _breakdown(counters, 'content.PortfolioProject')
+    services, _ = _breakdown(counters, 'content.Service')
+    team, _ = _breakdown(counters, 'content.TeamMember')
+    return {
+        'blog_posts': posts['total'],
+        'published_posts': posts['published'],
+        'portfolio_projects': portfolio_projects,
+        'active_services': services.get('active', 0),
+        'team_members': team.get('active', 0),
+    }
+
+
+def communication_counts():
+    counters = read_counters('communication.ContactSubmission', 'communication.Newsletter',
+                             'communication.NewsletterSubscriber')
+    contacts = contact_counts(counters)
+    subscribers, _ = _breakdown(counters, 'communication.NewsletterSubscriber', 'is_active')
+    newsletters, _ = _breakdown(counters, 'communication.Newsletter')
+    return {
+        'contact_submissions': contacts['total'],
+        'pending_submissions': contacts['pending'],
+        'newsletter_subscribers': subscribers.get('True', 0),
+        'sent_newsletters': newsletters.get('sent', 0),
+    }
+
+
+def overview_stats():
+    """Statistics shown on the dashboard overview: one counter read plus the activity window"""
+    counters = read_counters('projects.Project', 'clients.Client', 'content.BlogPost',
+                             'communication.ContactSubmission')
+    projects = project_counts(counters)
+    clients = client_counts(counters)
+    posts = blog_post_counts(counters)
+    contacts = contact_counts(counters)
+    activities = activity_counts()
+
+    return {
+        'projects': {
+            'total': projects['total'],
+            'active': projects['active'],
+            'completed': projects['completed'],
+            'completion_rate': percentage(projects['completed'], projects['total'])
+        },
+        'clients': {
+            'total': clients['total'],
+            'active': clients['active']
+        },
+        'content': {
+            'blog_posts': posts['total'],
+            'published_posts': posts['published']
+        },
+        'communication': {
+            'pending_contacts': contacts['pending']
+        },
+        'activity': {
+            'recent_activities': activities['recent']
+        }
+    }
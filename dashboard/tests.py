@@ -1,3 +1,415 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from careers.models import JobPosting
+from clients.models import Client
+from content.models import BlogPost
+from projects.models import Project
+from settings_app.models import CompanySettings
+from sheba_admin_backend.archive import archive_rows
+from sheba_admin_backend.dataset import DatasetGenerator
+from .audit import AuditLogWriter, audit_writer
+from .counters import read_counters
+from .indexes import constant_filters, is_covered, propose_indexes
+from .models import ActivityLog, DashboardMetric, MetricRollup
+from .rollups import rebuild_rollups
+from .snapshots import backfill_metrics, snapshot_metrics
 
-# Create your tests here.
+
+class DashboardStatsQueryCountTests(TestCase):
+    """The overview endpoints must not issue one COUNT per status"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        client = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+        for status in ['planning', 'in_progress', 'completed', 'completed']:
+            Project.objects.create(name=status, description='', client=client,
+                                   status=status, start_date=date.today())
+        ActivityLog.objects.create(user=self.user, action='create', description='x')
+
+    def test_overview_query_count(self):
+        # Status counters plus the recent activity window
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard:dashboard-overview'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['projects'], {
+            'total': 4, 'active': 1, 'completed': 2, 'completion_rate': 50.0
+        })
+        self.assertEqual(response.data['activity']['recent_activities'], 1)
+
+    def test_combined_query_count(self):
+        # Overview, recent activities with their users, chart metrics
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('dashboard:dashboard-combined'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['overview']['clients'], {'total': 1, 'active': 1})
+        self.assertEqual(len(response.data['recent_activities']), 1)
+
+    def test_combined_is_cached(self):
+        self.client.get(reverse('dashboard:dashboard-combined'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('dashboard:dashboard-combined'))
+        self.assertEqual(response.status_code, 200)
+
+
+class StatusCounterTests(TestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+
+    def project_statuses(self):
+        return read_counters('projects.Project').get(('projects.Project', 'status'), {})
+
+    def create_project(self, status='planning'):
+        return Project.objects.create(name='P', description='', client=self.client_obj,
+                                      status=status, start_date=date.today())
+
+    def test_create_transition_and_delete(self):
+        project = self.create_project()
+        self.create_project()
+        self.assertEqual(self.project_statuses(), {'planning': 2})
+
+        project.status = 'completed'
+        project.save()
+        self.assertEqual(self.project_statuses(), {'planning': 1, 'completed': 1})
+
+        project.delete()
+        self.assertEqual(self.project_statuses(), {'planning': 1, 'completed': 0})
+
+    def test_transition_on_deferred_instance(self):
+        project = self.create_project()
+        deferred = Project.objects.only('name').get(pk=project.pk)
+        deferred.status = 'testing'
+        deferred.save()
+        self.assertEqual(self.project_statuses(), {'planning': 0, 'testing': 1})
+
+    def test_delete_of_deferred_instance(self):
+        project = self.create_project()
+        Project.objects.only('id').get(pk=project.pk).delete()
+        self.assertEqual(self.project_statuses(), {'planning': 0})
+
+    def test_cascade_delete_updates_counters(self):
+        self.create_project()
+        self.client_obj.delete()
+        self.assertEqual(self.project_statuses(), {'planning': 0})
+        clients = read_counters('clients.Client')
+        self.assertEqual(clients[('clients.Client', 'is_active')], {'True': 0})
+
+    def test_reconcile_absorbs_bulk_updates(self):
+        self.create_project()
+        Project.objects.update(status='cancelled')
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_counters', 'projects.Project', '--verify', stdout=StringIO())
+
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(self.project_statuses(), {'cancelled': 1})
+        call_command('reconcile_counters', '--verify', stdout=StringIO())
+
+
+class ActivityLogCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        ActivityLog.objects.bulk_create([
+            ActivityLog(user=self.user, action='create', description=str(i)) for i in range(45)
+        ])
+        self.url = reverse('dashboard:activity-list-create')
+
+    def test_walks_every_row_once(self):
+        ids = []
+        url = self.url + '?pagination=cursor'
+        while url:
+            # One query per page: no COUNT, user joined in
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        expected = list(ActivityLog.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_page_numbers_remain_default(self):
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+
+
+class IndexProposalTests(TestCase):
+    def test_constant_filters_become_conditions(self):
+        self.assertEqual(constant_filters(BlogPost.objects.filter(status='published')),
+                         (('status', 'published'),))
+        self.assertEqual(constant_filters(BlogPost.objects.filter(views__gt=1)), ())
+
+    def test_public_views_get_partial_indexes(self):
+        proposals = {(p.label, p.fields, p.conditions): p for p in propose_indexes()}
+        blog = proposals['content.BlogPost', ('-published_at', '-created_at'), (('status', 'published'),)]
+        self.assertIn('PublicBlogPostListView', blog.views)
+        self.assertIn("condition=Q(status='published')", blog.as_code())
+        self.assertTrue(is_covered(blog))
+        # The unique (metric_type, date) constraint already serves the metric filter
+        metric = proposals['dashboard.DashboardMetric', ('metric_type', '-date', '-created_at'), ()]
+        self.assertTrue(is_covered(metric))
+
+    def test_command_lists_missing_indexes(self):
+        out = StringIO()
+        call_command('propose_indexes', 'content.WebsiteContent', stdout=out)
+        self.assertIn("models.Index(fields=['section', '-updated_at'])", out.getvalue())
+
+
+class MetricRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today()
+        self.month_start = self.today.replace(day=1)
+        for offset, value in enumerate([10, 20, 60]):
+            DashboardMetric.objects.create(metric_type='blog_views', value=value,
+                                           date=self.month_start + timedelta(days=offset))
+
+    def rollup(self, period='month'):
+        return MetricRollup.objects.get(metric_type='blog_views', period=period, period_start=self.month_start)
+
+    def rollups(self):
+        return sorted(MetricRollup.objects.values_list(
+            'metric_type', 'period', 'period_start', 'count', 'total', 'average', 'minimum', 'maximum'
+        ))
+
+    def test_rollups_follow_daily_metrics(self):
+        rollup = self.rollup()
+        self.assertEqual((rollup.count, rollup.total, rollup.average, rollup.minimum, rollup.maximum),
+                         (3, Decimal('90'), Decimal('30'), Decimal('10'), Decimal('60')))
+        metric = DashboardMetric.objects.get(value=60)
+        metric.date = self.month_start - timedelta(days=1)
+        metric.save()
+        self.assertEqual((self.rollup().total, self.rollup().maximum), (Decimal('30'), Decimal('20')))
+        DashboardMetric.objects.filter(date__gte=self.month_start).delete()
+        self.assertFalse(MetricRollup.objects.filter(period='month', period_start=self.month_start).exists())
+
+    def test_rebuild_matches_incremental_rollups(self):
+        incremental = self.rollups()
+        self.assertEqual(rebuild_rollups(), len(incremental))
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_bucketed_chart_is_columnar(self):
+        url = reverse('dashboard:metrics-chart')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'type': 'blog_views', 'bucket': 'month', 'value': 'sum'})
+        self.assertEqual(response.data['dates'], [self.month_start.isoformat()])
+        self.assertEqual(response.data['values'], [90.0])
+        response = self.client.get(url, {'type': 'blog_views', 'bucket': 'day', 'days': 40})
+        self.assertEqual(response.data['values'][-3:], [10.0, 20.0, 60.0])
+
+    def test_chart_window_is_bounded(self):
+        url = reverse('dashboard:metrics-chart')
+        for params in [{'days': 0}, {'days': 100000}, {'type': 'nope'}, {'bucket': 'hour'}]:
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+class SnapshotMetricsTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.acme = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+
+    def project(self, status='in_progress', budget=None, end_date=None, days_ago=0):
+        project = Project.objects.create(name=status, description='', client=self.acme, status=status,
+                                         start_date=self.today, end_date=end_date, budget=budget)
+        Project.objects.filter(pk=project.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return project
+
+    def values(self, day):
+        return dict(DashboardMetric.objects.filter(date=day).values_list('metric_type', 'value'))
+
+    def test_snapshot_upserts_todays_row(self):
+        self.project()
+        snapshot_metrics()
+        self.project(status='completed', budget=500, end_date=self.today)
+        self.assertEqual(snapshot_metrics(), 7)
+        values = self.values(self.today)
+        self.assertEqual(DashboardMetric.objects.filter(metric_type='projects_total').count(), 1)
+        self.assertEqual((values['projects_total'], values['projects_active'], values['revenue_monthly']),
+                         (2, 1, 500))
+        rollup = MetricRollup.objects.get(metric_type='projects_total', period='year')
+        self.assertEqual((rollup.count, rollup.total), (1, 2))
+
+    def test_backfill_reconstructs_history(self):
+        self.project(days_ago=10)
+        self.project(days_ago=5)
+        Client.objects.filter(pk=self.acme.pk).update(created_at=timezone.now() - timedelta(days=10))
+        backfill_metrics(self.today - timedelta(days=12))
+        self.assertEqual(self.values(self.today - timedelta(days=11))['projects_total'], 0)
+        self.assertEqual(self.values(self.today - timedelta(days=7))['projects_total'], 1)
+        self.assertEqual(self.values(self.today - timedelta(days=1))['projects_total'], 2)
+        self.assertEqual(self.values(self.today - timedelta(days=1))['clients_total'], 1)
+        self.assertFalse(DashboardMetric.objects.filter(date=self.today).exists())
+
+
+class AuditLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def entries(self):
+        return list(ActivityLog.objects.order_by('id').values_list('action', 'model_name', 'description'))
+
+    @mock.patch.object(audit_writer, 'start')
+    def test_changes_are_logged_after_commit(self, start):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('clients:client-list-create'), {
+                'name': 'Acme', 'email': 'acme@example.com', 'phone': '1'
+            })
+        self.assertEqual(response.status_code, 201)
+        # Nothing is written on the request thread
+        self.assertEqual(self.entries(), [])
+        audit_writer.flush()
+        self.assertEqual(self.entries(), [('create', 'Client', 'Created client: Acme')])
+        entry = ActivityLog.objects.get()
+        self.assertEqual((entry.user, entry.object_id), (self.user, response.data['id']))
+
+    @mock.patch.object(audit_writer, 'start')
+    def test_uncommitted_and_requestless_changes_are_not_logged(self, start):
+        # The test transaction never commits
+        self.client.post(reverse('clients:client-list-create'), {
+            'name': 'Acme', 'email': 'acme@example.com', 'phone': '1'
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.create(name='Beta', email='beta@example.com', phone='2')
+        audit_writer.flush()
+        self.assertEqual(self.entries(), [])
+
+    @mock.patch.object(audit_writer, 'start')
+    def test_login_is_logged_once(self, start):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient().post(reverse('authentication:login'), {'username': 'admin', 'password': 'pass'})
+        self.assertEqual(response.status_code, 200)
+        audit_writer.flush()
+        self.assertEqual(self.entries(), [('login', '', 'admin logged in')])
+
+    def test_full_queue_drops_entries(self):
+        writer = AuditLogWriter(batch_size=10, queue_size=2)
+        with mock.patch.object(writer, 'start'):
+            results = [writer.enqueue(ActivityLog(user=self.user, action='view', description=str(i)))
+                       for i in range(3)]
+        self.assertEqual(results, [True, True, False])
+        with self.assertNumQueries(1):
+            writer.flush()
+        stats = writer.stats()
+        self.assertEqual((stats['written'], stats['dropped'], stats['queued']), (2, 1, 0))
+
+
+class AuditLogWriterThreadTests(TransactionTestCase):
+    def test_background_thread_writes_batches(self):
+        user = User.objects.create_user(username='admin', password='pass')
+        writer = AuditLogWriter(batch_size=2, interval=0.05)
+        for i in range(3):
+            writer.enqueue(ActivityLog(user=user, action='view', description=str(i)))
+        writer.flush()
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertEqual(writer.stats()['batches'], 2)
+        self.assertNotEqual(writer.thread.ident, threading.get_ident())
+
+
+class ActivityLogArchiveTests(TestCase):
+    def setUp(self):
+        self.enterContext(override_settings(LOG_ARCHIVE_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        self.old = now - timedelta(days=400)
+        for index, (action, created_at) in enumerate([
+            ('login', self.old), ('create', self.old), ('login', self.old + timedelta(days=40)),
+            ('login', now), ('update', now),
+        ]):
+            log = ActivityLog.objects.create(user=self.user, action=action, description=str(index))
+            ActivityLog.objects.filter(pk=log.pk).update(created_at=created_at)
+
+    def test_old_rows_move_to_monthly_files(self):
+        self.assertEqual(archive_rows('dashboard.ActivityLog', days=180, batch_size=2), 3)
+        self.assertEqual(sorted(ActivityLog.objects.values_list('action', flat=True)), ['login', 'update'])
+        response = self.client.get(reverse('dashboard:activity-archive'))
+        months = [month['month'] for month in response.data['months']]
+        self.assertEqual(len(months), 2)
+        self.assertEqual(months[0], timezone.localtime(self.old).strftime('%Y-%m'))
+
+        response = self.client.get(reverse('dashboard:activity-archive'), {'month': months[0], 'action': 'login'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['action'], row['description']) for row in rows], [('login', '0')])
+        self.assertEqual(self.client.get(reverse('dashboard:activity-archive'), {'month': '1999-01'}).status_code, 404)
+
+    def test_rerun_after_interruption_does_not_duplicate(self):
+        with mock.patch('django.db.models.query.QuerySet.delete', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_rows('dashboard.ActivityLog', days=180)
+        self.assertEqual(ActivityLog.objects.count(), 5)
+        archive_rows('dashboard.ActivityLog', days=180)
+        month = timezone.localtime(self.old).strftime('%Y-%m')
+        response = self.client.get(reverse('dashboard:activity-archive'), {'month': month})
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 2)
+
+
+class BenchmarkTests(TestCase):
+    def test_dataset_is_reproducible_and_counted(self):
+        DatasetGenerator(seed=7).generate(users=3, clients=20, contacts=10, projects=5, tasks=30, activity_logs=50)
+        first = list(Client.objects.order_by('pk').values_list('name', 'client_type', 'is_active'))
+        active = Client.objects.filter(is_active=True).count()
+        self.assertEqual(read_counters('clients.Client')['clients.Client', 'is_active'].get('True', 0), active)
+        self.assertEqual(ActivityLog.objects.count(), 50)
+        self.assertTrue(Project.assigned_to.through.objects.exists())
+        self.assertGreater(ActivityLog.objects.dates('created_at', 'day').count(), 1)
+
+        Client.objects.all().delete()
+        DatasetGenerator(seed=7).generate(users=3, clients=20, contacts=0, projects=0, tasks=0, activity_logs=0)
+        self.assertEqual(list(Client.objects.order_by('pk').values_list('name', 'client_type', 'is_active')), first)
+
+    def test_benchmark_reports_and_compares_routes(self):
+        output = self.enterContext(tempfile.NamedTemporaryFile(suffix='.json'))
+        options = ['--scale', '0.01', '--clients', '10', '--tasks', '20', '--requests', '2',
+                   '--match', '^api/projects/', '--output', output.name]
+        call_command('benchmark_api', *options, stdout=StringIO())
+        report = json.load(output)
+        tasks = report['results']['api/projects/<int:project_id>/tasks/']
+        self.assertEqual(tasks['status'], 200)
+        self.assertGreater(tasks['queries'], 0)
+        self.assertGreater(tasks['bytes'], 0)
+        self.assertLessEqual(tasks['p50_ms'], tasks['p99_ms'])
+        self.assertNotIn('api/projects/tasks/bulk/', report['results'])
+        self.assertEqual(report['dataset']['clients.Client'], 10)
+        # Everything was rolled back
+        self.assertFalse(Client.objects.exists())
+
+        baseline = self.enterContext(tempfile.NamedTemporaryFile('w', suffix='.json'))
+        report['results']['api/projects/<int:project_id>/tasks/']['queries'] = 0
+        json.dump(report, baseline)
+        baseline.flush()
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', *options, '--compare', baseline.name, '--threshold', '1000000', stdout=out)
+        self.assertIn('api/projects/<int:project_id>/tasks/: queries 0 -> ', out.getvalue())
+
+    def test_generate_dataset_command(self):
+        call_command('generate_dataset', '--scale', '0.05', '--seed', '5', stdout=StringIO())
+        self.assertTrue(User.objects.filter(username='admin', is_superuser=True).exists())
+        self.assertTrue(CompanySettings.objects.exists())
+        self.assertGreaterEqual(Client.objects.count(), 50)
+        job = JobPosting.objects.order_by('-pk').first()
+        self.assertEqual(job.applications_count, job.applications.count())
+        self.assertTrue(DashboardMetric.objects.filter(metric_type='clients_total', date=date.today()).exists())
+        self.assertTrue(MetricRollup.objects.exists())
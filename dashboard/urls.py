@@ -13,6 +13,7 @@ urlpatterns = [
     path('activities/', views.ActivityLogListCreateView.as_view(), name='activity-list-create'),
     path('activities/<int:pk>/', views.ActivityLogDetailView.as_view(), name='activity-detail'),
     path('activities/recent/', views.recent_activities, name='recent-activities'),
+    path('activities/archive/', views.ActivityLogArchiveView.as_view(), name='activity-archive'),
     
     # Dashboard Overview
     path('overview/', views.dashboard_overview, name='dashboard-overview'),
@@ -3,19 +3,21 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Q
+from sheba_admin_backend.archive import LogArchiveView
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import SparseFieldsetMixin
+from sheba_admin_backend.pagination import OptionalCursorPagination
+from sheba_admin_backend.search import FullTextSearchFilter, RankedOrderingFilter
 from django.utils import timezone
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from datetime import timedelta
 from .models import DashboardMetric, ActivityLog
-from .serializers import DashboardMetricSerializer, ActivityLogSerializer
-from projects.models import Project
-from clients.models import Client
-from content.models import BlogPost
-from communication.models import ContactSubmission
+from .rollups import metric_series
+from .serializers import DashboardMetricSerializer, ActivityLogSerializer, MetricsChartSerializer
+from .stats import overview_stats
 
-class DashboardMetricListCreateView(generics.ListCreateAPIView):
+class DashboardMetricListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all dashboard metrics or create a new metric"""
     queryset = DashboardMetric.objects.all()
     serializer_class = DashboardMetricSerializer
@@ -24,87 +26,63 @@ class DashboardMetricListCreateView(generics.ListCreateAPIView):
     filterset_fields = ['metric_type', 'date']
     ordering = ['-date', '-created_at']
 
-class DashboardMetricDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DashboardMetricDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a dashboard metric"""
     queryset = DashboardMetric.objects.all()
     serializer_class = DashboardMetricSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class ActivityLogListCreateView(generics.ListCreateAPIView):
+class ActivityLogListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all activity logs or create a new log"""
-    queryset = ActivityLog.objects.all()
+    queryset = ActivityLog.objects.select_related('user')
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['action', 'model_name', 'user']
     search_fields = ['description', 'model_name']
     ordering = ['-created_at']
 
-class ActivityLogDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ActivityLogDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete an activity log"""
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+class ActivityLogArchiveView(LogArchiveView):
+    """Archived activity logs, streamed from the archive files"""
+    permission_classes = [permissions.IsAuthenticated]
+    archive_label = 'dashboard.ActivityLog'
+    filter_fields = {'action': 'action', 'model_name': 'model_name', 'user': 'user_id'}
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @cache_page(60 * 2)  # Cache for 2 minutes
 def dashboard_overview(request):
     """Get dashboard overview statistics"""
-    # Project statistics
-    total_projects = Project.objects.count()
-    active_projects = Project.objects.filter(status='in_progress').count()
-    completed_projects = Project.objects.filter(status='completed').count()
-    
-    # Client statistics
-    total_clients = Client.objects.count()
-    active_clients = Client.objects.filter(is_active=True).count()
-    
-    # Content statistics
-    total_blog_posts = BlogPost.objects.count()
-    published_posts = BlogPost.objects.filter(status='published').count()
-    
-    # Communication statistics
-    pending_contacts = ContactSubmission.objects.filter(status='new').count()
-    
-    # Recent activity (last 7 days)
-    week_ago = timezone.now() - timedelta(days=7)
-    recent_activities = ActivityLog.objects.filter(created_at__gte=week_ago).count()
-    
-    return Response({
-        'projects': {
-            'total': total_projects,
-            'active': active_projects,
-            'completed': completed_projects,
-            'completion_rate': round((completed_projects / total_projects * 100) if total_projects > 0 else 0, 2)
-        },
-        'clients': {
-            'total': total_clients,
-            'active': active_clients
-        },
-        'content': {
-            'blog_posts': total_blog_posts,
-            'published_posts': published_posts
-        },
-        'communication': {
-            'pending_contacts': pending_contacts
-        },
-        'activity': {
-            'recent_activities': recent_activities
-        }
-    })
+    return Response(overview_stats())
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def dashboard_metrics_chart(request):
-    """Get metrics data for charts"""
-    metric_type = request.GET.get('type', 'projects')
-    days = int(request.GET.get('days', 30))
-    
-    start_date = timezone.now().date() - timedelta(days=days)
+    """
+    Get metrics data for charts. With ``?bucket=day|week|month|year`` the
+    series comes back as columnar ``dates`` / ``values`` lists, read from the
+    rollups for buckets longer than a day.
+    """
+    params = MetricsChartSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    metric_type = params.validated_data['type']
+    date_from = params.validated_data['date_from']
+    bucket = params.validated_data.get('bucket')
+    if bucket:
+        return Response(metric_series(metric_type, bucket, date_from, params.validated_data['value']))
+
     metrics = DashboardMetric.objects.filter(
         metric_type=metric_type,
-        date__gte=start_date
+        date__gte=date_from
     ).order_by('date')
     
     return Response(DashboardMetricSerializer(metrics, many=True).data)
@@ -114,36 +92,17 @@ def dashboard_metrics_chart(request):
 def recent_activities(request):
     """Get recent user activities"""
     limit = int(request.GET.get('limit', 10))
-    activities = ActivityLog.objects.all()[:limit]
+    activities = ActivityLog.objects.select_related('user')[:limit]
     return Response(ActivityLogSerializer(activities, many=True).data)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@cache_page(60 * 2)  # Cache for 2 minutes
 def dashboard_combined(request):
     """Get all dashboard data in a single request to reduce API calls"""
-    # Project statistics
-    total_projects = Project.objects.count()
-    active_projects = Project.objects.filter(status='in_progress').count()
-    completed_projects = Project.objects.filter(status='completed').count()
-    
-    # Client statistics
-    total_clients = Client.objects.count()
-    active_clients = Client.objects.filter(is_active=True).count()
-    
-    # Content statistics
-    total_blog_posts = BlogPost.objects.count()
-    published_posts = BlogPost.objects.filter(status='published').count()
-    
-    # Communication statistics
-    pending_contacts = ContactSubmission.objects.filter(status='new').count()
-    
-    # Recent activity (last 7 days)
-    week_ago = timezone.now() - timedelta(days=7)
-    recent_activities_count = ActivityLog.objects.filter(created_at__gte=week_ago).count()
-    
     # Recent activities (limited)
     limit = int(request.GET.get('limit', 10))
-    recent_activities = ActivityLog.objects.all()[:limit]
+    recent_activities = ActivityLog.objects.select_related('user')[:limit]
     
     # Basic metrics for chart (last 30 days)
     start_date = timezone.now().date() - timedelta(days=30)
@@ -153,28 +112,7 @@ def dashboard_combined(request):
     ).order_by('date')
     
     return Response({
-        'overview': {
-            'projects': {
-                'total': total_projects,
-                'active': active_projects,
-                'completed': completed_projects,
-                'completion_rate': round((completed_projects / total_projects * 100) if total_projects > 0 else 0, 2)
-            },
-            'clients': {
-                'total': total_clients,
-                'active': active_clients
-            },
-            'content': {
-                'blog_posts': total_blog_posts,
-                'published_posts': published_posts
-            },
-            'communication': {
-                'pending_contacts': pending_contacts
-            },
-            'activity': {
-                'recent_activities': recent_activities_count
-            }
-        },
+        'overview': overview_stats(),
         'recent_activities': ActivityLogSerializer(recent_activities, many=True).data,
         'metrics_chart': DashboardMetricSerializer(metrics, many=True).data
     })
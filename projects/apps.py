@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from sheba_admin_backend.cache import connect_invalidation
+        connect_invalidation('projects.Project')
+        connect_invalidation('projects.ProjectTask')
+        from .signals import connect_project_signals
+        connect_project_signals()
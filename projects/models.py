@@ -1,8 +1,26 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, IntegerField, Value, Q
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+def count_subquery(queryset, field):
+    """Correlated COUNT of ``queryset`` rows grouped on ``field``, 0 when there are none"""
+    counts = queryset.order_by().values(field).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+class ProjectQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate task and team counts so serializers don't query per row"""
+        tasks = ProjectTask.objects.filter(project=OuterRef('pk'))
+        team = Project.assigned_to.through.objects.filter(project=OuterRef('pk'))
+        return self.annotate(
+            tasks_count=count_subquery(tasks, 'project'),
+            completed_tasks_count=count_subquery(tasks.filter(status='completed'), 'project'),
+            team_size=count_subquery(team, 'project'),
+        )
+
 class Project(models.Model):
     """Project management model"""
     STATUS_CHOICES = [
@@ -37,8 +55,14 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['-end_date', '-created_at'], condition=Q(status='completed'), name='project_completed_idx'),
+        ]
     
     def __str__(self):
         return self.name
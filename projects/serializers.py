@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import Project, ProjectTask
 from clients.serializers import ClientSerializer
 from authentication.serializers import UserProfileSerializer
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Project model"""
     client = ClientSerializer(read_only=True)
     client_id = serializers.IntegerField(write_only=True)
@@ -21,11 +22,16 @@ class ProjectSerializer(serializers.ModelSerializer):
                  'budget', 'progress', 'technologies', 'repository_url', 'live_url',
                  'tasks_count', 'completed_tasks_count', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_sources = {'tasks_count': [], 'completed_tasks_count': []}
     
     def get_tasks_count(self, obj):
+        if hasattr(obj, 'tasks_count'):
+            return obj.tasks_count
         return obj.tasks.count()
     
     def get_completed_tasks_count(self, obj):
+        if hasattr(obj, 'completed_tasks_count'):
+            return obj.completed_tasks_count
         return obj.tasks.filter(status='completed').count()
     
     def create(self, validated_data):
@@ -45,10 +51,20 @@ class ProjectSerializer(serializers.ModelSerializer):
             instance.assigned_to.set(assigned_to_ids)
         return instance
 
-class ProjectTaskSerializer(serializers.ModelSerializer):
-    """Serializer for ProjectTask model"""
-    project = ProjectSerializer(read_only=True)
-    project_id = serializers.IntegerField(write_only=True)
+class ProjectStubSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact project reference embedded in task payloads"""
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'status']
+
+class ProjectTaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Serializer for ProjectTask model
+    
+    ``project`` is a compact stub unless the request asks for
+    ``?expand=project``, in which case the full project is nested.
+    """
+    project = ProjectStubSerializer(read_only=True)
+    project_id = serializers.IntegerField()
     assigned_to = UserProfileSerializer(read_only=True)
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     
@@ -58,8 +74,9 @@ class ProjectTaskSerializer(serializers.ModelSerializer):
                  'assigned_to_id', 'status', 'due_date', 'estimated_hours', 'actual_hours',
                  'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = {'project': ProjectSerializer}
 
-class ProjectSummarySerializer(serializers.ModelSerializer):
+class ProjectSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for project summaries"""
     client_name = serializers.CharField(source='client.name', read_only=True)
     tasks_count = serializers.SerializerMethodField()
@@ -68,11 +85,14 @@ class ProjectSummarySerializer(serializers.ModelSerializer):
         model = Project
         fields = ['id', 'name', 'client_name', 'status', 'priority', 'progress',
                  'start_date', 'end_date', 'tasks_count']
+        field_sources = {'tasks_count': []}
     
     def get_tasks_count(self, obj):
+        if hasattr(obj, 'tasks_count'):
+            return obj.tasks_count
         return obj.tasks.count()
 
-class PublicProjectSerializer(serializers.ModelSerializer):
+class PublicProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public website project showcase"""
     client_name = serializers.CharField(source='client.name', read_only=True)
     client_company = serializers.CharField(source='client.company', read_only=True)
@@ -89,14 +109,24 @@ class PublicProjectSerializer(serializers.ModelSerializer):
             'technologies', 'repository_url', 'live_url', 'tasks_count',
             'completed_tasks_count', 'team_size', 'duration_days', 'created_at'
         ]
+        field_sources = {
+            'tasks_count': [], 'completed_tasks_count': [], 'team_size': [],
+            'duration_days': ['start_date', 'end_date'],
+        }
     
     def get_tasks_count(self, obj):
+        if hasattr(obj, 'tasks_count'):
+            return obj.tasks_count
         return obj.tasks.count()
     
     def get_completed_tasks_count(self, obj):
+        if hasattr(obj, 'completed_tasks_count'):
+            return obj.completed_tasks_count
         return obj.tasks.filter(status='completed').count()
     
     def get_team_size(self, obj):
+        if hasattr(obj, 'team_size'):
+            return obj.team_size
         return obj.assigned_to.count()
     
     def get_duration_days(self, obj):
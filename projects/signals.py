@@ -0,0 +1,25 @@
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+from .models import Project
+
+
+def touch_assigned_projects(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump ``updated_at`` of projects whose assignees changed, so their ETags change too"""
+    if action == 'pre_clear':
+        # The cleared projects are gone by post_clear, which gets no pk_set
+        instance._cleared_project_pks = (
+            set(instance.assigned_projects.values_list('pk', flat=True)) if reverse else {instance.pk}
+        )
+        return
+    if action == 'post_clear':
+        project_pks = instance.__dict__.pop('_cleared_project_pks', set())
+    elif action in ('post_add', 'post_remove'):
+        project_pks = pk_set if reverse else {instance.pk}
+    else:
+        return
+    if project_pks:
+        Project.objects.filter(pk__in=project_pks).update(updated_at=timezone.now())
+
+
+def connect_project_signals():
+    m2m_changed.connect(touch_assigned_projects, sender=Project.assigned_to.through)
@@ -1,3 +1,219 @@
+from datetime import date
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.models import User
+from clients.models import Client, ClientContact
+from .models import Project, ProjectTask
 
-# Create your tests here.
+
+class ProjectStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        client = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+        for status in ['in_progress', 'completed', 'on_hold', 'planning']:
+            Project.objects.create(name=status, description='', client=client,
+                                   status=status, start_date=date.today())
+
+    def test_stats_use_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('projects:project-stats'))
+        self.assertEqual(response.data, {
+            'total_projects': 4,
+            'active_projects': 1,
+            'completed_projects': 1,
+            'on_hold_projects': 1,
+            'completion_rate': 25.0,
+        })
+
+
+class ProjectListQueryCountTests(TestCase):
+    """List pages must cost a constant number of queries, whatever the page size"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client_obj = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+
+    def create_projects(self, count):
+        for i in range(count):
+            project = Project.objects.create(name=f'P{i}', description='', client=self.client_obj,
+                                             status='completed', start_date=date.today())
+            project.assigned_to.add(self.user)
+            ProjectTask.objects.create(project=project, title='Build', status='completed')
+            ProjectTask.objects.create(project=project, title='Ship')
+
+    def test_summary_list(self):
+        self.create_projects(5)
+        # Validators, COUNT for pagination, then the annotated page
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('projects:project-summary'))
+        self.assertEqual(response.data['results'][0]['tasks_count'], 2)
+
+    def test_public_list(self):
+        self.create_projects(5)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('projects:public-project-list'))
+        row = response.data['results'][0]
+        self.assertEqual(row['tasks_count'], 2)
+        self.assertEqual(row['completed_tasks_count'], 1)
+        self.assertEqual(row['team_size'], 1)
+
+    def test_public_list_invalidated_by_related_changes(self):
+        self.create_projects(1)
+        url = reverse('projects:public-project-list')
+        self.client.get(url)
+        project = Project.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectTask.objects.create(project=project, title='Docs')
+        self.assertEqual(self.client.get(url).data['results'][0]['tasks_count'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.assigned_to.clear()
+        self.assertEqual(self.client.get(url).data['results'][0]['team_size'], 0)
+
+    def test_full_list(self):
+        self.create_projects(5)
+        other = Client.objects.create(name='Other', email='o@example.com', phone='2')
+        Project.objects.create(name='Extra', description='', client=other, start_date=date.today())
+        # Validators, COUNT, projects, assignees, annotated clients, client contacts
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('projects:project-list-create'))
+        row = response.data['results'][-1]
+        self.assertEqual(row['client']['total_projects'], 5)
+        self.assertEqual(row['client']['active_projects'], 0)
+        self.assertEqual(len(row['assigned_to']), 1)
+
+    def test_task_changes_refresh_project_etag(self):
+        self.create_projects(1)
+        url = reverse('projects:project-list-create')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        task = ProjectTask.objects.get(title='Ship')
+        task.status = 'completed'
+        task.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_task_delete_refreshes_project_etag(self):
+        self.create_projects(2)
+        url = reverse('projects:project-list-create')
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        ProjectTask.objects.filter(title='Ship').first().delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_assignee_changes_refresh_project_etag(self):
+        self.create_projects(1)
+        project = Project.objects.get()
+        url = reverse('projects:project-detail', args=[project.pk])
+        etag = self.client.get(url)['ETag']
+        other = User.objects.create_user(username='other', password='pass')
+        project.assigned_to.add(other)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        other.assigned_projects.clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_client_changes_refresh_project_etag(self):
+        self.create_projects(1)
+        contact = ClientContact.objects.create(client=self.client_obj, name='Contact', email='k@example.com')
+        project = Project.objects.get()
+        for url in (reverse('projects:project-list-create'), reverse('projects:project-detail', args=[project.pk])):
+            etag = self.client.get(url)['ETag']
+            contact.phone = '555'
+            contact.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            # Another project of the client changes its project counts
+            other = Project.objects.create(name='Other', description='', client=self.client_obj,
+                                           status='in_progress', start_date=date.today())
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 200)
+            other.delete()
+
+    def test_detail_uses_annotations(self):
+        self.create_projects(1)
+        project = Project.objects.get()
+        response = self.client.get(reverse('projects:project-detail', args=[project.pk]))
+        self.assertEqual(response.data['tasks_count'], 2)
+        self.assertEqual(response.data['completed_tasks_count'], 1)
+
+
+class ProjectTaskExpansionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        client = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+        for i in range(3):
+            project = Project.objects.create(name=f'P{i}', description='', client=client,
+                                             start_date=date.today())
+            project.assigned_to.add(self.user)
+            for j in range(3):
+                ProjectTask.objects.create(project=project, title=f'T{j}', assigned_to=self.user)
+
+    def test_default_embeds_project_stub(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('projects:task-list-create'))
+        row = response.data['results'][0]
+        self.assertEqual(set(row['project']), {'id', 'name', 'status'})
+        self.assertEqual(row['project_id'], row['project']['id'])
+
+    def test_expand_project(self):
+        # Validators, COUNT, tasks, projects, assignees, annotated clients, client contacts
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('projects:task-list-create'), {'expand': 'project'})
+        project = response.data['results'][0]['project']
+        self.assertEqual(project['tasks_count'], 3)
+        self.assertEqual(project['client']['total_projects'], 3)
+        self.assertEqual(len(project['assigned_to']), 1)
+
+    def test_create_task(self):
+        project = Project.objects.first()
+        response = self.client.post(reverse('projects:task-list-create'),
+                                    {'project_id': project.pk, 'title': 'New'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['project']['name'], project.name)
+
+
+class ProjectTaskBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='pass')
+        self.other = User.objects.create_user(username='dev', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        client = Client.objects.create(name='Acme', email='acme@example.com', phone='1')
+        self.project = Project.objects.create(name='P', description='', client=client, start_date=date.today())
+
+    def test_create_and_reassign(self):
+        url = reverse('projects:task-bulk')
+        response = self.client.post(url, [
+            {'project_id': self.project.pk, 'title': f'T{i}', 'description': '', 'assigned_to_id': self.user.pk}
+            for i in range(3)
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        ids = response.data['ids']
+        self.assertEqual(ProjectTask.objects.filter(pk__in=ids).count(), 3)
+
+        response = self.client.patch(url, {'ids': ids[:2], 'set': {'assigned_to_id': self.other.pk}}, format='json')
+        self.assertEqual(response.data, {'updated': 2})
+        self.assertEqual(ProjectTask.objects.filter(assigned_to=self.other).count(), 2)
+
+        response = self.client.patch(url, {'ids': ids, 'set': {'assigned_to_id': 999}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assigned_to_id', response.data)
+
+    def test_unknown_project(self):
+        response = self.client.post(reverse('projects:task-bulk'), [
+            {'project_id': self.project.pk, 'title': 'ok', 'description': ''},
+            {'project_id': 999, 'title': 'bad', 'description': ''},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(list(response.data[1]), ['project_id'])
+        self.assertFalse(ProjectTask.objects.exists())
@@ -17,6 +17,7 @@ urlpatterns = [
         views.ProjectTaskListCreateView.as_view(),
         name="project-task-list-create",
     ),
+    path("tasks/bulk/", views.ProjectTaskBulkView.as_view(), name="task-bulk"),
     path("tasks/<int:pk>/", views.ProjectTaskDetailView.as_view(), name="task-detail"),
     # Public endpoint for website
     path("public/", views.PublicProjectListView.as_view(), name="public-project-list"),
@@ -3,40 +3,71 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from sheba_admin_backend.bulk import BulkView
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import ConditionalGetMixin, SparseFieldsetMixin, PublicCacheMixin
+from django.db.models import Prefetch
+from clients.models import Client
+from dashboard.stats import project_counts, percentage
 from .models import Project, ProjectTask
+from sheba_admin_backend.serializers import requested_expansions
 from .serializers import ProjectSerializer, ProjectTaskSerializer, ProjectSummarySerializer, PublicProjectSerializer
 
-class ProjectListCreateView(generics.ListCreateAPIView):
+def serialized_projects():
+    """Projects with everything ProjectSerializer reads annotated or prefetched"""
+    return Project.objects.with_counts().prefetch_related(
+        'assigned_to',
+        Prefetch('client', queryset=Client.objects.with_project_counts().prefetch_related('contacts')),
+    )
+
+class ProjectListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all projects or create a new project"""
-    queryset = Project.objects.all()
+    queryset = serialized_projects()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # The embedded client shows its contacts and counts of its projects
+    validator_fields = ['updated_at', 'tasks__updated_at', 'client__updated_at',
+                        'client__contacts__updated_at', 'client__projects__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority', 'client']
     search_fields = ['name', 'description']
     ordering_fields = ['created_at', 'start_date', 'end_date', 'priority']
     ordering = ['-created_at']
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a project"""
-    queryset = Project.objects.all()
+    queryset = serialized_projects()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # The embedded client shows its contacts and counts of its projects
+    validator_fields = ['updated_at', 'tasks__updated_at', 'client__updated_at',
+                        'client__contacts__updated_at', 'client__projects__updated_at']
 
-class ProjectSummaryListView(generics.ListAPIView):
+class ProjectSummaryListView(ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List projects with summary data"""
-    queryset = Project.objects.all()
+    queryset = Project.objects.with_counts().select_related('client')
     serializer_class = ProjectSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'tasks__updated_at', 'client__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority']
     search_fields = ['name']
     ordering = ['-created_at']
 
-class ProjectTaskListCreateView(generics.ListCreateAPIView):
+class ProjectTaskQuerysetMixin:
+    """Load only the project data the requested task representation needs"""
+    
+    def get_task_queryset(self):
+        queryset = ProjectTask.objects.select_related('assigned_to')
+        if 'project' in requested_expansions(self.request):
+            return queryset.prefetch_related(Prefetch('project', queryset=serialized_projects()))
+        return queryset.select_related('project')
+
+class ProjectTaskListCreateView(ExportMixin, ConditionalGetMixin, SparseFieldsetMixin, ProjectTaskQuerysetMixin, generics.ListCreateAPIView):
     """List tasks for a project or create a new task"""
     serializer_class = ProjectTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'project__updated_at']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'assigned_to']
     search_fields = ['title', 'description']
@@ -46,8 +77,8 @@ class ProjectTaskListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
         if project_id:
-            return ProjectTask.objects.filter(project_id=project_id)
-        return ProjectTask.objects.all()
+            return self.get_task_queryset().filter(project_id=project_id)
+        return self.get_task_queryset()
     
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_id')
@@ -56,36 +87,46 @@ class ProjectTaskListCreateView(generics.ListCreateAPIView):
         else:
             serializer.save()
 
-class ProjectTaskDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """Retrieve, update or delete a project task"""
+class ProjectTaskBulkView(BulkView):
+    """Create, update (e.g. reassign) or delete many tasks at once"""
     queryset = ProjectTask.objects.all()
     serializer_class = ProjectTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'assigned_to', 'project']
+
+class ProjectTaskDetailView(ConditionalGetMixin, SparseFieldsetMixin, ProjectTaskQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
+    """Retrieve, update or delete a project task"""
+    serializer_class = ProjectTaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    validator_fields = ['updated_at', 'project__updated_at']
+    
+    def get_queryset(self):
+        return self.get_task_queryset()
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def project_stats(request):
     """Get project statistics"""
-    total_projects = Project.objects.count()
-    active_projects = Project.objects.filter(status='in_progress').count()
-    completed_projects = Project.objects.filter(status='completed').count()
-    on_hold_projects = Project.objects.filter(status='on_hold').count()
+    counts = project_counts()
     
     return Response({
-        'total_projects': total_projects,
-        'active_projects': active_projects,
-        'completed_projects': completed_projects,
-        'on_hold_projects': on_hold_projects,
-        'completion_rate': round((completed_projects / total_projects * 100) if total_projects > 0 else 0, 2)
+        'total_projects': counts['total'],
+        'active_projects': counts['active'],
+        'completed_projects': counts['completed'],
+        'on_hold_projects': counts['on_hold'],
+        'completion_rate': percentage(counts['completed'], counts['total'])
     })
 
 # Public API Views for Website (No Authentication Required)
 
-class PublicProjectListView(generics.ListAPIView):
+class PublicProjectListView(PublicCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Public list of completed projects for website showcase"""
-    queryset = Project.objects.filter(status='completed').select_related('client').prefetch_related('assigned_to')
+    queryset = Project.objects.filter(status='completed').with_counts().select_related('client')
     serializer_class = PublicProjectSerializer
     permission_classes = [permissions.AllowAny]
+    validator_fields = ['updated_at', 'tasks__updated_at', 'client__updated_at']
+    cache_models = ['projects.Project', 'projects.ProjectTask', 'clients.Client']
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority']
     search_fields = ['name', 'description']
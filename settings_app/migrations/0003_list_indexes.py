@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('settings_app', '0002_systemlog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='systemlog',
+            index=models.Index(fields=['level', '-created_at'], name='settings_ap_level_4f8a38_idx'),
+        ),
+    ]
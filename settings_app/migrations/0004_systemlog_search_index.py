@@ -0,0 +1,14 @@
+from django.db import migrations
+from sheba_admin_backend.search import CreateSearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('settings_app', '0003_list_indexes'),
+    ]
+
+    operations = [
+        # GIN index on PostgreSQL, FTS5 table and triggers on SQLite
+        CreateSearchIndex(model_name='systemlog', fields=['message', 'module']),
+    ]
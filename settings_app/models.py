@@ -133,6 +133,10 @@ class SystemLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['level', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.level.upper()}: {self.message[:50]}..."
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from sheba_admin_backend.serializers import DynamicFieldsMixin
 from .models import CompanySettings, SystemSettings, UserPermission, SystemLog
 from authentication.serializers import UserProfileSerializer
 
-class CompanySettingsSerializer(serializers.ModelSerializer):
+class CompanySettingsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for CompanySettings model"""
     class Meta:
         model = CompanySettings
@@ -11,7 +12,7 @@ class CompanySettingsSerializer(serializers.ModelSerializer):
                  'instagram_url', 'github_url', 'tax_id', 'registration_number', 'updated_at']
         read_only_fields = ['id', 'updated_at']
 
-class SystemSettingsSerializer(serializers.ModelSerializer):
+class SystemSettingsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for SystemSettings model"""
     class Meta:
         model = SystemSettings
@@ -23,7 +24,7 @@ class SystemSettingsSerializer(serializers.ModelSerializer):
             'smtp_password': {'write_only': True}
         }
 
-class UserPermissionSerializer(serializers.ModelSerializer):
+class UserPermissionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for UserPermission model"""
     user = UserProfileSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True)
@@ -37,7 +38,7 @@ class UserPermissionSerializer(serializers.ModelSerializer):
                  'granted_by', 'granted_by_id', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class SystemLogSerializer(serializers.ModelSerializer):
+class SystemLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for SystemLog model"""
     user = UserProfileSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
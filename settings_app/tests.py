@@ -1,3 +1,200 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from authentication.models import User
+from sheba_admin_backend import health
+from sheba_admin_backend.archive import archive_rows
+from sheba_admin_backend.metrics import metrics
+from authentication.serializers import UserProfileSerializer
+from sheba_admin_backend.profiling import RequestProfile, current_profile, route_profiles
+from .models import SystemLog
 
-# Create your tests here.
+
+class SystemLogArchiveTests(TestCase):
+    def test_archive_is_admin_only_and_filterable(self):
+        admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        SystemLog.objects.create(level='error', message='Disk full', module='backup')
+        SystemLog.objects.create(level='info', message='Backup done', module='backup')
+        client = APIClient()
+        with self.settings(LOG_ARCHIVE_DIR=self.enterContext(tempfile.TemporaryDirectory())):
+            self.assertEqual(archive_rows('settings_app.SystemLog', days=0), 2)
+            self.assertFalse(SystemLog.objects.exists())
+            url = reverse('settings_app:log-archive')
+            client.force_authenticate(User.objects.create_user(username='staff', password='pass'))
+            self.assertEqual(client.get(url).status_code, 403)
+            client.force_authenticate(admin)
+            month = client.get(url).data['months'][0]['month']
+            response = client.get(url, {'month': month, 'level': 'error'})
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            self.assertIn(b'Disk full', b''.join(response.streaming_content))
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        route_profiles.reset()
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_repeated_statements(self):
+        users = [User.objects.create_user(username=f'u{i}', password='pass') for i in range(3)]
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            for user in users:
+                User.objects.get(pk=user.pk)
+            list(User.objects.filter(pk__in=[user.pk for user in users]))
+            list(User.objects.filter(pk__in=[users[0].pk]))
+        self.assertEqual(profile.queries, 5)
+        self.assertEqual(sorted(profile.repeated().values()), [2, 3])
+
+    @override_settings(REQUEST_PROFILING=True)
+    def test_route_report_is_admin_only(self):
+        for _ in range(2):
+            self.client.get(reverse('settings_app:log-list'))
+        response = self.client.get(reverse('settings_app:system-profile'))
+        route = next(row for row in response.data['routes'] if row['route'] == 'api/settings/logs/')
+        self.assertEqual(route['requests'], 2)
+        self.assertGreater(route['queries']['mean'], 0)
+        self.assertGreater(route['bytes'], 0)
+        self.assertEqual(sum(route['latency_ms']['histogram'].values()), 2)
+
+        self.client.force_authenticate(User.objects.create_user(username='staff', password='pass'))
+        self.assertEqual(self.client.get(reverse('settings_app:system-profile')).status_code, 403)
+
+    def test_profile_header_and_slow_log(self):
+        with self.settings(REQUEST_PROFILING_SLOW_MS=0.001):
+            with self.assertLogs('sheba_admin_backend.profiling', 'WARNING') as logs:
+                response = self.client.get(reverse('settings_app:log-list'), HTTP_X_PROFILE='1')
+        self.assertGreater(int(response['X-Profile-Queries']), 0)
+        self.assertIn('queries in', logs.output[0])
+        self.assertFalse(self.client.get(reverse('settings_app:log-list')).has_header('X-Profile-Queries'))
+
+    def test_profile_header_needs_staff(self):
+        url = reverse('content:public-blog-list')
+        token = Token.objects.create(user=self.admin)
+        response = APIClient().get(url, HTTP_X_PROFILE='1', HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertTrue(response.has_header('X-Profile-Queries'))
+        route_profiles.reset()
+        for client in (APIClient(), APIClient(HTTP_AUTHORIZATION='Token invalid')):
+            response = client.get(url, HTTP_X_PROFILE='1')
+            self.assertFalse(response.has_header('X-Profile-Queries'))
+        # Not profiled at all
+        self.assertEqual(route_profiles.report()['routes'], [])
+
+    def test_serializer_time(self):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            data = UserProfileSerializer([self.admin], many=True).data
+        finally:
+            current_profile.reset(token)
+        self.assertEqual(data[0]['username'], 'admin')
+        self.assertGreater(profile.serializer_time, 0)
+
+
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        health.reset()
+        self.client = APIClient()
+
+    def test_liveness_does_not_touch_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('health-live'))
+        self.assertEqual(response.data, {'status': 'ok'})
+
+    def test_readiness_is_cached(self):
+        response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['checks']), {'database', 'cache', 'disk', 'migrations'})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('health-ready')).status_code, 200)
+
+    def test_readiness_fails_with_a_check(self):
+        def unreachable():
+            raise ConnectionError('refused')
+        with mock.patch.dict(health.CHECKS, {'database': unreachable}):
+            response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data['checks']['database'], {'ok': False, 'ms': mock.ANY})
+        self.client.force_authenticate(User.objects.create_user(username='admin', password='pass', is_staff=True))
+        response = self.client.get(reverse('settings_app:system-health'))
+        self.assertEqual(response.data['database'], 'unavailable')
+        self.assertEqual(response.data['checks']['database']['error'], 'ConnectionError: refused')
+
+    def test_admin_report(self):
+        url = reverse('settings_app:system-health')
+        self.client.force_authenticate(User.objects.create_user(username='staff', password='pass'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(User.objects.create_user(username='admin', password='pass', is_staff=True))
+        response = self.client.get(url)
+        self.assertEqual(response.data['status'], 'healthy')
+        self.assertEqual(response.data['database'], 'connected')
+        self.assertEqual(response.data['checks']['migrations']['unapplied'], 0)
+        self.assertGreater(response.data['process']['cpu_seconds'], 0)
+        self.assertIn('queued', response.data['activity_log_writer'])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='admin', password='pass', is_staff=True))
+
+    def scrape(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_request_cache_and_table_metrics(self):
+        SystemLog.objects.create(level='info', message='Started', module='app')
+        self.client.get(reverse('settings_app:log-list'))
+        cache.get('metrics-test-missing')
+        cache.set('metrics-test', 1)
+        cache.get('metrics-test')
+        text = self.scrape()
+        route = 'method="GET",route="api/settings/logs/"'
+        self.assertIn(f'http_request_duration_seconds_count{{{route},status="200"}} 1', text)
+        self.assertIn(f'http_request_db_queries_bucket{{{route},le="+Inf"}} 1', text)
+        self.assertRegex(text, rf'http_response_size_bytes_total\{{{route}\}} [1-9]')
+        self.assertRegex(text, r'django_cache_requests_total\{result="hit"\} [1-9]')
+        self.assertRegex(text, r'django_cache_requests_total\{result="miss"\} [1-9]')
+        self.assertIn('# TYPE table_rows gauge', text)
+
+    def test_workers_are_added_up(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        labels = [['method', 'GET'], ['route', 'api/settings/logs/']]
+        Path(directory, '1.json').write_text(json.dumps({
+            'counters': [['http_request_size_bytes_total', labels, 10]],
+            'histograms': [['http_request_db_queries', labels, [0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 8]]],
+        }))
+        with self.settings(METRICS_DIR=directory):
+            metrics.inc('http_request_size_bytes_total', tuple(map(tuple, labels)), 5)
+            text = self.scrape()
+        self.assertIn('http_request_size_bytes_total{method="GET",route="api/settings/logs/"} 15', text)
+        self.assertIn('http_request_db_queries_count{method="GET",route="api/settings/logs/"} 2', text)
+
+    def test_reused_pid_keeps_dead_worker_totals(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        labels = [['method', 'GET'], ['route', 'api/settings/logs/']]
+        Path(directory, f'{os.getpid()}-1.json').write_text(json.dumps({
+            'counters': [['http_request_size_bytes_total', labels, 10]], 'histograms': [],
+        }))
+        with self.settings(METRICS_DIR=directory):
+            metrics.inc('http_request_size_bytes_total', tuple(map(tuple, labels)), 5)
+            metrics.flush()
+            text = self.scrape()
+        self.assertEqual(len(list(Path(directory).glob('*.json'))), 2)
+        self.assertIn('http_request_size_bytes_total{method="GET",route="api/settings/logs/"} 15', text)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(User.objects.create_user(username='staff', password='pass'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
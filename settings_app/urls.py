@@ -10,6 +10,7 @@ urlpatterns = [
     # System Settings
     path('system/', views.SystemSettingsView.as_view(), name='system-settings'),
     path('system/health/', views.system_health, name='system-health'),
+    path('system/profile/', views.system_profile, name='system-profile'),
     path('system/backup/', views.backup_database, name='backup-database'),
     path('system/restore/', views.restore_database, name='restore-database'),
     
@@ -21,4 +22,5 @@ urlpatterns = [
     # System Logs
     path('logs/', views.SystemLogListView.as_view(), name='log-list'),
     path('logs/<int:pk>/', views.SystemLogDetailView.as_view(), name='log-detail'),
+    path('logs/archive/', views.SystemLogArchiveView.as_view(), name='log-archive'),
 ]
@@ -3,13 +3,21 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from sheba_admin_backend import health
+from sheba_admin_backend.archive import LogArchiveView
+from sheba_admin_backend.export import ExportMixin
+from sheba_admin_backend.mixins import SparseFieldsetMixin
+from sheba_admin_backend.pagination import OptionalCursorPagination
+from sheba_admin_backend.profiling import route_profiles
+from sheba_admin_backend.search import FullTextSearchFilter, RankedOrderingFilter
+from dashboard.audit import audit_writer
 from .models import CompanySettings, SystemSettings, UserPermission, SystemLog
 from .serializers import (
     CompanySettingsSerializer, SystemSettingsSerializer, 
     UserPermissionSerializer, SystemLogSerializer
 )
 
-class CompanySettingsView(generics.RetrieveUpdateAPIView):
+class CompanySettingsView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     """Get or update company settings"""
     queryset = CompanySettings.objects.all()
     serializer_class = CompanySettingsSerializer
@@ -20,7 +28,7 @@ class CompanySettingsView(generics.RetrieveUpdateAPIView):
         obj, created = CompanySettings.objects.get_or_create(pk=1)
         return obj
 
-class SystemSettingsView(generics.RetrieveUpdateAPIView):
+class SystemSettingsView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     """Get or update system settings"""
     queryset = SystemSettings.objects.all()
     serializer_class = SystemSettingsSerializer
@@ -31,7 +39,7 @@ class SystemSettingsView(generics.RetrieveUpdateAPIView):
         obj, created = SystemSettings.objects.get_or_create(pk=1)
         return obj
 
-class UserPermissionListCreateView(generics.ListCreateAPIView):
+class UserPermissionListCreateView(ExportMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """List all user permissions or create a new permission"""
     queryset = UserPermission.objects.all()
     serializer_class = UserPermissionSerializer
@@ -41,28 +49,36 @@ class UserPermissionListCreateView(generics.ListCreateAPIView):
     search_fields = ['user__username', 'user__email']
     ordering = ['-created_at']
 
-class UserPermissionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserPermissionDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a user permission"""
     queryset = UserPermission.objects.all()
     serializer_class = UserPermissionSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
 
-class SystemLogListView(generics.ListAPIView):
+class SystemLogListView(ExportMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List all system logs"""
     queryset = SystemLog.objects.all()
     serializer_class = SystemLogSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['level', 'module', 'user']
     search_fields = ['message', 'module']
     ordering = ['-created_at']
 
-class SystemLogDetailView(generics.RetrieveAPIView):
+class SystemLogDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     """Retrieve a system log"""
     queryset = SystemLog.objects.all()
     serializer_class = SystemLogSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
 
+class SystemLogArchiveView(LogArchiveView):
+    """Archived system logs, streamed from the archive files"""
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    archive_label = 'settings_app.SystemLog'
+    filter_fields = {'level': 'level', 'module': 'module', 'user': 'user_id'}
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_permissions(request, user_id):
@@ -88,11 +104,27 @@ def restore_database(request):
 @permission_classes([permissions.IsAuthenticated, permissions.IsAdminUser])
 def system_health(request):
     """Get system health status"""
-    # This would implement actual health checks
+    checks = health.run_checks()
+    system = health.system_metrics()
+    process = health.process_metrics()
+    cpu_usage = None
+    if process['uptime_seconds']:
+        cpu_usage = round(100 * process['cpu_seconds'] / process['uptime_seconds'], 1)
     return Response({
-        'status': 'healthy',
-        'database': 'connected',
-        'storage': 'available',
-        'memory_usage': '45%',
-        'cpu_usage': '23%'
+        'status': 'healthy' if all(check['ok'] for check in checks.values()) else 'unhealthy',
+        'database': 'connected' if checks['database']['ok'] else 'unavailable',
+        'storage': 'available' if checks['disk']['ok'] else 'low',
+        'memory_usage': f"{system['memory_used_percent']}%" if system['memory_used_percent'] is not None else None,
+        'cpu_usage': f'{cpu_usage}%' if cpu_usage is not None else None,
+        'checks': checks,
+        'process': process,
+        'system': system,
+        'database_connections': health.database_connections(),
+        'activity_log_writer': audit_writer.stats(),
     })
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, permissions.IsAdminUser])
+def system_profile(request):
+    """Per-route request profiles recorded by this worker process"""
+    return Response(route_profiles.report())
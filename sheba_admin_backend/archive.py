@@ -0,0 +1,135 @@
+"""
+Retention for the append-only log tables.
+
+``archive_rows`` moves the rows of an archived model that are older than its
+retention window into gzip-compressed JSON Lines files under
+``LOG_ARCHIVE_DIR``, one directory per model and month. Rows are processed
+in id order, ``batch_size`` at a time: each batch is written to files named
+after their id range and then deleted by id range in its own short
+transaction, so no lock is held for long. Re-running after an interruption
+rewrites the same files instead of duplicating rows.
+
+``LogArchiveView`` lists the archived months and streams one month back as
+JSON Lines, read straight from the files.
+"""
+import gzip
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Archived model -> setting holding its retention in days
+ARCHIVED_MODELS = {
+    'dashboard.ActivityLog': 'ACTIVITY_LOG_RETENTION_DAYS',
+    'settings_app.SystemLog': 'SYSTEM_LOG_RETENTION_DAYS',
+}
+DEFAULT_RETENTION_DAYS = 90
+MONTH = re.compile(r'^\d{4}-\d{2}$')
+
+
+def archive_dir(label):
+    return Path(getattr(settings, 'LOG_ARCHIVE_DIR', settings.BASE_DIR / 'archive')) / label.lower()
+
+
+def retention_days(label):
+    return getattr(settings, ARCHIVED_MODELS[label], DEFAULT_RETENTION_DAYS)
+
+
+def _write_part(path, rows):
+    """Write ``rows`` to ``path`` atomically, synced to disk before the rows are deleted"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'{path.name}.tmp')
+    with open(temporary, 'wb') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb') as part:
+            for row in rows:
+                part.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(temporary, path)
+
+
+def archive_rows(label, days=None, batch_size=5000):
+    """Archive and delete the rows of ``label`` older than ``days``; returns the number archived"""
+    model = apps.get_model(label)
+    cutoff = timezone.now() - timedelta(days=retention_days(label) if days is None else days)
+    columns = [field.attname for field in model._meta.concrete_fields]
+    expired = model._base_manager.filter(created_at__lt=cutoff)
+    directory = archive_dir(label)
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(expired.order_by('pk').values(*columns)[:batch_size])
+            if not rows:
+                return archived
+            months = defaultdict(list)
+            for row in rows:
+                months[timezone.localtime(row['created_at']).strftime('%Y-%m')].append(row)
+            for month, month_rows in months.items():
+                first, last = month_rows[0]['id'], month_rows[-1]['id']
+                _write_part(directory / month / f'{first:012d}-{last:012d}.jsonl.gz', month_rows)
+            expired.filter(pk__gte=rows[0]['id'], pk__lte=rows[-1]['id']).delete()
+        archived += len(rows)
+
+
+def archived_months(label):
+    """``[{'month', 'files', 'bytes'}]`` for every archived month of ``label``"""
+    directory = archive_dir(label)
+    if not directory.is_dir():
+        return []
+    months = []
+    for path in sorted(directory.iterdir()):
+        if MONTH.match(path.name):
+            parts = list(path.glob('*.jsonl.gz'))
+            months.append({
+                'month': path.name,
+                'files': len(parts),
+                'bytes': sum(part.stat().st_size for part in parts),
+            })
+    return months
+
+
+def iter_archive(label, month, filters=None):
+    """JSON lines of the archived ``month`` in id order, keeping rows whose columns equal ``filters``"""
+    for path in sorted((archive_dir(label) / month).glob('*.jsonl.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as part:
+            for line in part:
+                if filters:
+                    row = json.loads(line)
+                    if any(str(row.get(column)) != value for column, value in filters.items()):
+                        continue
+                yield line
+
+
+class LogArchiveView(APIView):
+    """
+    Read-only access to archived log rows: the archived months, or with
+    ``?month=YYYY-MM`` that month's rows streamed as JSON Lines.
+    ``filter_fields`` maps query parameters to archived columns.
+    """
+    archive_label = None
+    filter_fields = {}
+
+    def get(self, request):
+        month = request.query_params.get('month')
+        if not month:
+            return Response({'months': archived_months(self.archive_label)})
+        if not MONTH.match(month) or not (archive_dir(self.archive_label) / month).is_dir():
+            return Response({'detail': 'No archive for this month.'}, status=status.HTTP_404_NOT_FOUND)
+        filters = {
+            column: request.query_params[name]
+            for name, column in self.filter_fields.items() if request.query_params.get(name)
+        }
+        return StreamingHttpResponse(
+            iter_archive(self.archive_label, month, filters), content_type='application/x-ndjson'
+        )
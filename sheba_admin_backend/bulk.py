@@ -0,0 +1,270 @@
+"""
+Bulk create / update / delete endpoints.
+
+``BulkView`` takes, in one request:
+
+* ``POST [{...}, ...]`` - create every item;
+* ``PATCH [{"id": 1, ...}, ...]`` - update each item with its own values;
+* ``PATCH {"ids": [...], "set": {...}}`` - give the listed rows the same
+  values, or ``{"all": true, "set": {...}}`` for every row the view's
+  filters select (e.g. ``?is_read=false``);
+* ``DELETE {"ids": [...]}`` - delete the listed rows.
+
+Items are validated in one pass with the view's serializer; unique fields
+and foreign key ids are checked with one query per field for the whole
+list instead of one per item. Writes use ``bulk_create`` / ``bulk_update``
+/ ``QuerySet.update`` in a single transaction, so either every item is
+saved or none is; errors come back per item, in request order, as DRF
+reports them for ``many=True``.
+
+Those writes skip model signals, so the view itself records one
+``ActivityLog`` entry, moves the dashboard counters by the values it wrote
+(known from the loaded rows, or one grouped count of the selected rows
+before a ``set``) and invalidates cached public responses. Deletes go through ``QuerySet.delete()``, which
+still cascades and sends the per-row signals.
+"""
+from collections import Counter
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework import generics, serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+from .cache import bump_version
+
+BATCH_SIZE = 1000
+
+
+def bulk_max_items():
+    return getattr(settings, 'BULK_MAX_ITEMS', 10000)
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _add_error(errors, index, name, message):
+    errors[index].setdefault(name, []).append(message)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validate a list of items with one child serializer.
+
+    ``item_pks`` holds the primary key each item updates (``None`` when
+    creating); items whose pk is not in ``instances`` are reported missing.
+    """
+
+    def __init__(self, *args, item_pks=None, instances=None, **kwargs):
+        self.item_pks = item_pks
+        self.instances = instances or {}
+        super().__init__(*args, **kwargs)
+        # Checked for the whole list in check_unique
+        self.unique_fields = []
+        for name, field in self.child.fields.items():
+            if any(isinstance(validator, UniqueValidator) for validator in field.validators):
+                field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+                self.unique_fields.append(name)
+
+    @property
+    def model(self):
+        return self.child.Meta.model
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data or len(data) > self.max_length:
+            # Raises the standard not-a-list / empty / too-long error
+            return super().to_internal_value(data)
+        values, errors = [], []
+        for index, item in enumerate(data):
+            if self.item_pks is not None and self.item_pks[index] not in self.instances:
+                values.append(None)
+                errors.append({'id': ['Not found.']})
+                continue
+            try:
+                values.append(self.child.run_validation(item))
+            except ValidationError as exc:
+                values.append(None)
+                errors.append(exc.detail)
+            else:
+                errors.append({})
+        self.check_unique(values, errors)
+        self.check_related(values, errors)
+        if any(errors):
+            raise ValidationError(errors)
+        return values
+
+    def check_unique(self, values, errors):
+        """Values of unique fields must not repeat in the list or belong to another row"""
+        for name in self.unique_fields:
+            source = self.child.fields[name].source
+            owners = {}
+            for index, attrs in enumerate(values):
+                if attrs is None or source not in attrs:
+                    continue
+                if attrs[source] in owners:
+                    _add_error(errors, index, name, 'This field must be unique.')
+                else:
+                    owners[attrs[source]] = index
+            for chunk in _chunks(owners):
+                existing = self.model._default_manager.filter(**{f'{source}__in': chunk}).values_list(source, 'pk')
+                for value, pk in existing:
+                    index = owners[value]
+                    if self.item_pks is None or self.item_pks[index] != pk:
+                        _add_error(errors, index, name, 'This field must be unique.')
+
+    def check_related(self, values, errors):
+        """Foreign key ids written through ``<field>_id`` must exist"""
+        for name, field in self.child.fields.items():
+            if field.read_only:
+                continue
+            try:
+                model_field = self.model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            if not model_field.many_to_one or field.source != model_field.attname:
+                continue
+            used = {}
+            for index, attrs in enumerate(values):
+                if attrs is not None and attrs.get(field.source) is not None:
+                    used.setdefault(attrs[field.source], []).append(index)
+            found = set()
+            for chunk in _chunks(used):
+                found.update(model_field.related_model._base_manager.filter(pk__in=chunk).values_list('pk', flat=True))
+            for pk in set(used) - found:
+                for index in used[pk]:
+                    _add_error(errors, index, name, f'Invalid pk "{pk}" - object does not exist.')
+
+
+class BulkView(generics.GenericAPIView):
+    """Create, update and delete many rows of the view's queryset per request"""
+
+    def get_bulk_serializer(self, data, **kwargs):
+        return BulkListSerializer(
+            child=self.get_serializer(partial=kwargs.get('partial', False)), data=data,
+            allow_empty=False, max_length=bulk_max_items(), context=self.get_serializer_context(), **kwargs
+        )
+
+    @property
+    def model(self):
+        return self.get_queryset().model
+
+    def get_create_defaults(self):
+        """Values given to every created row, e.g. the parent from the URL"""
+        return {}
+
+    @property
+    def counted_fields(self):
+        """Fields of the model with dashboard counters"""
+        from dashboard.counters import TRACKED_FIELDS
+        return TRACKED_FIELDS.get(self.model._meta.label, [])
+
+    def count_values(self, instances, sign=1):
+        """``{(field, value): sign * rows}`` of the counted fields of ``instances``"""
+        deltas = Counter()
+        for instance in instances:
+            for field in self.counted_fields:
+                deltas[field, getattr(instance, field)] += sign
+        return deltas
+
+    def auto_now_values(self):
+        now = timezone.now()
+        return {field.name: now for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_bulk_serializer(request.data)
+        serializer.is_valid(raise_exception=True)
+        defaults = self.get_create_defaults()
+        with transaction.atomic():
+            created = self.model._default_manager.bulk_create(
+                [self.model(**attrs, **defaults) for attrs in serializer.validated_data], batch_size=BATCH_SIZE
+            )
+            self.bulk_written('create', len(created), self.count_values(created))
+        return Response({'created': len(created), 'ids': [obj.pk for obj in created]}, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.update_items(request.data)
+        return self.update_selected(request.data)
+
+    def update_items(self, data):
+        item_pks = [item.get('id') if isinstance(item, dict) else None for item in data]
+        instances = self.get_queryset().in_bulk([pk for pk in item_pks if isinstance(pk, int)])
+        serializer = self.get_bulk_serializer(data, partial=True, item_pks=item_pks, instances=instances)
+        serializer.is_valid(raise_exception=True)
+        changed, fields = {}, set()
+        touched = self.auto_now_values()
+        changed_pks = list(dict.fromkeys(item_pks))
+        deltas = self.count_values([instances[pk] for pk in changed_pks], sign=-1)
+        for pk, attrs in zip(item_pks, serializer.validated_data):
+            instance = changed.setdefault(pk, instances[pk])
+            for name, value in {**attrs, **touched}.items():
+                setattr(instance, name, value)
+            fields.update(attrs)
+        deltas.update(self.count_values(changed.values()))
+        with transaction.atomic():
+            if fields:
+                self.model._default_manager.bulk_update(
+                    changed.values(), fields=[*fields, *touched], batch_size=BATCH_SIZE
+                )
+            self.bulk_written('update', len(changed), deltas)
+        return Response({'updated': len(changed)})
+
+    def update_selected(self, data):
+        values = data.get('set') if isinstance(data, dict) else None
+        if not isinstance(values, dict) or not values:
+            raise ValidationError({'set': ['Expected an object of field values.']})
+        queryset = self.get_selected(data, allow_all=True)
+        serializer = self.get_bulk_serializer([values], partial=True)
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors[0])
+        attrs = serializer.validated_data[0]
+        unique = [name for name in serializer.unique_fields if serializer.child.fields[name].source in attrs]
+        if unique:
+            raise ValidationError({name: ['Cannot set a unique field on several rows.'] for name in unique})
+        with transaction.atomic():
+            deltas = Counter()
+            for field in (field for field in self.counted_fields if field in attrs):
+                for row in queryset.order_by().values(field).annotate(rows=Count('pk')):
+                    deltas[field, row[field]] -= row['rows']
+                    deltas[field, attrs[field]] += row['rows']
+            updated = queryset.update(**attrs, **self.auto_now_values())
+            self.bulk_written('update', updated, deltas)
+        return Response({'updated': updated})
+
+    def delete(self, request, *args, **kwargs):
+        queryset = self.get_selected(request.data)
+        with transaction.atomic():
+            _, deleted = queryset.delete()
+        return Response({'deleted': deleted.get(self.model._meta.label, 0)})
+
+    def get_selected(self, data, allow_all=False):
+        """Rows listed in ``ids``, or with ``all`` every row the filters select"""
+        if allow_all and isinstance(data, dict) and data.get('all') is True:
+            return self.filter_queryset(self.get_queryset())
+        ids = data.get('ids') if isinstance(data, dict) else None
+        if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) for pk in ids):
+            raise ValidationError({'ids': ['Expected a non-empty list of ids.']})
+        if len(ids) > bulk_max_items():
+            raise ValidationError({'ids': [f'Ensure this field has no more than {bulk_max_items()} elements.']})
+        return self.get_queryset().filter(pk__in=ids)
+
+    def bulk_written(self, action, count, counter_deltas):
+        """Do what the skipped save signals would have: audit, counters (``{(field, value): delta}``), public cache"""
+        from dashboard.audit import record_activity
+        from dashboard.counters import adjust
+        if not count:
+            return
+        label = self.model._meta.label
+        for (field, value), delta in counter_deltas.items():
+            if delta:
+                adjust(label, field, value, delta)
+        transaction.on_commit(lambda: bump_version(label))
+        verb = {'create': 'Created', 'update': 'Updated'}[action]
+        name = self.model._meta.verbose_name if count == 1 else self.model._meta.verbose_name_plural
+        record_activity(self.request, self.request.user, action,
+                        description=f'{verb} {count} {name} in bulk')
@@ -0,0 +1,93 @@
+"""
+Response cache for the public website endpoints.
+
+Cached responses are keyed on the view, the normalized query string and a
+version number per model the response is built from. Saving or deleting an
+instance of one of those models bumps its version, which makes every entry
+built from the old data unreachable without scanning the cache for keys.
+The bump waits for the transaction to commit: bumped earlier, a concurrent
+request could still read the old rows and cache them under the new version.
+"""
+import hashlib
+import time
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+VERSION_KEY = 'public-api:version:{}'
+
+
+def _new_version():
+    # Time based so a version key that was evicted never restarts at a value
+    # an older cache entry was built with
+    return time.time_ns()
+
+
+def model_versions(labels):
+    """Current version of each model label, fetched in one cache round-trip"""
+    keys = {label: VERSION_KEY.format(label) for label in labels}
+    stored = cache.get_many(keys.values())
+    versions = {}
+    for label, key in keys.items():
+        if key not in stored:
+            cache.add(key, _new_version(), timeout=None)
+            stored[key] = cache.get(key)
+        versions[label] = stored[key]
+    return versions
+
+
+def bump_version(label):
+    key = VERSION_KEY.format(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def normalized_query(request):
+    """Query parameters in a stable order, empty values dropped"""
+    items = []
+    for key in sorted(request.query_params):
+        values = sorted(value for value in request.query_params.getlist(key) if value != '')
+        if values:
+            items.append(f"{key}={','.join(values)}")
+    return '&'.join(items)
+
+
+def public_cache_key(request, labels):
+    versions = model_versions(labels)
+    version = '.'.join(str(versions[label]) for label in sorted(versions))
+    query = hashlib.md5(normalized_query(request).encode()).hexdigest()
+    return f'public-api:response:{request.get_host()}{request.path}:{version}:{query}'
+
+
+def public_cache_timeout():
+    return getattr(settings, 'PUBLIC_API_CACHE_TIMEOUT', 60 * 15)
+
+
+def connect_invalidation(label, ignore_fields=()):
+    """
+    Bump ``label``'s version whenever one of its instances changes.
+
+    Saves limited (via ``update_fields``) to ``ignore_fields`` are skipped,
+    for counters that no public response exposes.
+    """
+    model = apps.get_model(label)
+    ignore_fields = set(ignore_fields)
+
+    def on_save(sender, instance, update_fields=None, **kwargs):
+        if update_fields and set(update_fields) <= ignore_fields:
+            return
+        transaction.on_commit(lambda: bump_version(label))
+
+    def on_change(sender, **kwargs):
+        transaction.on_commit(lambda: bump_version(label))
+
+    uid = f'public-api-cache:{label}'
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=uid)
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(on_change, sender=field.remote_field.through,
+                            weak=False, dispatch_uid=f'{uid}:{field.name}')
@@ -0,0 +1,37 @@
+"""
+Django cache backends that count hits and misses for ``/metrics``.
+"""
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django.core.cache.backends.redis import RedisCache as BaseRedisCache
+from .metrics import metrics
+
+_missing = object()
+
+
+def record_lookups(hits, misses):
+    if hits:
+        metrics.inc('django_cache_requests_total', (('result', 'hit'),), hits)
+    if misses:
+        metrics.inc('django_cache_requests_total', (('result', 'miss'),), misses)
+
+
+class CacheStatsMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        if value is _missing:
+            record_lookups(0, 1)
+            return default
+        record_lookups(1, 0)
+        return value
+
+
+class LocMemCache(CacheStatsMixin, BaseLocMemCache):
+    """Local-memory cache; ``get_many`` is counted through ``get``"""
+
+
+class RedisCache(CacheStatsMixin, BaseRedisCache):
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_lookups(len(found), len(keys) - len(found))
+        return found
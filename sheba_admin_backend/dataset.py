@@ -0,0 +1,403 @@
+"""
+Synthetic dataset generation.
+
+``DatasetGenerator`` bulk-creates referentially consistent rows - users,
+clients with contacts, projects with assignees, tasks, blog posts, job
+postings with applications, activity logs and daily dashboard metrics - in
+chunks of ``BATCH_SIZE``, with values drawn from a ``random.Random`` so the
+same seed produces the same data. ``created_at`` / ``updated_at`` are
+spread over the last ``days`` instead of all being "now". ``SCALE`` gives
+the rows of each kind per unit of ``generate_dataset --scale``.
+
+``bulk_create`` sends no signals: ``finish()`` reconciles the dashboard
+counters and bumps the public cache version of the models written, which
+also rebuilds the public search index unless it is shared through a
+snapshot (then run ``build_search_snapshot``).
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max, OuterRef
+from django.utils import timezone
+from django.utils.text import slugify
+from careers.models import JobApplication, JobPosting
+from clients.models import Client, ClientContact
+from content.models import BlogPost
+from dashboard.counters import TRACKED_FIELDS, reconcile
+from dashboard.models import ActivityLog, DashboardMetric
+from dashboard.snapshots import backfill_metrics, save_metrics, snapshot_metrics
+from projects.models import Project, ProjectTask, count_subquery
+from .cache import bump_version
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+PASSWORD = 'password123'
+
+# Rows of each kind per unit of scale; ``metric_days`` is the days of dashboard metric history
+SCALE = {
+    'users': 20,
+    'clients': 1000,
+    'contacts': 2000,
+    'projects': 1000,
+    'tasks': 10_000,
+    'blog_posts': 500,
+    'jobs': 50,
+    'applications': 5000,
+    'activity_logs': 100_000,
+    'metric_days': 365,
+}
+
+FIRST_NAMES = ['Amina', 'Omar', 'Sara', 'Yusuf', 'Lena', 'David', 'Maria', 'Ahmed', 'Nadia', 'John',
+               'Fatima', 'Chen', 'Priya', 'Lucas', 'Hana', 'Samuel', 'Zara', 'Ali', 'Emma', 'Kofi']
+LAST_NAMES = ['Haile', 'Mensah', 'Tesfaye', 'Smith', 'Garcia', 'Khan', 'Osei', 'Kim', 'Silva', 'Bekele',
+              'Ahmed', 'Novak', 'Tadesse', 'Brown', 'Ibrahim', 'Rossi', 'Wang', 'Abebe', 'Okafor', 'Lee']
+COMPANY_WORDS = ['Blue', 'Nile', 'Summit', 'Green', 'Vertex', 'Horizon', 'Atlas', 'Bright', 'Cedar', 'Orbit',
+                 'Pioneer', 'Harbor', 'Quantum', 'Sahara', 'Lumen', 'Forge', 'Unity', 'Delta', 'Nova', 'Acacia']
+COMPANY_SUFFIXES = ['Solutions', 'Labs', 'Trading', 'Logistics', 'Health', 'Media', 'Foods', 'Capital',
+                    'Systems', 'Consulting']
+CITIES = ['Addis Ababa', 'Nairobi', 'Lagos', 'Accra', 'Cairo', 'Kigali', 'Dubai', 'London', 'Berlin', 'Toronto']
+POSITIONS = ['CEO', 'CTO', 'Product Manager', 'Marketing Lead', 'Operations Manager', 'Accountant', 'Designer']
+TECHNOLOGIES = ['Django', 'React', 'Vue.js', 'PostgreSQL', 'Redis', 'Docker', 'Flutter', 'Node.js',
+                'TypeScript', 'AWS', 'Tailwind CSS', 'Celery', 'Next.js', 'Kotlin', 'Swift']
+PROJECT_KINDS = ['Website', 'Mobile App', 'E-commerce Platform', 'CRM', 'Booking System', 'Dashboard',
+                 'API Integration', 'Inventory System', 'Learning Portal', 'Payment Gateway']
+TASK_VERBS = ['Design', 'Implement', 'Test', 'Review', 'Deploy', 'Document', 'Refactor', 'Optimize', 'Fix']
+TASK_OBJECTS = ['login page', 'checkout flow', 'database schema', 'REST API', 'admin dashboard', 'search',
+                'notifications', 'payment integration', 'user profile', 'reports', 'CI pipeline', 'landing page']
+LOGGED_MODELS = ['Project', 'Client', 'ProjectTask', 'BlogPost', 'JobApplication', 'ContactSubmission', 'User']
+BLOG_TOPICS = ['Django', 'React', 'API design', 'mobile apps', 'cloud costs', 'UX research', 'testing',
+               'PostgreSQL', 'remote teams', 'startups', 'security', 'accessibility', 'performance', 'DevOps']
+BLOG_FORMATS = ['A practical guide to {}', 'What we learned about {}', '{} in 2024', 'Getting started with {}',
+                'Five mistakes to avoid with {}', 'Why {} matters for your business']
+SENTENCE_WORDS = ['our', 'team', 'clients', 'project', 'data', 'users', 'design', 'build', 'faster', 'simple',
+                  'platform', 'release', 'quality', 'mobile', 'cloud', 'security', 'growth', 'feedback', 'launch',
+                  'scale', 'product', 'service', 'support', 'workflow', 'reliable', 'modern', 'business']
+JOB_TITLES = {
+    'engineering': ['Backend Developer', 'Frontend Developer', 'Mobile Developer', 'DevOps Engineer', 'QA Engineer'],
+    'design': ['UI/UX Designer', 'Product Designer', 'Graphic Designer'],
+    'marketing': ['Digital Marketing Specialist', 'Content Writer', 'SEO Specialist'],
+    'sales': ['Account Executive', 'Business Development Manager'],
+    'hr': ['HR Officer', 'Talent Acquisition Specialist'],
+    'finance': ['Accountant', 'Financial Analyst'],
+    'operations': ['Project Manager', 'Operations Coordinator'],
+}
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let ``bulk_create`` keep the given ``auto_now`` / ``auto_now_add`` values of ``model``"""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class DatasetGenerator:
+    """Bulk-create synthetic rows; every method returns the primary keys it created"""
+
+    def __init__(self, seed=None, batch_size=BATCH_SIZE, days=365, log=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.now = timezone.now()
+        self.log = log or (lambda message: None)
+        # Model label -> rows created
+        self.created = {}
+
+    def timestamp(self, after=None):
+        """A moment in the last ``days``, or between ``after`` and now"""
+        start = after or self.now - timedelta(days=self.days)
+        return start + (self.now - start) * self.random.random()
+
+    def choice(self, choices, weights=None):
+        """A value of a model ``choices`` list"""
+        return self.random.choices([value for value, _ in choices], weights)[0]
+
+    def person(self):
+        return self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+
+    def phone(self):
+        return f'+2519{self.random.randrange(10 ** 8):08d}'
+
+    def paragraph(self, sentences=4):
+        words = SENTENCE_WORDS
+        return ' '.join(
+            ' '.join(self.random.choices(words, k=self.random.randint(6, 14))).capitalize() + '.'
+            for _ in range(sentences)
+        )
+
+    def create(self, model, objects, keep_pks=True):
+        """``bulk_create`` the ``objects`` iterable in chunks; returns the new primary keys"""
+        pks, count = [], 0
+        with explicit_timestamps(model):
+            for chunk in chunked(objects, self.batch_size):
+                created = model._default_manager.bulk_create(chunk)
+                count += len(created)
+                if keep_pks:
+                    pks.extend(obj.pk for obj in created)
+        if keep_pks and pks and pks[0] is None:
+            # The backend does not return ids from bulk inserts
+            pks = list(model._default_manager.order_by('-pk').values_list('pk', flat=True)[:count])[::-1]
+        label = model._meta.label
+        self.created[label] = self.created.get(label, 0) + count
+        self.log(f'{label}: {count:,} rows')
+        return pks
+
+    @staticmethod
+    def next_number(model):
+        """Start of the numbers used to keep generated unique values apart from existing rows"""
+        return (model._default_manager.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+    def users(self, count):
+        password = make_password(PASSWORD)
+        start = self.next_number(User)
+        roles = User.ROLE_CHOICES
+
+        def rows():
+            for number in range(start, start + count):
+                first, last = self.person()
+                joined = self.timestamp()
+                yield User(
+                    username=f'user{number}', email=f'user{number}@example.com', password=password,
+                    first_name=first, last_name=last, role=self.choice(roles, [1, 3, 10, 6]),
+                    is_staff=False, date_joined=joined, created_at=joined, updated_at=self.timestamp(joined),
+                )
+        return self.create(User, rows())
+
+    def clients(self, count):
+        start = self.next_number(Client)
+        types = Client.TYPE_CHOICES
+
+        def rows():
+            for number in range(start, start + count):
+                company = f'{self.random.choice(COMPANY_WORDS)} {self.random.choice(COMPANY_SUFFIXES)}'
+                first, last = self.person()
+                created = self.timestamp()
+                yield Client(
+                    name=f'{first} {last}', email=f'client{number}@example.com',
+                    phone=self.phone(), company=company,
+                    website=f'https://{company.lower().replace(" ", "")}{number}.example.com',
+                    address=f'{self.random.randrange(1, 999)} Main Street, {self.random.choice(CITIES)}',
+                    client_type=self.choice(types, [3, 3, 4, 2, 1, 1]), contact_person=f'{first} {last}',
+                    is_active=self.random.random() < 0.8, created_at=created, updated_at=self.timestamp(created),
+                )
+        return self.create(Client, rows())
+
+    def contacts(self, count, client_pks):
+        def rows():
+            for _ in range(count):
+                first, last = self.person()
+                created = self.timestamp()
+                yield ClientContact(
+                    client_id=self.random.choice(client_pks), name=f'{first} {last}',
+                    email=f'{first}.{last}@example.com'.lower(), phone=self.phone(),
+                    position=self.random.choice(POSITIONS), is_primary=self.random.random() < 0.3,
+                    created_at=created, updated_at=created,
+                )
+        return self.create(ClientContact, rows())
+
+    def projects(self, count, client_pks, user_pks, max_assignees=4):
+        statuses = Project.STATUS_CHOICES
+        priorities = Project.PRIORITY_CHOICES
+
+        def rows():
+            for _ in range(count):
+                created = self.timestamp()
+                start = created.date() + timedelta(days=self.random.randrange(30))
+                status = self.choice(statuses, [2, 4, 2, 5, 1, 1])
+                end = start + timedelta(days=self.random.randrange(14, 365))
+                if status == 'completed':
+                    end = min(end, self.now.date())
+                yield Project(
+                    name=f'{self.random.choice(COMPANY_WORDS)} {self.random.choice(PROJECT_KINDS)}',
+                    description='Synthetic project generated for load testing.',
+                    client_id=self.random.choice(client_pks), status=status,
+                    priority=self.choice(priorities, [2, 5, 3, 1]), start_date=start,
+                    end_date=end,
+                    budget=self.random.randrange(1000, 200000), progress=100 if status == 'completed' else
+                    self.random.randrange(0, 100), technologies=self.random.sample(TECHNOLOGIES, 3),
+                    created_at=created, updated_at=self.timestamp(created),
+                )
+        pks = self.create(Project, rows())
+        if user_pks:
+            through = Project.assigned_to.through
+            self.create(through, (
+                through(project_id=project, user_id=user)
+                for project in pks
+                for user in self.random.sample(user_pks, min(len(user_pks), self.random.randint(1, max_assignees)))
+            ), keep_pks=False)
+        return pks
+
+    def tasks(self, count, project_pks, user_pks):
+        statuses = ProjectTask.STATUS_CHOICES
+
+        def rows():
+            for _ in range(count):
+                created = self.timestamp()
+                yield ProjectTask(
+                    project_id=self.random.choice(project_pks),
+                    title=f'{self.random.choice(TASK_VERBS)} {self.random.choice(TASK_OBJECTS)}',
+                    assigned_to_id=self.random.choice(user_pks) if user_pks and self.random.random() < 0.9 else None,
+                    status=self.choice(statuses, [3, 2, 1, 4]),
+                    due_date=created.date() + timedelta(days=self.random.randrange(1, 90)),
+                    estimated_hours=self.random.randrange(1, 80),
+                    created_at=created, updated_at=self.timestamp(created),
+                )
+        return self.create(ProjectTask, rows())
+
+    def blog_posts(self, count, user_pks):
+        start = self.next_number(BlogPost)
+        categories = BlogPost.CATEGORY_CHOICES
+
+        def rows():
+            for number in range(start, start + count):
+                title = self.random.choice(BLOG_FORMATS).format(self.random.choice(BLOG_TOPICS))
+                created = self.timestamp()
+                status = self.choice(BlogPost.STATUS_CHOICES, [2, 7, 1])
+                content = '\n\n'.join(self.paragraph() for _ in range(self.random.randint(3, 8)))
+                yield BlogPost(
+                    title=title, slug=f'{slugify(title)}-{number}', content=content, excerpt=content[:200],
+                    author_id=self.random.choice(user_pks), category=self.choice(categories), status=status,
+                    views=self.random.randrange(5000) if status == 'published' else 0,
+                    published_at=self.timestamp(created) if status != 'draft' else None,
+                    created_at=created, updated_at=self.timestamp(created),
+                )
+        return self.create(BlogPost, rows())
+
+    def jobs(self, count, user_pks):
+        start = self.next_number(JobPosting)
+
+        def rows():
+            for number in range(start, start + count):
+                department = self.choice(JobPosting.DEPARTMENT_CHOICES)
+                title = self.random.choice(JOB_TITLES[department])
+                created = self.timestamp()
+                status = self.choice(JobPosting.STATUS_CHOICES, [1, 5, 3, 1])
+                salary = self.random.randrange(15, 120) * 1000
+                yield JobPosting(
+                    title=title, slug=f'{slugify(title)}-{number}', department=department,
+                    location=self.random.choice(CITIES), job_type=self.choice(JobPosting.TYPE_CHOICES, [6, 1, 2, 1, 2]),
+                    experience_level=self.choice(JobPosting.EXPERIENCE_CHOICES), description=self.paragraph(6),
+                    requirements=[self.paragraph(1) for _ in range(4)],
+                    responsibilities=[self.paragraph(1) for _ in range(4)],
+                    benefits=['Health insurance', 'Flexible hours', 'Training budget'],
+                    salary_min=salary, salary_max=salary * 3 // 2, status=status,
+                    posted_by_id=self.random.choice(user_pks),
+                    application_deadline=created.date() + timedelta(days=self.random.randrange(14, 60)),
+                    views=self.random.randrange(3000) if status != 'draft' else 0,
+                    published_at=created if status != 'draft' else None,
+                    created_at=created, updated_at=self.timestamp(created),
+                )
+        return self.create(JobPosting, rows())
+
+    def applications(self, count, job_pks):
+        start = self.next_number(JobApplication)
+
+        def rows():
+            for number in range(start, start + count):
+                first, last = self.person()
+                submitted = self.timestamp()
+                yield JobApplication(
+                    job_id=self.random.choice(job_pks), first_name=first, last_name=last,
+                    email=f'{first}.{last}.{number}@example.com'.lower(), phone=self.phone(),
+                    cover_letter=self.paragraph(5), years_of_experience=self.random.randrange(0, 15),
+                    current_position=self.random.choice(POSITIONS),
+                    status=self.choice(JobApplication.STATUS_CHOICES, [6, 3, 2, 1, 4, 1]),
+                    submitted_at=submitted, updated_at=self.timestamp(submitted),
+                )
+        pks = self.create(JobApplication, rows())
+        # Denormalized on the posting and not kept current by signals
+        JobPosting.objects.filter(pk__in=set(job_pks)).update(applications_count=count_subquery(
+            JobApplication.objects.filter(job=OuterRef('pk')), 'job'
+        ))
+        return pks
+
+    def metrics(self, days):
+        """
+        Daily dashboard metrics for the last ``days``: reconstructed from the
+        generated rows where a metric has a source table, random otherwise
+        """
+        today = timezone.localdate(self.now)
+        rows = backfill_metrics(today - timedelta(days=days)) + snapshot_metrics(today)
+        visitors = {}
+        for offset in range(days, -1, -1):
+            day = today - timedelta(days=offset)
+            visitors['website_visitors', day] = self.random.randrange(200, 2000) * (2 if day.weekday() < 5 else 1)
+        save_metrics(visitors)
+        rows += len(visitors)
+        label = DashboardMetric._meta.label
+        self.created[label] = self.created.get(label, 0) + rows
+        self.log(f'{label}: {rows:,} rows')
+
+    def activity_logs(self, count, user_pks):
+        actions = ActivityLog.ACTION_TYPES
+
+        def rows():
+            for _ in range(count):
+                action = self.choice(actions, [3, 5, 1, 2, 1, 4])
+                model_name = '' if action in ('login', 'logout') else self.random.choice(LOGGED_MODELS)
+                yield ActivityLog(
+                    user_id=self.random.choice(user_pks), action=action, model_name=model_name,
+                    object_id=self.random.randrange(1, 100000) if model_name else None,
+                    description=f'{action.title()} {model_name}'.strip(),
+                    ip_address=f'10.{self.random.randrange(256)}.{self.random.randrange(256)}.{self.random.randrange(1, 255)}',
+                    user_agent=self.random.choice(USER_AGENTS), created_at=self.timestamp(),
+                )
+        return self.create(ActivityLog, rows(), keep_pks=False)
+
+    def generate(self, users=0, clients=0, contacts=0, projects=0, tasks=0, blog_posts=0, jobs=0,
+                 applications=0, activity_logs=0, metric_days=0):
+        """Create every kind of row, parents first; returns the rows created per model"""
+        user_pks = self.users(users) if users else []
+        client_pks = self.clients(clients) if clients else []
+        if contacts and client_pks:
+            self.contacts(contacts, client_pks)
+        project_pks = self.projects(projects, client_pks, user_pks) if projects and client_pks else []
+        if tasks and project_pks:
+            self.tasks(tasks, project_pks, user_pks)
+        if blog_posts and user_pks:
+            self.blog_posts(blog_posts, user_pks)
+        job_pks = self.jobs(jobs, user_pks) if jobs and user_pks else []
+        if applications and job_pks:
+            self.applications(applications, job_pks)
+        if activity_logs and user_pks:
+            self.activity_logs(activity_logs, user_pks)
+        self.finish()
+        if metric_days:
+            # After finish(): the metrics are computed from the reconciled counters
+            self.metrics(metric_days)
+        return self.created
+
+    def finish(self):
+        """Do what the skipped save signals would have: counters and public cache"""
+        for label in self.created:
+            if label in TRACKED_FIELDS:
+                reconcile(label)
+            transaction.on_commit(lambda label=label: bump_version(label))
+
+
+def scaled_counts(scale):
+    """``DatasetGenerator.generate`` arguments for ``scale`` times ``SCALE``, at least one of each"""
+    return {kind: max(round(count * scale), 1) for kind, count in SCALE.items()}
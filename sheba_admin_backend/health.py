@@ -0,0 +1,196 @@
+"""
+Health checks for load balancers, orchestration and on-call.
+
+``/health/live/`` answers without touching the database or cache: the
+process is up and serving. ``/health/ready/`` times a ``SELECT 1``, a cache
+round-trip, the free space on the media and static volumes and checks for
+unapplied migrations; it answers 503 when one of them fails. Check results
+are kept for ``HEALTH_CHECK_CACHE_SECONDS`` per process (one thread runs
+them, concurrent probes reuse the result), so probes cannot become load.
+
+``process_metrics`` and ``system_metrics`` read ``/proc`` for the admin
+health report; values that are not available on the platform are ``None``.
+"""
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.response import Response
+
+CACHE_PROBE_KEY = 'health:probe'
+
+_lock = threading.Lock()
+_results = {'checked_at': None, 'checks': None}
+_migrations_applied = False
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as exc:
+        result = {'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+    result['ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def check_database():
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    return {'ok': True}
+
+
+def check_cache():
+    token = f'{os.getpid()}:{time.time_ns()}'
+    cache.set(CACHE_PROBE_KEY, token, 10)
+    ok = cache.get(CACHE_PROBE_KEY) == token
+    return {'ok': ok} if ok else {'ok': False, 'error': 'Cache did not return the value just stored'}
+
+
+def _free_megabytes(path):
+    path = Path(path)
+    # The directory may not have been created yet; measure its volume
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return shutil.disk_usage(path).free // 2 ** 20
+
+
+def check_disk():
+    minimum = getattr(settings, 'HEALTH_MIN_FREE_DISK_MB', 100)
+    free = {name: _free_megabytes(path) for name, path in
+            (('media', settings.MEDIA_ROOT), ('static', settings.STATIC_ROOT))}
+    return {'ok': all(megabytes >= minimum for megabytes in free.values()), 'free_mb': free}
+
+
+def check_migrations():
+    """Unapplied migrations; once everything is applied the process stops looking"""
+    global _migrations_applied
+    if _migrations_applied:
+        return {'ok': True, 'unapplied': 0}
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    unapplied = len(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+    _migrations_applied = not unapplied
+    return {'ok': not unapplied, 'unapplied': unapplied}
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'disk': check_disk,
+    'migrations': check_migrations,
+}
+
+
+def run_checks():
+    """Results of every check, at most ``HEALTH_CHECK_CACHE_SECONDS`` old"""
+    ttl = getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5)
+    with _lock:
+        checked_at = _results['checked_at']
+        if checked_at is None or time.monotonic() - checked_at >= ttl:
+            _results['checks'] = {name: _timed(check) for name, check in CHECKS.items()}
+            _results['checked_at'] = time.monotonic()
+        return _results['checks']
+
+
+def reset():
+    global _migrations_applied
+    with _lock:
+        _results['checked_at'] = None
+        _migrations_applied = False
+
+
+def _read(path):
+    try:
+        with open(path) as proc_file:
+            return proc_file.read()
+    except OSError:
+        return None
+
+
+def _proc_fields(text):
+    """``{name: first number}`` of a ``/proc`` key-value file (``VmRSS:  1234 kB``)"""
+    fields = {}
+    for line in (text or '').splitlines():
+        name, _, value = line.partition(':')
+        if value.split() and value.split()[0].isdigit():
+            fields[name] = int(value.split()[0])
+    return fields
+
+
+def process_metrics():
+    """RSS, CPU time, threads, file descriptors, DB connections and uptime of this process"""
+    times = os.times()
+    metrics = {
+        'pid': os.getpid(),
+        'cpu_seconds': round(times.user + times.system, 2),
+        'rss_mb': None,
+        'threads': threading.active_count(),
+        'open_files': None,
+        'db_connections': sum(1 for connection in connections.all() if connection.connection is not None),
+        'uptime_seconds': None,
+    }
+    status_fields = _proc_fields(_read('/proc/self/status'))
+    if 'VmRSS' in status_fields:
+        metrics['rss_mb'] = round(status_fields['VmRSS'] / 1024, 1)
+    if 'Threads' in status_fields:
+        metrics['threads'] = status_fields['Threads']
+    if os.path.isdir('/proc/self/fd'):
+        metrics['open_files'] = len(os.listdir('/proc/self/fd'))
+    stat, uptime = _read('/proc/self/stat'), _read('/proc/uptime')
+    if stat and uptime:
+        # Fields after the parenthesised command; starttime is field 22 of stat(5)
+        started = int(stat.rsplit(')', 1)[1].split()[19]) / os.sysconf('SC_CLK_TCK')
+        metrics['uptime_seconds'] = round(float(uptime.split()[0]) - started)
+    return metrics
+
+
+def system_metrics():
+    """Memory and load of the host (or container)"""
+    memory = _proc_fields(_read('/proc/meminfo'))
+    metrics = {'cpu_count': os.cpu_count(), 'load_average': None, 'memory_total_mb': None, 'memory_used_percent': None}
+    if hasattr(os, 'getloadavg'):
+        metrics['load_average'] = [round(load, 2) for load in os.getloadavg()]
+    if memory.get('MemTotal') and 'MemAvailable' in memory:
+        metrics['memory_total_mb'] = memory['MemTotal'] // 1024
+        metrics['memory_used_percent'] = round(100 * (1 - memory['MemAvailable'] / memory['MemTotal']), 1)
+    return metrics
+
+
+def database_connections():
+    """Connections open to the database server from all clients, where the backend reports it"""
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()')
+        return cursor.fetchone()[0]
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def liveness(request):
+    """The process is serving requests"""
+    return Response({'status': 'ok'})
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def readiness(request):
+    """Dependencies are reachable; 503 when any check fails (details are in the admin report)"""
+    checks = run_checks()
+    ready = all(check['ok'] for check in checks.values())
+    return Response(
+        {'status': 'ok' if ready else 'unavailable',
+         'checks': {name: {'ok': check['ok'], 'ms': check['ms']} for name, check in checks.items()}},
+        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
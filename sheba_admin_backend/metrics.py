@@ -0,0 +1,271 @@
+"""
+Prometheus metrics.
+
+``MetricsMiddleware`` records, for every request, its latency, request and
+response bytes and number of SQL queries per route; the cache backends in
+``sheba_admin_backend.cache_backends`` count cache hits and misses. The hot
+path only adds to in-memory counters under a lock.
+
+Every worker process keeps its own counters. With ``METRICS_DIR`` set, a
+background thread writes them to ``<pid>-<start time>.json`` in that
+directory every ``METRICS_FLUSH_SECONDS`` (and at exit), and ``/metrics``
+adds up the files of all workers - the answering worker's own counters are
+read live - so the numbers are correct whichever gunicorn worker is scraped.
+The start time keeps a worker that reuses a dead worker's pid from
+overwriting its totals. Without ``METRICS_DIR`` only the answering process
+is reported. Clear the directory when the whole server is restarted.
+
+Table row counts are read at scrape time from the dashboard's status
+counters (one query).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from .export import ExportRenderer
+from .profiling import route_key
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+QUERY_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100, 200]
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by route.', DURATION_BUCKETS),
+    'http_request_size_bytes_total': ('counter', 'Request body bytes received by route.', None),
+    'http_response_size_bytes_total': ('counter', 'Response body bytes sent by route.', None),
+    'http_request_db_queries': ('histogram', 'SQL queries per request by route.', QUERY_BUCKETS),
+    'django_cache_requests_total': ('counter', 'Cache lookups by result (hit or miss).', None),
+}
+
+
+class MetricsStore:
+    """Counters and histograms of this process, shared with the others through ``METRICS_DIR``"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        # (name, labels) -> bucket counts (not cumulative, last is +Inf) followed by the sum
+        self.histograms = {}
+        self.thread = None
+        self.pid = None
+        # (pid, file stem) of the process the snapshot file belongs to
+        self.process = None
+
+    def inc(self, name, labels, amount=1):
+        with self.lock:
+            self.counters[name, labels] += amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        with self.lock:
+            series = self.histograms.get((name, labels))
+            if series is None:
+                series = self.histograms[name, labels] = [0] * (len(buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, labels, list(series)] for (name, labels), series in self.histograms.items()],
+            }
+
+    @staticmethod
+    def directory():
+        directory = getattr(settings, 'METRICS_DIR', None)
+        return Path(directory) if directory else None
+
+    def name(self):
+        """Snapshot file stem of this process, set again in a forked worker"""
+        pid = os.getpid()
+        if self.process is None or self.process[0] != pid:
+            self.process = (pid, f'{pid}-{time.time_ns()}')
+        return self.process[1]
+
+    def start(self):
+        """Start the flushing thread, again in a forked worker"""
+        if self.directory() is None or (self.pid == os.getpid() and self.thread.is_alive()):
+            return
+        with self.lock:
+            if self.pid != os.getpid() or not self.thread.is_alive():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(getattr(settings, 'METRICS_FLUSH_SECONDS', 5))
+            self.flush()
+
+    def flush(self):
+        directory = self.directory()
+        if directory is None:
+            return
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f'{self.name()}.json'
+            temporary = path.with_name(f'{path.name}.tmp')
+            temporary.write_text(json.dumps(self.snapshot()))
+            os.replace(temporary, path)
+        except OSError:
+            logger.exception('Could not write metrics to %s', directory)
+
+    def collect(self):
+        """Counters and histograms of every process"""
+        snapshots = [self.snapshot()]
+        directory = self.directory()
+        if directory is not None and directory.is_dir():
+            name = self.name()
+            for path in directory.glob('*.json'):
+                if path.stem != name:
+                    try:
+                        snapshots.append(json.loads(path.read_text()))
+                    except (OSError, ValueError):
+                        continue
+        counters, histograms = defaultdict(float), {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                counters[name, tuple(map(tuple, labels))] += value
+            for name, labels, series in snapshot['histograms']:
+                total = histograms.setdefault((name, tuple(map(tuple, labels))), [0] * len(series))
+                histograms[name, tuple(map(tuple, labels))] = [a + b for a, b in zip(total, series)]
+        return counters, histograms
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+metrics = MetricsStore()
+atexit.register(metrics.flush)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def row_counts():
+    """``[(labels, rows)]`` per tracked model and counted field value, from the status counters"""
+    from dashboard.counters import TRACKED_FIELDS, read_counters
+    rows = []
+    for (label, field), values in sorted(read_counters().items()):
+        if label in TRACKED_FIELDS:
+            for value, count in sorted(values.items()):
+                rows.append(((('model', label), ('field', field), ('value', value)), count))
+    return rows
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    counters, histograms = metrics.collect()
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+            continue
+        for (metric, labels), series in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, '+Inf'], series[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(series[-1])}')
+            lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+    lines += ['# HELP table_rows Rows per counted field value of the tracked tables.', '# TYPE table_rows gauge']
+    lines += [f'table_rows{_labels(labels)} {count}' for labels, count in row_counts()]
+    return '\n'.join(lines) + '\n'
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` counting the statements of one request"""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def _counted(content, labels):
+    """Stream ``content`` and count its bytes once it has been sent"""
+    sent = 0
+    try:
+        for chunk in content:
+            sent += len(chunk)
+            yield chunk
+    finally:
+        metrics.inc('http_response_size_bytes_total', labels, sent)
+
+
+class MetricsMiddleware:
+    """Record latency, bytes and SQL queries of every request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics.start()
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        method, route = route_key(request)
+        labels = (('method', method), ('route', route))
+        metrics.observe('http_request_duration_seconds', (*labels, ('status', response.status_code)), duration)
+        metrics.observe('http_request_db_queries', labels, counter.queries)
+        metrics.inc('http_request_size_bytes_total', labels, int(request.META.get('CONTENT_LENGTH') or 0))
+        if response.streaming:
+            response.streaming_content = _counted(response.streaming_content, labels)
+        else:
+            metrics.inc('http_response_size_bytes_total', labels, len(response.content))
+        return response
+
+
+class PrometheusRenderer(ExportRenderer):
+    """Admits ``text/plain`` scrapes through content negotiation"""
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, permissions.IsAdminUser])
+@renderer_classes([PrometheusRenderer])
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,132 @@
+"""
+View mixins shared by the app API views.
+"""
+import hashlib
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from .cache import public_cache_key, public_cache_timeout
+from .serializers import requested_fields, deferrable_columns
+
+
+class SparseFieldsetMixin:
+    """Defer the columns a ``?fields=`` response will not serialize"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS and requested_fields(self.request):
+            columns = deferrable_columns(self.get_serializer())
+            if columns:
+                queryset = queryset.defer(*columns)
+        return queryset
+
+
+class PublicCacheMixin:
+    """
+    Cache list responses per normalized query string.
+
+    ``cache_models`` lists every model label the response is built from;
+    the entry is invalidated when any of them changes (see
+    ``sheba_admin_backend.cache``). ETag / Last-Modified headers are cached
+    with the payload so cache hits still answer conditional requests.
+    """
+    cache_models = []
+    cached_headers = ('ETag', 'Last-Modified')
+
+    def list(self, request, *args, **kwargs):
+        key = public_cache_key(request, self.cache_models)
+        cached = cache.get(key)
+        if cached is not None:
+            headers = cached['headers']
+            not_modified = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+            )
+            return not_modified or Response(cached['data'], headers=headers)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {name: response[name] for name in self.cached_headers if response.has_header(name)}
+            cache.set(key, {'data': response.data, 'headers': headers}, public_cache_timeout())
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for list and detail responses.
+
+    Validators come from ``Max`` of the ``validator_fields`` plus the row
+    count of the filtered queryset (or of the single instance), so a
+    matching ``If-None-Match`` / ``If-Modified-Since`` gets a 304 without
+    serializing anything. Add related ``updated_at`` paths to
+    ``validator_fields`` when the payload embeds related rows; the number
+    of related rows on each path is counted too, so deleting one changes
+    the ETag.
+
+    ``Last-Modified`` is only sent for a single row without related paths:
+    a list's latest timestamp cannot show that a row was deleted, nor can a
+    row's own timestamp show that its related rows changed.
+
+    Keyset pages (see ``OptionalCursorPagination``) get no validators: they
+    exist to avoid scanning the whole filtered table, which the aggregate
+    would do.
+    """
+    validator_fields = ['updated_at']
+
+    def get_validators(self, queryset):
+        """Return ``(etag, last_modified)`` for the rows in ``queryset``"""
+        queryset = queryset.order_by()
+        if queryset.query.annotations:
+            # Don't evaluate per-row annotations just to aggregate
+            queryset = queryset.model._default_manager.filter(pk__in=queryset.values('pk'))
+        joins = any('__' in field for field in self.validator_fields)
+        aggregates = {'count': Count('pk', distinct=joins)}
+        for index, field in enumerate(self.validator_fields):
+            aggregates[f'last_{index}'] = Max(field)
+            if '__' in field:
+                aggregates[f'rows_{index}'] = Count(field.rsplit('__', 1)[0], distinct=True)
+        return self.make_validators(queryset.aggregate(**aggregates))
+
+    def make_validators(self, state):
+        timestamps = [value for value in state.values() if hasattr(value, 'timestamp')]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        parts = [self.request.get_full_path()] + [str(state[name]) for name in sorted(state)]
+        return hashlib.md5('|'.join(parts).encode()).hexdigest(), last_modified
+
+    def conditional_response(self, validators, respond):
+        etag, last_modified = validators
+        not_modified = get_conditional_response(
+            self.request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+        response = respond()
+        if response.status_code == 200:
+            response['ETag'] = quote_etag(etag)
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        uses_keyset = getattr(self.paginator, 'uses_keyset', None)
+        if uses_keyset is not None and uses_keyset(request):
+            return super().list(request, *args, **kwargs)
+        etag, _ = self.get_validators(self.filter_queryset(self.get_queryset()))
+        return self.conditional_response(
+            (etag, None), lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if any('__' in field for field in self.validator_fields):
+            etag, _ = self.get_validators(self.get_queryset().filter(pk=instance.pk))
+            validators = (etag, None)
+        else:
+            validators = self.make_validators({
+                'count': 1,
+                **{f'last_{index}': getattr(instance, field) for index, field in enumerate(self.validator_fields)}
+            })
+        return self.conditional_response(validators, lambda: Response(self.get_serializer(instance).data))
@@ -0,0 +1,39 @@
+"""
+Pagination for the high-volume, append-only list endpoints.
+
+Page numbers stay the default. ``?pagination=cursor`` switches to keyset
+pagination over the view's ``cursor_ordering`` (a timestamp plus ``id``,
+backed by a composite index): no ``COUNT(*)`` and no ``OFFSET``, so a deep
+page costs the same as the first. The ``next`` / ``previous`` links carry an
+opaque ``cursor`` parameter; ``?ordering=`` does not apply in this mode.
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """Page numbers, or keyset pagination when ``?pagination=cursor`` or a ``cursor`` is given"""
+    mode_query_param = 'pagination'
+
+    def uses_keyset(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'cursor'
+                or KeysetPagination.cursor_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.uses_keyset(request):
+            self.keyset = KeysetPagination(view.cursor_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,267 @@
+"""
+Per-request profiling.
+
+``RequestProfilingMiddleware`` profiles a request when ``REQUEST_PROFILING``
+is on, when ``REQUEST_PROFILING_SAMPLE_RATE`` picks it, or when a staff user
+(or anyone under ``DEBUG``) sends an ``X-Profile`` header. A profile counts
+and times the SQL of every database connection through
+``connection.execute_wrapper``, finds statements repeated with only their
+parameters changed (the N+1 pattern), times the app serializers (see
+``timed_representation``) and measures the response body. Unprofiled
+requests are only timed.
+
+Profiles are added to ``route_profiles``: per-minute totals per route and
+method (latency histogram, queries, SQL, serializer and byte totals,
+repeated statements) over the last ``REQUEST_PROFILING_WINDOW_MINUTES``,
+kept by each worker process and reported by the ``system/profile/``
+endpoint. Requests slower than ``REQUEST_PROFILING_SLOW_MS`` are logged.
+``X-Profile`` requests get their numbers back in ``X-Profile-*`` response
+headers.
+"""
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+# Repeated statements reported per route
+REPEATED_LIMIT = 5
+PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)*\s*%s\s*\)')
+
+current_profile = ContextVar('request_profile', default=None)
+
+
+def fingerprint(sql):
+    """The statement with placeholder lists collapsed, so ``IN`` lists of any length compare equal"""
+    return PLACEHOLDER_LIST.sub('(...)', sql)
+
+
+class RequestProfile:
+    """SQL and serializer totals of one request; used as a ``connection.execute_wrapper``"""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.statements = Counter()
+        self._serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[fingerprint(sql)] += 1
+
+    def repeated(self):
+        """``{statement: executions}`` for the statements run more than once"""
+        return {sql: count for sql, count in self.statements.most_common() if count > 1}
+
+
+def timed_representation(to_representation, instance):
+    """
+    ``to_representation(instance)``, its time added to the profiled request's
+    serializer total; nested serializers count once. ``DynamicFieldsMixin``
+    routes the app serializers through here.
+    """
+    profile = current_profile.get()
+    if profile is None or profile._serializing:
+        return to_representation(instance)
+    profile._serializing = True
+    start = time.perf_counter()
+    try:
+        return to_representation(instance)
+    finally:
+        profile.serializer_time += time.perf_counter() - start
+        profile._serializing = False
+
+
+def is_staff_request(request):
+    """Whether the request's API credentials belong to a staff user, before any view authenticates it"""
+    authenticators = [authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    try:
+        return bool(getattr(Request(request, authenticators=authenticators).user, 'is_staff', False))
+    except APIException:
+        return False
+
+
+def _new_stats():
+    return {
+        'requests': 0, 'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1), 'time_ms': 0.0, 'max_ms': 0.0,
+        'queries': 0, 'max_queries': 0, 'sql_ms': 0.0, 'serializer_ms': 0.0, 'bytes': 0, 'repeated': Counter(),
+    }
+
+
+def _merge(total, stats):
+    for name in ('requests', 'time_ms', 'queries', 'sql_ms', 'serializer_ms', 'bytes'):
+        total[name] += stats[name]
+    total['max_ms'] = max(total['max_ms'], stats['max_ms'])
+    total['max_queries'] = max(total['max_queries'], stats['max_queries'])
+    total['histogram'] = [a + b for a, b in zip(total['histogram'], stats['histogram'])]
+    total['repeated'].update(stats['repeated'])
+
+
+def _percentile(histogram, requests, fraction, maximum):
+    """Upper bound of the bucket holding the ``fraction`` quantile (the maximum for the last bucket)"""
+    rank, seen = fraction * requests, 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+        seen += count
+        if seen >= rank:
+            return min(bound, maximum)
+    return maximum
+
+
+class RouteProfiles:
+    """Per-minute profile totals per ``(method, route)`` over a rolling window"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slots = deque()
+
+    @staticmethod
+    def window():
+        return getattr(settings, 'REQUEST_PROFILING_WINDOW_MINUTES', 15)
+
+    def _expire(self, minute):
+        while self.slots and self.slots[0][0] <= minute - self.window():
+            self.slots.popleft()
+
+    def add(self, key, duration_ms, profile, size):
+        minute = int(time.time() // 60)
+        bucket = next((index for index, bound in enumerate(LATENCY_BUCKETS_MS) if duration_ms <= bound),
+                      len(LATENCY_BUCKETS_MS))
+        with self.lock:
+            self._expire(minute)
+            if not self.slots or self.slots[-1][0] != minute:
+                self.slots.append((minute, {}))
+            stats = self.slots[-1][1].setdefault(key, _new_stats())
+            stats['requests'] += 1
+            stats['histogram'][bucket] += 1
+            stats['time_ms'] += duration_ms
+            stats['max_ms'] = max(stats['max_ms'], duration_ms)
+            stats['queries'] += profile.queries
+            stats['max_queries'] = max(stats['max_queries'], profile.queries)
+            stats['sql_ms'] += profile.sql_time * 1000
+            stats['serializer_ms'] += profile.serializer_time * 1000
+            stats['bytes'] += size or 0
+            stats['repeated'].update(profile.repeated())
+
+    def report(self):
+        """Window totals per route, slowest total time first"""
+        with self.lock:
+            self._expire(int(time.time() // 60))
+            totals = {}
+            for _, routes in self.slots:
+                for key, stats in routes.items():
+                    _merge(totals.setdefault(key, _new_stats()), stats)
+        routes = []
+        for (method, route), stats in sorted(totals.items(), key=lambda item: -item[1]['time_ms']):
+            requests = stats['requests']
+            routes.append({
+                'method': method,
+                'route': route,
+                'requests': requests,
+                'latency_ms': {
+                    'mean': round(stats['time_ms'] / requests, 2),
+                    'p50': _percentile(stats['histogram'], requests, 0.5, round(stats['max_ms'], 2)),
+                    'p95': _percentile(stats['histogram'], requests, 0.95, round(stats['max_ms'], 2)),
+                    'p99': _percentile(stats['histogram'], requests, 0.99, round(stats['max_ms'], 2)),
+                    'max': round(stats['max_ms'], 2),
+                    'histogram': dict(zip([*LATENCY_BUCKETS_MS, '+Inf'], stats['histogram'])),
+                },
+                'queries': {'mean': round(stats['queries'] / requests, 2), 'max': stats['max_queries']},
+                'sql_ms': round(stats['sql_ms'] / requests, 2),
+                'serializer_ms': round(stats['serializer_ms'] / requests, 2),
+                'bytes': round(stats['bytes'] / requests),
+                'repeated_queries': [
+                    {'sql': sql, 'executions': count} for sql, count in stats['repeated'].most_common(REPEATED_LIMIT)
+                ],
+            })
+        return {'pid': os.getpid(), 'window_minutes': self.window(), 'routes': routes}
+
+    def reset(self):
+        with self.lock:
+            self.slots.clear()
+
+
+route_profiles = RouteProfiles()
+
+
+def route_key(request):
+    match = getattr(request, 'resolver_match', None)
+    return request.method, match.route if match is not None else '<unresolved>'
+
+
+class RequestProfilingMiddleware:
+    """Profile sampled or ``X-Profile`` requests and log slow ones"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def profile_requested(self, request):
+        """``X-Profile`` sent by staff, or by anyone under ``DEBUG``"""
+        return bool(request.META.get(PROFILE_HEADER)) and (settings.DEBUG or is_staff_request(request))
+
+    def should_profile(self, request, requested):
+        if requested or getattr(settings, 'REQUEST_PROFILING', False):
+            return True
+        rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0)
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        requested = self.profile_requested(request)
+        if not self.should_profile(request, requested):
+            response = self.get_response(request)
+            self.log_slow(request, response, (time.perf_counter() - start) * 1000)
+            return response
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        duration = (time.perf_counter() - start) * 1000
+        size = None if response.streaming else len(response.content)
+        route_profiles.add(route_key(request), duration, profile, size)
+        self.log_slow(request, response, duration, profile, size)
+
+        if requested:
+            response['X-Profile-Time-Ms'] = f'{duration:.1f}'
+            response['X-Profile-Queries'] = profile.queries
+            response['X-Profile-SQL-Ms'] = f'{profile.sql_time * 1000:.1f}'
+            response['X-Profile-Repeated-Queries'] = sum(profile.repeated().values())
+            response['X-Profile-Serializer-Ms'] = f'{profile.serializer_time * 1000:.1f}'
+        return response
+
+    def log_slow(self, request, response, duration, profile=None, size=None):
+        threshold = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 1000)
+        if not threshold or duration < threshold:
+            return
+        details = ''
+        if profile is not None:
+            details = (f'; {profile.queries} queries in {profile.sql_time * 1000:.0f} ms'
+                       f' ({sum(profile.repeated().values())} repeated),'
+                       f' serializers {profile.serializer_time * 1000:.0f} ms, {size} bytes')
+        logger.warning('Slow request %s %s -> %s in %.0f ms%s', request.method, request.get_full_path(),
+                       response.status_code, duration, details)
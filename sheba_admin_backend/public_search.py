@@ -0,0 +1,374 @@
+"""
+In-process inverted index for the public blog and careers search.
+
+Published ``BlogPost`` and ``JobPosting`` text is tokenized, stemmed and kept
+in memory as ``array``-backed postings lists: per term, the document slots
+containing it and the weighted term frequency in each. ``?search=`` on the
+public list views is answered from the index with BM25 ranking over every
+match, and only the rows of the requested page are loaded, with one
+``in_bulk`` query, so anonymous searches never scan the text columns.
+
+Each process applies ``post_save`` / ``post_delete`` changes once their
+transaction commits. Without ``PUBLIC_SEARCH_SNAPSHOT_DIR``, every process
+keeps its own index, built from the database on first use, and also tracks
+the model's public cache version (see ``cache.py``), which every committed
+save or delete bumps by one. A version further ahead than the changes the
+process applied itself means another process (or a bulk write) changed rows
+it never saw, and only then is the index rebuilt. With Redis as the cache
+that version is shared, so every worker on every host notices every change.
+
+With ``PUBLIC_SEARCH_SNAPSHOT_DIR`` set, the index is written to a snapshot
+file there after every change and each process reloads the snapshot when it
+is newer than its copy, so the workers of one host share one index and only
+the first builds it. Queryset ``update()`` calls bypass the signals; run
+``manage.py build_search_snapshot`` after bulk changes.
+"""
+import fcntl
+import math
+import os
+import pickle
+import tempfile
+import threading
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from .cache import model_versions
+from .search import FullTextSearchFilter, search_words
+
+# The published rows of each model, and the weight of each field's terms
+PUBLIC_DOCUMENTS = {
+    'content.BlogPost': {
+        'filter': {'status': 'published'},
+        'fields': {'title': 3, 'excerpt': 2, 'content': 1},
+        'ignore_fields': ['views'],
+    },
+    'careers.JobPosting': {
+        'filter': {'status': 'published'},
+        'fields': {'title': 3, 'location': 2, 'description': 1},
+        'ignore_fields': ['views', 'applications_count'],
+    },
+}
+SNAPSHOT_FORMAT = 1
+
+
+def stem(word):
+    """Light suffix stripping: plurals, -ment, -ing and -ed"""
+    if len(word) <= 3:
+        return word
+    if word.endswith('ies') and not word.endswith(('aies', 'eies')):
+        word = word[:-3] + 'y'
+    elif word.endswith('es') and not word.endswith(('aes', 'ees', 'oes')):
+        word = word[:-1]
+    elif word.endswith('s') and not word.endswith(('us', 'ss')):
+        word = word[:-1]
+    if word.endswith('ment') and len(word) >= 8:
+        word = word[:-4]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    return [stem(word) for word in search_words(text)]
+
+
+class InvertedIndex:
+    """
+    BM25 over weighted fields. Removed documents only leave their slot
+    behind; the postings are compacted once dead slots outnumber live ones.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.pks = array('q')       # slot -> pk
+        self.lengths = array('I')   # slot -> weighted number of terms
+        self.slots = {}             # pk -> live slot
+        self.postings = {}          # term -> (slots, frequencies)
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _is_live(self, slot):
+        return self.slots.get(self.pks[slot]) == slot
+
+    def add(self, pk, values):
+        """Index ``values`` (field name -> text) as document ``pk``, replacing any previous version"""
+        self.remove(pk)
+        frequencies = Counter()
+        for name, weight in self.weights.items():
+            for term in tokenize(values.get(name) or ''):
+                frequencies[term] += weight
+        slot = len(self.pks)
+        length = sum(frequencies.values())
+        self.pks.append(pk)
+        self.lengths.append(length)
+        self.slots[pk] = slot
+        self.total_length += length
+        for term, frequency in frequencies.items():
+            slots, tfs = self.postings.setdefault(term, (array('I'), array('I')))
+            slots.append(slot)
+            tfs.append(frequency)
+
+    def remove(self, pk):
+        slot = self.slots.pop(pk, None)
+        if slot is None:
+            return
+        self.total_length -= self.lengths[slot]
+        if len(self.pks) > 2 * len(self.slots) + 64:
+            self.compact()
+
+    def compact(self):
+        """Drop dead slots from the postings and renumber the live ones"""
+        renumbered = {}
+        pks, lengths = array('q'), array('I')
+        for slot, pk in enumerate(self.pks):
+            if self._is_live(slot):
+                renumbered[slot] = len(pks)
+                pks.append(pk)
+                lengths.append(self.lengths[slot])
+        postings = {}
+        for term, (slots, tfs) in self.postings.items():
+            kept = [(renumbered[slot], tf) for slot, tf in zip(slots, tfs) if slot in renumbered]
+            if kept:
+                postings[term] = (array('I', [slot for slot, _ in kept]), array('I', [tf for _, tf in kept]))
+        self.pks, self.lengths, self.postings = pks, lengths, postings
+        self.slots = {pk: slot for slot, pk in enumerate(pks)}
+
+    def search(self, text):
+        """pks of all documents containing every term of ``text``, best match first"""
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms or not self.slots or any(term not in self.postings for term in terms):
+            return []
+        count = len(self.slots)
+        average = self.total_length / count or 1
+        scores = None
+        # Rarest term first, so later terms only score the remaining candidates
+        for slots, tfs in sorted((self.postings[term] for term in terms), key=lambda posting: len(posting[0])):
+            live = [(slot, tf) for slot, tf in zip(slots, tfs) if self._is_live(slot)]
+            idf = math.log(1 + (count - len(live) + 0.5) / (len(live) + 0.5))
+            matched = {}
+            for slot, tf in live:
+                if scores is None or slot in scores:
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[slot] / average)
+                    matched[slot] = (scores or {}).get(slot, 0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            if not matched:
+                return []
+            scores = matched
+        # Ties go to the newest document
+        ranked = sorted(scores.items(), key=lambda item: (item[1], self.pks[item[0]]), reverse=True)
+        return [self.pks[slot] for slot, _ in ranked]
+
+
+class PublicSearchIndex:
+    """One model's index of published documents, optionally shared through a snapshot file"""
+
+    def __init__(self, label):
+        self.label = label
+        self.document = PUBLIC_DOCUMENTS[label]
+        self.index = None
+        self.version = None
+        self.snapshot_stamp = None
+        self.lock = threading.RLock()
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    def snapshot_path(self):
+        directory = getattr(settings, 'PUBLIC_SEARCH_SNAPSHOT_DIR', None)
+        return Path(directory) / f'{self.label.lower()}.index' if directory else None
+
+    def is_published(self, instance):
+        return all(getattr(instance, name) == value for name, value in self.document['filter'].items())
+
+    def build(self):
+        index = InvertedIndex(self.document['fields'])
+        fields = list(self.document['fields'])
+        rows = self.model._default_manager.filter(**self.document['filter']).values_list('pk', *fields)
+        for pk, *values in rows.iterator(chunk_size=500):
+            index.add(pk, dict(zip(fields, values)))
+        return index
+
+    def shared_version(self):
+        return model_versions([self.label])[self.label]
+
+    def current(self):
+        """The up-to-date index: rebuilt after changes this process didn't apply, or reloaded from the snapshot"""
+        with self.lock:
+            path = self.snapshot_path()
+            if path is None:
+                # Read first: a change committed during the build leaves it outdated
+                version = self.shared_version()
+                if self.index is None or version != self.version:
+                    self.index, self.version = self.build(), version
+            elif self._stamp(path) is None or self._stamp(path) != self.snapshot_stamp:
+                with self._file_lock(path):
+                    self._sync(path)
+            return self.index
+
+    def update(self, pk, values):
+        """Index ``values`` as document ``pk``, or remove it when ``values`` is None"""
+        with self.lock:
+            path = self.snapshot_path()
+            if path is None:
+                if self.index is not None:
+                    self._apply(pk, values)
+                    # The version bump of the same commit, accounted for
+                    self.version += 1
+                return
+            with self._file_lock(path):
+                if self._stamp(path) is None:
+                    # Whoever searches first builds it from the database
+                    return
+                self._sync(path)
+                self._apply(pk, values)
+                self._write(path)
+
+    def rebuild(self):
+        """Build from the database, replacing the snapshot; returns the document count"""
+        with self.lock:
+            self.version = self.shared_version()
+            self.index = self.build()
+            path = self.snapshot_path()
+            if path is not None:
+                with self._file_lock(path):
+                    self._write(path)
+            return len(self.index)
+
+    def reset(self):
+        with self.lock:
+            self.index = None
+            self.version = None
+            self.snapshot_stamp = None
+
+    def _apply(self, pk, values):
+        if values is None:
+            self.index.remove(pk)
+        else:
+            self.index.add(pk, values)
+
+    @staticmethod
+    def _stamp(path):
+        # os.replace gives every snapshot a new inode
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    @contextmanager
+    def _file_lock(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{path}.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _sync(self, path):
+        """Load the snapshot if it changed, building it when missing or outdated (file lock held)"""
+        stamp = self._stamp(path)
+        if stamp is not None and stamp == self.snapshot_stamp:
+            return
+        if stamp is not None:
+            with open(path, 'rb') as snapshot:
+                version, weights, index = pickle.load(snapshot)
+            if version == SNAPSHOT_FORMAT and weights == self.document['fields']:
+                self.index, self.snapshot_stamp = index, stamp
+                return
+        self.index = self.build()
+        self._write(path)
+
+    def _write(self, path):
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, delete=False) as snapshot:
+            pickle.dump((SNAPSHOT_FORMAT, self.document['fields'], self.index), snapshot,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(snapshot.name, path)
+        self.snapshot_stamp = self._stamp(path)
+
+
+PUBLIC_INDEXES = {label: PublicSearchIndex(label) for label in PUBLIC_DOCUMENTS}
+
+
+def connect_public_search(label):
+    """Keep ``label``'s public index in step with committed saves and deletes"""
+    search_index = PUBLIC_INDEXES[label]
+    ignore_fields = set(search_index.document['ignore_fields'])
+    fields = list(search_index.document['fields'])
+
+    def on_save(sender, instance, update_fields=None, using=None, **kwargs):
+        if update_fields and set(update_fields) <= ignore_fields:
+            return
+        pk = instance.pk
+        values = {name: getattr(instance, name) for name in fields} if search_index.is_published(instance) else None
+        transaction.on_commit(lambda: search_index.update(pk, values), using=using)
+
+    def on_delete(sender, instance, using=None, **kwargs):
+        pk = instance.pk
+        transaction.on_commit(lambda: search_index.update(pk, None), using=using)
+
+    uid = f'public-search:{label}'
+    model = apps.get_model(label)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+class IndexedSearchFilter(FullTextSearchFilter):
+    """
+    ``?search=`` from the in-process index for the public documents; an
+    explicit ``?ordering=`` uses the database full-text search instead.
+    """
+
+    def ranked_pks(self, request, queryset, view):
+        """Matching pks in rank order (cached on the view), or None when the index doesn't apply"""
+        if not hasattr(view, '_ranked_pks'):
+            view._ranked_pks = None
+            search_index = PUBLIC_INDEXES.get(queryset.model._meta.label)
+            text = request.query_params.get(self.search_param, '')
+            if (search_index is not None and tokenize(text)
+                    and not request.query_params.get(api_settings.ORDERING_PARAM)):
+                view._ranked_pks = search_index.current().search(text)
+        return view._ranked_pks
+
+    def filter_queryset(self, request, queryset, view):
+        pks = self.ranked_pks(request, queryset, view)
+        if pks is None:
+            return super().filter_queryset(request, queryset, view)
+        return queryset.filter(pk__in=pks)
+
+
+class IndexedSearchMixin:
+    """List index searches in rank order, loading only the page's rows with ``in_bulk``"""
+
+    def list(self, request, *args, **kwargs):
+        if IndexedSearchFilter().ranked_pks(request, self.get_queryset(), self) is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        pks = self._ranked_pks
+        if any(request.query_params.get(name) for name in getattr(self, 'filterset_fields', [])):
+            matching = set(queryset.values_list('pk', flat=True))
+            pks = [pk for pk in pks if pk in matching]
+        page = self.paginate_queryset(pks)
+        page_pks = pks if page is None else page
+        rows = queryset.in_bulk(page_pks)
+        serializer = self.get_serializer([rows[pk] for pk in page_pks if pk in rows], many=True)
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
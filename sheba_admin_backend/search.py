@@ -0,0 +1,233 @@
+"""
+Full-text search for the large text columns.
+
+``SEARCH_DOCUMENTS`` lists the columns the list views of a model search. On
+PostgreSQL they are matched through a GIN index over their ``SearchVector``
+and ranked with ``SearchRank``; on SQLite through an external-content FTS5
+table kept in sync by triggers, joined once to the model table, and ranked
+with its bm25 ``rank`` column. Both are created by the
+``CreateSearchIndex`` migration operation and maintained by the database on
+every insert, update and delete.
+
+``FullTextSearchFilter`` routes ``?search=`` through the index when the view's
+``search_fields`` are exactly a registered document, and falls back to DRF's
+``icontains`` search otherwise. Terms match word prefixes, all terms must
+match. ``RankedOrderingFilter`` puts the best matches first unless the request
+asks for an ``?ordering=``.
+
+SQLite drops triggers when a migration rebuilds their table; searches then
+fall back to ``icontains`` until ``manage.py rebuild_search_index`` is run.
+"""
+import logging
+import re
+from django.apps import apps
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.migrations.operations.base import Operation
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DOCUMENTS = {
+    'content.BlogPost': ['title', 'content', 'excerpt'],
+    'communication.ContactSubmission': ['name', 'email', 'subject', 'message'],
+    'careers.JobPosting': ['title', 'description', 'location'],
+    'dashboard.ActivityLog': ['description', 'model_name'],
+    'settings_app.SystemLog': ['message', 'module'],
+}
+
+
+def search_words(text):
+    return re.findall(r'\w+', text.lower())
+
+
+class PostgresSearchBackend:
+    """GIN expression index over a weighted ``SearchVector``: the first field ranks highest"""
+    config = 'english'
+
+    def index_name(self, model):
+        return f'{model._meta.db_table[:24]}_fts'
+
+    def vector(self, fields):
+        vector = SearchVector(fields[0], weight='A', config=self.config)
+        if len(fields) > 1:
+            vector = vector + SearchVector(*fields[1:], weight='B', config=self.config)
+        return vector
+
+    def create_index(self, schema_editor, model, fields):
+        schema_editor.add_index(model, GinIndex(self.vector(fields), name=self.index_name(model)))
+
+    def drop_index(self, schema_editor, model, fields):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.index_name(model))}')
+
+    def is_available(self, model, connection):
+        return True
+
+    def search(self, queryset, fields, words):
+        query = SearchQuery(' & '.join(f'{word}:*' for word in words),
+                            search_type='raw', config=self.config)
+        vector = self.vector(fields)
+        return queryset.alias(search_vector=vector).filter(search_vector=query).annotate(
+            search_rank=SearchRank(vector, query)
+        )
+
+
+class SQLiteSearchBackend:
+    """External-content FTS5 table per model, synced by triggers on the model table"""
+    # Title-like first fields outrank body matches, as with weight 'A'
+    first_field_weight = 10.0
+
+    def __init__(self):
+        self._available = {}
+
+    def table(self, model):
+        return f'{model._meta.db_table}_fts'
+
+    def create_index(self, schema_editor, model, fields):
+        qn = schema_editor.quote_name
+        table, content = qn(self.table(model)), qn(model._meta.db_table)
+        pk = model._meta.pk.column
+        columns = [model._meta.get_field(name).column for name in fields]
+        names = ', '.join(qn(column) for column in columns)
+        new = ', '.join(f'new.{qn(column)}' for column in columns)
+        old = ', '.join(f'old.{qn(column)}' for column in columns)
+        delete_old = f"INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', old.{qn(pk)}, {old});"
+        insert_new = f"INSERT INTO {table}(rowid, {names}) VALUES (new.{qn(pk)}, {new});"
+
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {table} USING fts5({names}, content={content}, "
+            f"content_rowid={qn(pk)}, prefix='2 3')"
+        )
+        schema_editor.execute(f'CREATE TRIGGER {qn(self.table(model) + "_ai")} AFTER INSERT ON {content} '
+                              f'BEGIN {insert_new} END')
+        schema_editor.execute(f'CREATE TRIGGER {qn(self.table(model) + "_ad")} AFTER DELETE ON {content} '
+                              f'BEGIN {delete_old} END')
+        schema_editor.execute(f'CREATE TRIGGER {qn(self.table(model) + "_au")} AFTER UPDATE OF {names} '
+                              f'ON {content} BEGIN {delete_old} {insert_new} END')
+        weights = ', '.join(str(weight) for weight in [self.first_field_weight] + [1.0] * (len(fields) - 1))
+        schema_editor.execute(f"INSERT INTO {table}({table}, rank) VALUES ('rank', 'bm25({weights})')")
+        schema_editor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        self._available.pop(model._meta.label, None)
+
+    def drop_index(self, schema_editor, model, fields):
+        qn = schema_editor.quote_name
+        for suffix in ('_ai', '_ad', '_au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {qn(self.table(model) + suffix)}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {qn(self.table(model))}')
+        self._available.pop(model._meta.label, None)
+
+    def is_available(self, model, connection):
+        """The FTS table and its three triggers exist (checked once per process)"""
+        label = model._meta.label
+        if label not in self._available:
+            names = [self.table(model)] + [self.table(model) + suffix for suffix in ('_ai', '_ad', '_au')]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})",
+                    names
+                )
+                available = cursor.fetchone()[0] == len(names)
+            if not available:
+                logger.warning('Full-text index for %s is missing, run rebuild_search_index', label)
+            self._available[label] = available
+        return self._available[label]
+
+    def search(self, queryset, fields, words):
+        """Join the FTS table once: one MATCH, and bm25 negated so higher is better as on PostgreSQL"""
+        qn = connections[queryset.db].ops.quote_name
+        model = queryset.model
+        table = qn(self.table(model))
+        match = ' '.join(f'"{word}"*' for word in words)
+        # The ORM cannot join a table without a model; extra() adds it to FROM
+        return queryset.extra(
+            tables=[self.table(model)],
+            where=[f'{table}.rowid = {qn(model._meta.db_table)}.{qn(model._meta.pk.column)}', f'{table} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-{table}.rank'},
+        )
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend(),
+    'sqlite': SQLiteSearchBackend(),
+}
+
+
+def search_backend(model, fields=None, using='default'):
+    """The backend that can search ``fields`` of ``model``, or None"""
+    document = SEARCH_DOCUMENTS.get(model._meta.label)
+    if document is None or (fields is not None and set(fields) != set(document)):
+        return None
+    connection = connections[using]
+    backend = BACKENDS.get(connection.vendor)
+    if backend is None or not backend.is_available(model, connection):
+        return None
+    return backend
+
+
+class FullTextSearchFilter(SearchFilter):
+    """``?search=`` through the full-text index when the view searches a registered document"""
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        backend = search_backend(queryset.model, search_fields, queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+        words = search_words(request.query_params.get(self.search_param, ''))
+        if not words:
+            return queryset
+        return backend.search(queryset, SEARCH_DOCUMENTS[queryset.model._meta.label], words)
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """Best full-text matches first unless ``?ordering=`` is given"""
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        ranked = 'search_rank' in queryset.query.annotations or 'search_rank' in queryset.query.extra
+        if ranked and not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
+
+
+class CreateSearchIndex(Operation):
+    """Create the full-text index of ``fields`` for the database in use"""
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, model_name, fields):
+        self.model_name = model_name
+        self.fields = fields
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {'model_name': self.model_name, 'fields': self.fields}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        backend = BACKENDS.get(schema_editor.connection.vendor)
+        if backend is not None:
+            backend.create_index(schema_editor, to_state.apps.get_model(app_label, self.model_name), self.fields)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        backend = BACKENDS.get(schema_editor.connection.vendor)
+        if backend is not None:
+            backend.drop_index(schema_editor, from_state.apps.get_model(app_label, self.model_name), self.fields)
+
+    def describe(self):
+        return f'Create full-text search index on {self.model_name}'
+
+
+def rebuild_search_indexes(schema_editor, labels=None):
+    """Drop and recreate the full-text indexes of ``labels`` (default: all documents)"""
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is None:
+        return []
+    labels = labels or list(SEARCH_DOCUMENTS)
+    for label in labels:
+        model = apps.get_model(label)
+        backend.drop_index(schema_editor, model, SEARCH_DOCUMENTS[label])
+        backend.create_index(schema_editor, model, SEARCH_DOCUMENTS[label])
+    return labels
@@ -0,0 +1,82 @@
+"""
+Sparse fieldsets shared by the app serializers.
+
+``?fields=id,title`` limits a read response to the listed fields and
+``?expand=name`` replaces a compact field with the serializer declared for
+it in ``Meta.expandable_fields``. Serializer fields backed by properties or
+methods declare the model columns they read in ``Meta.field_sources`` so
+views can defer every other column.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from .profiling import timed_representation
+
+
+def query_param_list(request, name):
+    """Comma-separated values of a query parameter as a set"""
+    if request is None:
+        return set()
+    value = request.query_params.get(name, '')
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def requested_fields(request):
+    return query_param_list(request, 'fields')
+
+
+def requested_expansions(request):
+    return query_param_list(request, 'expand')
+
+
+class DynamicFieldsMixin:
+    """Apply ``?fields=`` and ``?expand=`` from the request in the serializer context"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in requested_expansions(request) & set(expandable):
+            self.fields[name] = expandable[name](read_only=True)
+
+        fields = requested_fields(request)
+        if fields and request.method in SAFE_METHODS:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        return timed_representation(super().to_representation, instance)
+
+
+def deferrable_columns(serializer):
+    """
+    Concrete columns of the serializer's model that none of its readable
+    fields use. Returns an empty list when a field reads an attribute whose
+    columns are unknown, so nothing is deferred that would be loaded lazily.
+    """
+    model = serializer.Meta.model
+    field_sources = getattr(serializer.Meta, 'field_sources', {})
+    needed = set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in field_sources:
+            needed.update(field_sources[name])
+            continue
+        if field.source == '*':
+            return []
+        attr = field.source.split('.')[0]
+        if attr.startswith('get_') and attr.endswith('_display'):
+            attr = attr[len('get_'):-len('_display')]
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return []
+        if model_field.concrete:
+            needed.add(model_field.name)
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and field.name not in needed
+    ]
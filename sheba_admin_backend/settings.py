@@ -60,6 +60,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'sheba_admin_backend.metrics.MetricsMiddleware',
+    'sheba_admin_backend.profiling.RequestProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -67,6 +69,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'dashboard.audit.AuditContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -239,6 +242,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'sheba_admin_backend.profiling': {
+            'handlers': ['console', 'file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
@@ -265,7 +273,7 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 # Cache Configuration
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'sheba_admin_backend.cache_backends.LocMemCache',
         'LOCATION': 'unique-snowflake',
         'TIMEOUT': 300,  # 5 minutes default timeout
         'OPTIONS': {
@@ -273,3 +281,62 @@ CACHES = {
         }
     }
 }
+
+# Use Redis when REDIS_URL is provided so all workers share one cache
+REDIS_URL = config('REDIS_URL', default=None)
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'sheba_admin_backend.cache_backends.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': 300,
+    }
+
+# Public website responses are invalidated by model signals, so they can
+# stay cached for longer than the default timeout
+PUBLIC_API_CACHE_TIMEOUT = config('PUBLIC_API_CACHE_TIMEOUT', default=60 * 15, cast=int)
+
+# Public view counts are buffered in the (shared, Redis) cache per slot of this
+# many seconds and written by the flush_view_counts command; with a per-process
+# cache each view is written straight away
+VIEW_COUNT_SLOT_SECONDS = config('VIEW_COUNT_SLOT_SECONDS', default=60, cast=int)
+
+# Directory for the public search index snapshots shared by the workers of
+# one host; unset, every process keeps its own index and rebuilds it when the
+# model's (shared, with Redis) public cache version shows changes made elsewhere
+PUBLIC_SEARCH_SNAPSHOT_DIR = config('PUBLIC_SEARCH_SNAPSHOT_DIR', default=None)
+
+# Activity log entries are written in the background, in batches of up to
+# AUDIT_LOG_BATCH_SIZE or every AUDIT_LOG_FLUSH_INTERVAL_MS; entries beyond
+# AUDIT_LOG_QUEUE_SIZE waiting to be written are dropped
+AUDIT_LOG_BATCH_SIZE = config('AUDIT_LOG_BATCH_SIZE', default=100, cast=int)
+AUDIT_LOG_FLUSH_INTERVAL_MS = config('AUDIT_LOG_FLUSH_INTERVAL_MS', default=500, cast=int)
+AUDIT_LOG_QUEUE_SIZE = config('AUDIT_LOG_QUEUE_SIZE', default=10000, cast=int)
+
+# Log rows older than these windows are moved to LOG_ARCHIVE_DIR by the
+# archive_logs command
+ACTIVITY_LOG_RETENTION_DAYS = config('ACTIVITY_LOG_RETENTION_DAYS', default=180, cast=int)
+SYSTEM_LOG_RETENTION_DAYS = config('SYSTEM_LOG_RETENTION_DAYS', default=90, cast=int)
+LOG_ARCHIVE_DIR = config('LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+
+# Largest number of items (or ids) one bulk endpoint request may carry
+BULK_MAX_ITEMS = config('BULK_MAX_ITEMS', default=10000, cast=int)
+
+# Request profiling (SQL, serializer and response size per route): every
+# request with REQUEST_PROFILING, this fraction of requests, and requests
+# sent by staff (anyone under DEBUG) with an X-Profile header. Requests slower than REQUEST_PROFILING_SLOW_MS
+# are logged (0 disables)
+REQUEST_PROFILING = config('REQUEST_PROFILING', default=False, cast=bool)
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+REQUEST_PROFILING_WINDOW_MINUTES = config('REQUEST_PROFILING_WINDOW_MINUTES', default=15, cast=int)
+REQUEST_PROFILING_SLOW_MS = config('REQUEST_PROFILING_SLOW_MS', default=1000, cast=int)
+
+# Health checks: results are reused for HEALTH_CHECK_CACHE_SECONDS, and the
+# media / static volumes need HEALTH_MIN_FREE_DISK_MB free to be ready
+HEALTH_CHECK_CACHE_SECONDS = config('HEALTH_CHECK_CACHE_SECONDS', default=5, cast=int)
+HEALTH_MIN_FREE_DISK_MB = config('HEALTH_MIN_FREE_DISK_MB', default=100, cast=int)
+
+# Directory where each worker process writes its request metrics every
+# METRICS_FLUSH_SECONDS so /metrics reports all gunicorn workers; unset,
+# /metrics only reports the process that answers
+METRICS_DIR = config('METRICS_DIR', default=None)
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5, cast=int)
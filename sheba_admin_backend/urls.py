@@ -8,10 +8,16 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from . import health, metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
+    # Health probes
+    path('health/live/', health.liveness, name='health-live'),
+    path('health/ready/', health.readiness, name='health-ready'),
+    path('metrics', metrics.metrics_view, name='metrics'),
+    
     # API endpoints
     path('api/auth/', include('authentication.urls')),
     path('api/projects/', include('projects.urls')),
@@ -0,0 +1,129 @@
+"""
+Buffered view counters for the public website endpoints.
+
+``record_view`` only touches the cache: one atomic ``incr`` on a key for the
+object in the current time slot, so public requests never write rows.
+``flush_view_counts`` (run by the ``flush_view_counts`` management command,
+e.g. every minute from cron) adds the counts of closed slots to the database
+with ``F()`` updates. A slot no longer receives increments by the time it is
+flushed, so no view is lost however many workers record at once. Each slot
+is claimed (marked flushed and its keys deleted) before its update is
+written, so a flush that dies halfway can drop that slot's views but never
+count them twice.
+
+Buffering needs a cache shared by every worker and the flush job (Redis).
+The local-memory and dummy caches are per process, so with them
+``record_view`` writes its ``F()`` update straight away instead.
+"""
+import time
+from collections import defaultdict
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F
+
+PREFIX = 'view-counts'
+# Slots that are never flushed expire after a day
+KEY_TIMEOUT = 60 * 60 * 24
+LOCK_TIMEOUT = 60 * 5
+FLUSHED_KEY = f'{PREFIX}:flushed'
+
+
+def slot_seconds():
+    return getattr(settings, 'VIEW_COUNT_SLOT_SECONDS', 60)
+
+
+def cache_is_shared():
+    """Whether other processes see this process's cache"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def current_slot():
+    return int(time.time() // slot_seconds())
+
+
+def _slot_key(slot, name):
+    return f'{PREFIX}:{slot}:{name}'
+
+
+def _counter_key(slot, label, field, pk):
+    return _slot_key(slot, f'{label}:{field}:{pk}')
+
+
+def _register(slot, entry):
+    """Append ``entry`` to the slot's index, the position handed out by one ``incr``"""
+    size_key = _slot_key(slot, 'size')
+    cache.add(size_key, 0, KEY_TIMEOUT)
+    position = cache.incr(size_key)
+    cache.set(_slot_key(slot, f'entry:{position}'), entry, KEY_TIMEOUT)
+
+
+def record_view(instance, field='views'):
+    """Count one view of ``instance``, without writing to the database when the cache is shared"""
+    if not cache_is_shared():
+        instance._meta.model._base_manager.filter(pk=instance.pk).update(**{field: F(field) + 1})
+        return
+    slot = current_slot()
+    entry = (instance._meta.label, field, instance.pk)
+    key = _counter_key(slot, *entry)
+    if cache.add(key, 0, KEY_TIMEOUT):
+        _register(slot, entry)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        pass
+
+
+def _claim_slot(slot, size):
+    """Take the slot's counts out of the cache, marking it flushed first; returns ``{entry: count}``"""
+    entry_keys = [_slot_key(slot, f'entry:{position}') for position in range(1, size + 1)]
+    entries = {_counter_key(slot, *entry): entry for entry in cache.get_many(entry_keys).values()}
+    counts = cache.get_many(entries)
+    cache.set(FLUSHED_KEY, slot, None)
+    cache.delete_many(entry_keys + list(entries) + [_slot_key(slot, 'size')])
+    return {entries[key]: count for key, count in counts.items() if count}
+
+
+def _write_counts(counts):
+    # One UPDATE per model field and distinct increment
+    increments = defaultdict(lambda: defaultdict(list))
+    for (label, field, pk), count in counts.items():
+        increments[label, field][count].append(pk)
+    updated = 0
+    with transaction.atomic():
+        for (label, field), by_count in increments.items():
+            manager = apps.get_model(label)._base_manager
+            for count, pks in by_count.items():
+                updated += manager.filter(pk__in=pks).update(**{field: F(field) + count})
+    return updated
+
+
+def flush_view_counts():
+    """
+    Write the buffered counts of closed slots to the database and return the
+    number of rows updated. The slot before the current one is left for
+    requests still in flight.
+    """
+    lock_key = f'{PREFIX}:flush-lock'
+    if not cache.add(lock_key, True, LOCK_TIMEOUT):
+        return 0
+    try:
+        until = current_slot() - 2
+        last = cache.get(FLUSHED_KEY)
+        first = until - KEY_TIMEOUT // slot_seconds() if last is None else last + 1
+        slots = range(first, until + 1)
+        sizes = cache.get_many([_slot_key(slot, 'size') for slot in slots])
+        updated = 0
+        for slot in slots:
+            size = sizes.get(_slot_key(slot, 'size'))
+            if size:
+                updated += _write_counts(_claim_slot(slot, size))
+        if slots:
+            cache.set(FLUSHED_KEY, until, None)
+        return updated
+    finally:
+        cache.delete(lock_key)